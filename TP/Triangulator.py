@@ -1,5 +1,14 @@
 """Implémentation Python de la triangulation de Delaunay."""
 
+from array import array
+from itertools import chain
+
+from deadline import Deadline
+from divide_conquer import divide_and_conquer
+from mesh import incremental
+from preprocessing import prepare, restore_indices
+from triangulation_result import Triangulation
+
 Point = tuple[float, float]
 Triangle = tuple[int, int, int]
 EPS = 1e-12
@@ -32,24 +41,47 @@ def _circumcircle_contains(pt: Point, a: Point, b: Point, c: Point) -> bool:
     return dist2 < r2 - EPS
 
 
-def triangulate(points: list[Point]) -> list[Triangle]:
-    """Triangule une liste de points selon l'algorithme de Delaunay.
+def _check_points(points: list[Point]) -> list[Point]:
+    """Vérifie le format des points et les convertit en couples de flottants."""
+    checked = []
+    for idx, p in enumerate(points):
+        if not isinstance(p, (tuple, list)) or len(p) != 2:
+            raise TypeError(f"Point {idx} invalide: {p!r}")
+        x, y = p
+        if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+            raise TypeError(f"Coordonnées du point {idx} invalides: ({x}, {y})")
+        checked.append((float(x), float(y)))
+    return checked
+
+
+def bowyer_watson(
+    points: list[Point], deadline: Deadline | None = None, flat: bool = False
+) -> list[Triangle] | array:
+    """Triangule une liste de points par insertion incrémentale (Bowyer-Watson).
+
+    Implémentation de référence en O(n²) : chaque insertion reparcourt tous
+    les triangles pour trouver la cavité. Les autres moteurs doivent produire
+    le même résultat sur les jeux de test.
 
     Parameters
     ----------
     points : list[Point]
         Liste des points à trianguler.
+    deadline : Deadline | None
+        Échéance vérifiée avant chaque insertion.
+    flat : bool
+        Renvoyer les indices dans un tableau 'I' plat plutôt qu'en triplets.
 
     Returns
     -------
-    list[Triangle]
+    list[Triangle] | array
         Liste des triangles sous forme de triplets d'indices dans la liste `points`.
         Aucun triangle ne contient de sommet du super-triangle final.
 
     """
     n_pts = len(points)
     if n_pts < 3:
-        return []
+        return array("I") if flat else []
 
     # Construire un super-triangle englobant tous les points
     xmin = min(p[0] for p in points)
@@ -78,6 +110,8 @@ def triangulate(points: list[Point]) -> list[Triangle]:
 
     # Insertion incrémentale des points
     for i in range(n_pts):
+        if deadline is not None:
+            deadline.check()
         p = pts[i]
         bad_triangles = []
 
@@ -111,4 +145,138 @@ def triangulate(points: list[Point]) -> list[Triangle]:
         if super_idx[0] not in t and super_idx[1] not in t and super_idx[2] not in t
     ]
 
-    return final
+    return array("I", chain.from_iterable(final)) if flat else final
+
+
+ENGINES = {
+    "bowyer_watson": bowyer_watson,
+    "divide_conquer": divide_and_conquer,
+    "incremental": incremental,
+}
+DEFAULT_ENGINE = "divide_conquer"
+
+
+def triangulate(
+    points: list[Point],
+    engine: str = DEFAULT_ENGINE,
+    tolerance: float = 0.,
+    deadline: Deadline | None = None,
+    **options,
+) -> list[Triangle]:
+    """Triangule une liste de points selon l'algorithme de Delaunay.
+
+    Une passe linéaire (voir `preprocessing`) fusionne d'abord les doublons,
+    et les points distants d'au plus `tolerance`, puis renvoie immédiatement
+    une liste vide si les points restants sont moins de trois ou alignés.
+    Seul le premier point de chaque groupe fusionné est référencé.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Liste des points à trianguler.
+    engine : str
+        Nom du moteur à utiliser parmi `ENGINES` : "divide_conquer"
+        (Guibas & Stolfi, O(n log n), par défaut), "incremental" (insertion
+        localisée sur un maillage à voisinage) ou "bowyer_watson"
+        (implémentation de référence).
+    tolerance : float
+        Distance en dessous de laquelle deux points sont fusionnés ; 0 (par
+        défaut) pour les seuls doublons exacts.
+    deadline : Deadline | None
+        Échéance vérifiée régulièrement par le moteur : une fois dépassée
+        (ou annulée), le calcul s'arrête et le travail partiel est perdu.
+    **options
+        Options propres au moteur, par exemple `ordering` pour "incremental"
+        ou `workers` (nombre de processus) pour "divide_conquer".
+
+    Returns
+    -------
+    list[Triangle]
+        Liste des triangles sous forme de triplets d'indices dans la liste `points`.
+
+    Raises
+    ------
+    TypeError
+        Si un point n'est pas un couple de coordonnées numériques.
+    ValueError
+        Si le moteur demandé n'existe pas ou si `tolerance` est invalide.
+    DeadlineExceeded
+        Si l'échéance est dépassée avant la fin du calcul.
+
+    """
+    return _triangulate_checked(
+        _check_points(points), engine, tolerance, deadline, options
+    )
+
+
+def _triangulate_checked(
+    checked: list[Point],
+    engine: str,
+    tolerance: float,
+    deadline: Deadline | None,
+    options: dict,
+    flat: bool = False,
+) -> list[Triangle] | array:
+    """Triangule des points déjà vérifiés par `_check_points` (voir `triangulate`).
+
+    Avec `flat`, le moteur écrit les indices dans un tableau 'I' plat.
+    """
+    try:
+        run = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Moteur de triangulation inconnu: {engine!r}") from None
+    prepared = prepare(checked, tolerance)
+    if prepared.degenerate:
+        return array("I") if flat else []
+    if deadline is not None:
+        deadline.check()
+        options["deadline"] = deadline
+    if flat:
+        options["flat"] = True
+    return restore_indices(run(prepared.points, **options), prepared.index)
+
+
+def triangulate_compact(
+    points: list[Point],
+    engine: str = DEFAULT_ENGINE,
+    tolerance: float = 0.,
+    deadline: Deadline | None = None,
+    **options,
+) -> Triangulation:
+    """Triangule une liste de points et renvoie un résultat compact.
+
+    Même calcul que `triangulate`, mais le résultat est stocké dans des
+    tableaux typés (coordonnées float32, indices uint32) prêts à être
+    encodés au format `Triangles` sans nouvelle conversion : le moteur
+    écrit directement ses indices dans le tableau, sans liste de triplets.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Liste des points à trianguler.
+    engine : str
+        Nom du moteur à utiliser parmi `ENGINES`.
+    tolerance : float
+        Distance de fusion des points (voir `triangulate`).
+    deadline : Deadline | None
+        Échéance du calcul (voir `triangulate`).
+    **options
+        Options propres au moteur.
+
+    Returns
+    -------
+    Triangulation
+        Points (arrondis en float32, comme dans le format binaire) et
+        triangles de la triangulation.
+
+    Raises
+    ------
+    DeadlineExceeded
+        Si l'échéance est dépassée avant la fin du calcul.
+
+    """
+    checked = _check_points(points)
+    indices = _triangulate_checked(
+        checked, engine, tolerance, deadline, options, flat=True
+    )
+    return Triangulation(array("f", chain.from_iterable(checked)), indices)
@@ -0,0 +1,434 @@
+"""Banc d'essai : courbes de passage à l'échelle de la triangulation et des codecs.
+
+Chaque opération (`triangulate`, `encode_*`, `decode_*`) est mesurée sur
+plusieurs tailles (10² à 10⁵ points, 10⁶ sur demande avec ``--large``) et
+plusieurs distributions de points
+(uniforme, en amas, grille, presque alignés, sur un cercle). Pour chaque cas
+sont relevés :
+
+- la durée (meilleure de plusieurs exécutions) et le débit en points/s ;
+- le pic de mémoire allouée (`tracemalloc`, mesuré sur une exécution à part
+  pour ne pas fausser les durées) ;
+- l'exposant de complexité, pente de log(durée) en fonction de log(n)
+  ajustée par moindres carrés sur toutes les tailles.
+
+Les résultats sont enregistrés en JSON et peuvent être comparés à une
+référence enregistrée : une durée qui dépasse la référence de plus de la
+tolérance, ou un exposant qui augmente de plus de `EXPONENT_TOLERANCE`, est
+signalé comme une régression.
+
+Utilisation hors ligne ::
+
+    python benchmark.py --sizes 100 1000 10000 --output resultats.json
+    python benchmark.py --large --operations triangulate
+    python benchmark.py --baseline benchmark_baseline.json --tolerance 0.3
+
+Le code de sortie vaut 1 si une régression est détectée. Les mêmes mesures
+tournent sous pytest avec le marqueur `benchmark` (``make bench_test``).
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+
+from encoding import (
+    decode_pointset,
+    decode_triangles,
+    decode_triangles_array,
+    decode_triangles_compact,
+    encode_pointset,
+    encode_triangles,
+    encode_triangles_array,
+    encode_triangles_compact,
+)
+from triangulation_result import Triangulation
+from Triangulator import triangulate
+
+Point = tuple[float, float]
+
+SIZES = (100, 1_000, 10_000, 100_000)
+# Taille ajoutée par `--large` : plusieurs minutes et Go par distribution
+LARGE_SIZE = 1_000_000
+REPEAT = 3
+# Au-delà de cette durée, une exécution n'est pas répétée
+REPEAT_MAX_SECONDS = 1.0
+TOLERANCE = 0.25
+EXPONENT_TOLERANCE = 0.15
+# Durées de référence trop courtes pour être comparées de façon fiable
+MIN_SECONDS = 1e-3
+
+
+# -------------------- Distributions --------------------
+
+def uniform(n: int, rng: random.Random) -> list[Point]:
+    """Renvoie n points uniformes dans le carré unité."""
+    return [(rng.random(), rng.random()) for _ in range(n)]
+
+
+def clustered(n: int, rng: random.Random) -> list[Point]:
+    """Renvoie n points gaussiens répartis en dix amas serrés."""
+    centers = [(rng.random(), rng.random()) for _ in range(10)]
+    points = []
+    for k in range(n):
+        cx, cy = centers[k % len(centers)]
+        points.append((rng.gauss(cx, .01), rng.gauss(cy, .01)))
+    return points
+
+
+def grid(n: int, rng: random.Random) -> list[Point]:
+    """Renvoie n points d'une grille entière (nombreux points cocycliques)."""
+    side = math.isqrt(n - 1) + 1 if n else 0
+    return [(float(k % side), float(k // side)) for k in range(n)]
+
+
+def collinear(n: int, rng: random.Random) -> list[Point]:
+    """Renvoie n points sur la droite y = 2x + 1, aux arrondis flottants près."""
+    return [(x, 2 * x + 1) for x in (rng.random() for _ in range(n))]
+
+
+def circle(n: int, rng: random.Random) -> list[Point]:
+    """Renvoie n points sur le cercle unité, aux arrondis flottants près."""
+    return [
+        (math.cos(a), math.sin(a))
+        for a in (rng.uniform(0, 2 * math.pi) for _ in range(n))
+    ]
+
+
+DISTRIBUTIONS: dict[str, Callable[[int, random.Random], list[Point]]] = {
+    "uniform": uniform,
+    "clustered": clustered,
+    "grid": grid,
+    "collinear": collinear,
+    "circle": circle,
+}
+
+OPERATIONS = (
+    "triangulate",
+    "encode_pointset",
+    "decode_pointset",
+    "encode_triangles",
+    "decode_triangles",
+    "encode_triangles_array",
+    "decode_triangles_array",
+    "encode_triangles_compact",
+    "decode_triangles_compact",
+)
+
+
+# -------------------- Mesures --------------------
+
+def _cases(points: list[Point], operations) -> Iterator[tuple[str, Callable]]:
+    """Renvoie les appels à mesurer, `triangulate` en premier.
+
+    Les entrées des codecs sont préparées une seule fois, après la mesure de
+    `triangulate`, à partir de la triangulation produite par l'appel
+    chronométré ; elle n'est calculée à part que si `triangulate` n'est pas
+    mesurée.
+    """
+    computed = {}
+
+    def timed_triangulate():
+        computed["triangles"] = triangulate(points)
+
+    if "triangulate" in operations:
+        yield "triangulate", timed_triangulate
+    codecs = [op for op in operations if op != "triangulate"]
+    if not codecs:
+        return
+
+    triangles = computed.get("triangles")
+    if triangles is None:
+        triangles = triangulate(points)
+    result = Triangulation.from_lists(points, triangles)
+    pointset = encode_pointset(points)
+    binary = encode_triangles(points, triangles)
+    compact = encode_triangles_compact(points, triangles)
+    cases = {
+        "encode_pointset": lambda: encode_pointset(points),
+        "decode_pointset": lambda: decode_pointset(pointset),
+        "encode_triangles": lambda: encode_triangles(points, triangles),
+        "decode_triangles": lambda: decode_triangles(binary),
+        "encode_triangles_array": lambda: encode_triangles_array(
+            result.coords, result.indices
+        ),
+        "decode_triangles_array": lambda: decode_triangles_array(binary),
+        "encode_triangles_compact": lambda: encode_triangles_compact(
+            points, triangles
+        ),
+        "decode_triangles_compact": lambda: decode_triangles_compact(compact),
+    }
+    for op in codecs:
+        yield op, cases[op]
+
+
+def measure(
+    fn: Callable[[], object], repeat: int = REPEAT, memory: bool = True
+) -> tuple[float, int | None]:
+    """Renvoie la meilleure durée de `fn` et son pic de mémoire allouée.
+
+    Parameters
+    ----------
+    fn : Callable
+        Appel à mesurer, sans argument.
+    repeat : int
+        Nombre maximal d'exécutions chronométrées.
+    memory : bool
+        Si faux, le pic de mémoire n'est pas mesuré (None) ; cette mesure
+        refait un appel sous `tracemalloc`, plusieurs fois plus lent.
+
+    Returns
+    -------
+    tuple[float, int | None]
+        Durée en secondes et pic de mémoire en octets.
+
+    """
+    best = math.inf
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+        if best > REPEAT_MAX_SECONDS:
+            break
+    if not memory:
+        return best, None
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    if not tracing:
+        tracemalloc.stop()
+    return best, peak
+
+
+def fit_exponent(sizes: list[int], seconds: list[float]) -> float | None:
+    """Renvoie la pente de log(durée) en fonction de log(n), ou None.
+
+    Une pente proche de 1 indique un coût linéaire, 2 un coût quadratique ;
+    n log n donne une pente un peu supérieure à 1.
+    """
+    pairs = [
+        (math.log(n), math.log(s))
+        for n, s in zip(sizes, seconds, strict=True) if n > 0 and s > 0
+    ]
+    if len({x for x, _ in pairs}) < 2:
+        return None
+    mx = sum(x for x, _ in pairs) / len(pairs)
+    my = sum(y for _, y in pairs) / len(pairs)
+    num = sum((x - mx) * (y - my) for x, y in pairs)
+    den = sum((x - mx) ** 2 for x, _ in pairs)
+    return num / den
+
+
+def run(
+    sizes=SIZES,
+    distributions=tuple(DISTRIBUTIONS),
+    operations=OPERATIONS,
+    repeat: int = REPEAT,
+    seed: int = 0,
+    progress: Callable[[dict], None] | None = None,
+    memory: bool = True,
+) -> dict:
+    """Mesure chaque opération sur chaque distribution et chaque taille.
+
+    Parameters
+    ----------
+    sizes : Iterable[int]
+        Nombres de points ; `SIZES` par défaut, sans `LARGE_SIZE`.
+    distributions : Iterable[str]
+        Noms de distributions parmi `DISTRIBUTIONS`.
+    operations : Iterable[str]
+        Noms d'opérations parmi `OPERATIONS`.
+    repeat : int
+        Nombre maximal d'exécutions chronométrées par cas.
+    seed : int
+        Graine des générateurs de points.
+    progress : Callable[[dict], None] | None
+        Appelée avec chaque mesure dès qu'elle est faite.
+    memory : bool
+        Mesure aussi le pic de mémoire de chaque cas.
+
+    Returns
+    -------
+    dict
+        Rapport sérialisable en JSON : `meta`, `results` (une entrée par
+        mesure) et `exponents` (par "opération/distribution").
+
+    """
+    unknown = set(operations) - set(OPERATIONS)
+    unknown |= set(distributions) - set(DISTRIBUTIONS)
+    if unknown:
+        raise ValueError(f"Opérations ou distributions inconnues: {sorted(unknown)}")
+
+    results = []
+    for dist in distributions:
+        for n in sizes:
+            points = DISTRIBUTIONS[dist](n, random.Random(seed))
+            for op, fn in _cases(points, operations):
+                seconds, peak = measure(fn, repeat, memory)
+                entry = {
+                    "operation": op,
+                    "distribution": dist,
+                    "n": n,
+                    "seconds": seconds,
+                    "throughput": n / seconds if seconds > 0 else None,
+                    "peak_bytes": peak,
+                }
+                results.append(entry)
+                if progress is not None:
+                    progress(entry)
+
+    exponents = {}
+    for dist in distributions:
+        for op in operations:
+            rows = [
+                r for r in results
+                if r["operation"] == op and r["distribution"] == dist
+            ]
+            exponents[f"{op}/{dist}"] = fit_exponent(
+                [r["n"] for r in rows], [r["seconds"] for r in rows]
+            )
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+        "exponents": exponents,
+    }
+
+
+# -------------------- Comparaison à une référence --------------------
+
+def compare(
+    report: dict,
+    baseline: dict,
+    tolerance: float = TOLERANCE,
+    exponent_tolerance: float = EXPONENT_TOLERANCE,
+) -> list[str]:
+    """Renvoie la description des régressions par rapport à une référence.
+
+    Seuls les cas présents dans les deux rapports sont comparés, et les
+    durées de référence inférieures à `MIN_SECONDS` sont ignorées.
+
+    Parameters
+    ----------
+    report, baseline : dict
+        Rapports produits par `run`.
+    tolerance : float
+        Ralentissement relatif admis (0.25 : 25 % plus lent).
+    exponent_tolerance : float
+        Augmentation admise de l'exposant de complexité.
+
+    Returns
+    -------
+    list[str]
+        Une ligne par régression ; vide si aucune.
+
+    """
+    def key(r):
+        return r["operation"], r["distribution"], r["n"]
+
+    reference = {key(r): r for r in baseline.get("results", ())}
+    regressions = []
+    for r in report["results"]:
+        ref = reference.get(key(r))
+        if ref is None or ref["seconds"] < MIN_SECONDS:
+            continue
+        if r["seconds"] > ref["seconds"] * (1 + tolerance):
+            regressions.append(
+                "{} {} n={}: {:.4g} s au lieu de {:.4g} s (+{:.0%})".format(
+                    *key(r), r["seconds"], ref["seconds"],
+                    r["seconds"] / ref["seconds"] - 1,
+                )
+            )
+
+    ref_exponents = baseline.get("exponents", {})
+    for name, value in report["exponents"].items():
+        ref = ref_exponents.get(name)
+        if value is not None and ref is not None and value > ref + exponent_tolerance:
+            regressions.append(
+                f"{name}: exposant {value:.2f} au lieu de {ref:.2f}"
+            )
+    return regressions
+
+
+# -------------------- Ligne de commande --------------------
+
+def main(argv: list[str] | None = None) -> int:
+    """Lance le banc d'essai en ligne de commande ; renvoie le code de sortie."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument(
+        "--large", action="store_true",
+        help=f"ajoute la taille {LARGE_SIZE} (plusieurs minutes par distribution)",
+    )
+    parser.add_argument(
+        "--distributions", nargs="+", default=list(DISTRIBUTIONS),
+        choices=list(DISTRIBUTIONS),
+    )
+    parser.add_argument(
+        "--operations", nargs="+", default=list(OPERATIONS), choices=OPERATIONS
+    )
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="ne pas mesurer le pic de mémoire"
+    )
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--baseline", help="fichier JSON de référence à comparer")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--exponent-tolerance", type=float, default=EXPONENT_TOLERANCE
+    )
+    args = parser.parse_args(argv)
+
+    def progress(r):
+        peak = r["peak_bytes"]
+        print(
+            f"{r['operation']:<26} {r['distribution']:<10} n={r['n']:<8} "
+            f"{r['seconds']:10.4f} s  {r['throughput'] or 0:12.0f} pts/s  "
+            + (f"{peak / 1e6:9.2f} Mo" if peak is not None else ""),
+            flush=True,
+        )
+
+    sizes = args.sizes
+    if args.large and LARGE_SIZE not in sizes:
+        sizes = [*sizes, LARGE_SIZE]
+    report = run(
+        sizes, args.distributions, args.operations,
+        args.repeat, args.seed, progress, not args.no_memory,
+    )
+    for name, value in report["exponents"].items():
+        if value is not None:
+            print(f"exposant {name:<37} {value:.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(
+                report, json.load(f), args.tolerance, args.exponent_tolerance
+            )
+        for line in regressions:
+            print(f"RÉGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Échéances de requête et annulation coopérative des calculs.
+
+Un `Deadline` porte l'instant (`time.monotonic()`) au-delà duquel une requête
+ne sert plus à rien, et un drapeau d'annulation. Les boucles longues
+(insertions, récursion du diviser-pour-régner, attentes) appellent
+`check()` régulièrement : passé l'échéance ou après `cancel()`, elle lève
+`DeadlineExceeded` et le travail partiel est abandonné.
+
+L'horloge monotone est commune aux processus d'une même machine : un
+`Deadline` se transmet tel quel (pickle) aux processus de calcul, seule
+l'annulation explicite reste locale au processus qui l'a demandée.
+"""
+
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Échéance dépassée ou calcul annulé."""
+
+
+class Deadline:
+    """Échéance absolue d'un traitement, annulable.
+
+    Parameters
+    ----------
+    at : float | None
+        Instant `time.monotonic()` de l'échéance ; None pour aucune limite
+        (seule l'annulation arrête alors le traitement).
+
+    """
+
+    __slots__ = ("at", "cancelled")
+
+    def __init__(self, at: float | None = None):
+        """Crée une échéance non annulée."""
+        self.at = at
+        self.cancelled = False
+
+    @classmethod
+    def after(cls, seconds: float | None) -> "Deadline":
+        """Renvoie l'échéance située `seconds` secondes après maintenant."""
+        return cls(None if seconds is None else time.monotonic() + seconds)
+
+    def remaining(self) -> float | None:
+        """Renvoie le temps restant en secondes (0 si dépassé, None sans limite)."""
+        if self.cancelled:
+            return 0.0
+        if self.at is None:
+            return None
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Indique si l'échéance est dépassée ou le traitement annulé."""
+        return self.cancelled or (self.at is not None and time.monotonic() >= self.at)
+
+    def cancel(self) -> None:
+        """Annule le traitement : le prochain `check()` lèvera DeadlineExceeded."""
+        self.cancelled = True
+
+    def check(self) -> None:
+        """Lève DeadlineExceeded si l'échéance est dépassée ou annulée."""
+        if self.expired():
+            raise DeadlineExceeded(
+                "Traitement annulé" if self.cancelled else "Échéance dépassée"
+            )
+
+    def __repr__(self) -> str:
+        """Renvoie une représentation lisible (temps restant)."""
+        return f"Deadline(remaining={self.remaining()!r})"
@@ -0,0 +1,408 @@
+"""Triangulation de Delaunay par division et fusion (Guibas & Stolfi).
+
+Les points sont triés lexicographiquement puis découpés récursivement en deux
+moitiés ; chaque moitié est triangulée indépendamment et les deux résultats
+sont fusionnés en remontant la frontière commune. La structure sous-jacente est
+une subdivision *quad-edge* stockée dans des listes plates, ce qui donne une
+complexité en O(n log n).
+
+Avec plusieurs workers, les points triés sont découpés en bandes verticales
+contiguës : chaque bande est triangulée dans un processus séparé à partir des
+coordonnées placées en mémoire partagée, puis les bandes sont fusionnées par
+la même étape de fusion que la récursion, si bien que le résultat reste une
+triangulation de Delaunay globale.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import shared_memory
+
+import profiling
+from deadline import Deadline
+from predicates import incircle, orient2d
+
+Point = tuple[float, float]
+Triangle = tuple[int, int, int]
+
+
+# -------------------- SUBDIVISION QUAD-EDGE --------------------
+
+def _rot(e: int) -> int:
+    return (e & ~3) | ((e + 1) & 3)
+
+
+def _invrot(e: int) -> int:
+    return (e & ~3) | ((e + 3) & 3)
+
+
+class Subdivision:
+    """Subdivision quad-edge dont les sommets sont des indices de `points`.
+
+    Chaque arête non orientée occupe quatre entrées consécutives dans
+    `onext` et `org` : l'arête primale, sa duale, l'arête primale inversée et
+    la duale inversée. Les arêtes duales n'ont pas d'origine (-1).
+    """
+
+    def __init__(self, points: list[Point]):
+        """Crée une subdivision vide sur la liste de points donnée."""
+        self.points = points
+        self.onext: list[int] = []
+        self.org: list[int] = []
+        self.alive: list[bool] = []
+
+    def dest(self, e: int) -> int:
+        """Renvoie le sommet de destination de l'arête e."""
+        return self.org[e ^ 2]
+
+    def lnext(self, e: int) -> int:
+        """Renvoie l'arête suivante autour de la face gauche de e."""
+        return _rot(self.onext[_invrot(e)])
+
+    def oprev(self, e: int) -> int:
+        """Renvoie l'arête précédente autour de l'origine de e."""
+        return _rot(self.onext[_rot(e)])
+
+    def rprev(self, e: int) -> int:
+        """Renvoie l'arête précédente autour de la face droite de e."""
+        return self.onext[e ^ 2]
+
+    def make_edge(self, a: int, b: int) -> int:
+        """Crée une arête isolée de a vers b et renvoie son identifiant."""
+        e = len(self.onext)
+        self.onext.extend((e, e + 3, e + 2, e + 1))
+        self.org.extend((a, -1, b, -1))
+        self.alive.append(True)
+        return e
+
+    def splice(self, a: int, b: int) -> None:
+        """Opérateur splice de Guibas & Stolfi (joint ou sépare deux anneaux)."""
+        onext = self.onext
+        alpha = _rot(onext[a])
+        beta = _rot(onext[b])
+        onext[a], onext[b] = onext[b], onext[a]
+        onext[alpha], onext[beta] = onext[beta], onext[alpha]
+
+    def connect(self, a: int, b: int) -> int:
+        """Ajoute une arête reliant la destination de a à l'origine de b."""
+        e = self.make_edge(self.dest(a), self.org[b])
+        self.splice(e, self.lnext(a))
+        self.splice(e ^ 2, b)
+        return e
+
+    def delete_edge(self, e: int) -> None:
+        """Retire l'arête e de la subdivision."""
+        self.splice(e, self.oprev(e))
+        self.splice(e ^ 2, self.oprev(e ^ 2))
+        self.alive[e >> 2] = False
+
+    def triangles(self, flat: bool = False) -> list[Triangle] | array:
+        """Renvoie les faces triangulaires bornées de la subdivision.
+
+        Avec `flat`, les indices sont écrits directement dans un tableau 'I'
+        plat (a0, b0, c0, a1, ...), sans liste de triplets intermédiaire.
+        """
+        pts = self.points
+        org = self.org
+        result: list[Triangle] | array = array("I") if flat else []
+        orient = orient2d
+        if profiling.active:
+            orient = profiling.counted("orient2d", orient2d)
+        for q, alive in enumerate(self.alive):
+            if not alive:
+                continue
+            for e in (4 * q, 4 * q + 2):
+                e2 = self.lnext(e)
+                e3 = self.lnext(e2)
+                # Chaque face n'est émise qu'une fois, depuis sa plus petite arête
+                if self.lnext(e3) != e or e > e2 or e > e3:
+                    continue
+                a, b, c = org[e], org[e2], org[e3]
+                if orient(pts[a], pts[b], pts[c]) > 0:
+                    if flat:
+                        result.extend(sorted((a, b, c)))
+                    else:
+                        result.append(tuple(sorted((a, b, c))))
+        return result
+
+
+# -------------------- DIVISION ET FUSION --------------------
+
+# Taille minimale d'un sous-problème pour vérifier l'échéance, et nombre
+# d'arêtes de couture entre deux vérifications pendant une fusion : quelques
+# milliers de vérifications au plus, même pour des millions de points
+DEADLINE_CHECK_MIN = 1024
+
+
+def _delaunay(
+    sub: Subdivision,
+    order: list[int],
+    lo: int,
+    hi: int,
+    deadline: Deadline | None = None,
+) -> tuple[int, int]:
+    """Triangule order[lo:hi] et renvoie les arêtes d'enveloppe (gauche, droite).
+
+    L'arête de gauche part du sommet le plus à gauche dans le sens horaire de
+    l'enveloppe, celle de droite part du sommet le plus à droite dans le sens
+    trigonométrique. L'échéance `deadline` est vérifiée à chaque sous-problème
+    d'au moins `DEADLINE_CHECK_MIN` points, et pendant les fusions.
+    """
+    pts = sub.points
+    n = hi - lo
+    if deadline is not None and n >= DEADLINE_CHECK_MIN:
+        deadline.check()
+
+    if n == 2:
+        a = sub.make_edge(order[lo], order[lo + 1])
+        return a, a ^ 2
+
+    if n == 3:
+        orient = orient2d
+        if profiling.active:
+            orient = profiling.counted("orient2d", orient2d)
+        s1, s2, s3 = order[lo], order[lo + 1], order[lo + 2]
+        a = sub.make_edge(s1, s2)
+        b = sub.make_edge(s2, s3)
+        sub.splice(a ^ 2, b)
+        if orient(pts[s1], pts[s2], pts[s3]) > 0:
+            sub.connect(b, a)
+            return a, b ^ 2
+        if orient(pts[s1], pts[s3], pts[s2]) > 0:
+            c = sub.connect(b, a)
+            return c ^ 2, c
+        return a, b ^ 2
+
+    mid = lo + n // 2
+    ldo, ldi = _delaunay(sub, order, lo, mid, deadline)
+    rdi, rdo = _delaunay(sub, order, mid, hi, deadline)
+    return _merge(sub, ldo, ldi, rdi, rdo, deadline)
+
+
+def _merge(
+    sub: Subdivision,
+    ldo: int,
+    ldi: int,
+    rdi: int,
+    rdo: int,
+    deadline: Deadline | None = None,
+) -> tuple[int, int]:
+    """Fusionne deux triangulations adjacentes et renvoie les arêtes d'enveloppe.
+
+    Tous les sommets de la moitié gauche (ldo, ldi) doivent précéder
+    lexicographiquement ceux de la moitié droite (rdi, rdo). L'échéance
+    `deadline` est vérifiée toutes les `DEADLINE_CHECK_MIN` arêtes de couture :
+    la fusion de deux grandes bandes en compte autant que de points.
+    """
+    pts = sub.points
+    org = sub.org
+    in_circle, orient = incircle, orient2d
+    if profiling.active:
+        in_circle = profiling.counted("incircle", incircle)
+        orient = profiling.counted("orient2d", orient2d)
+
+    # Tangente inférieure commune aux deux enveloppes
+    while True:
+        if orient(pts[org[rdi]], pts[org[ldi]], pts[sub.dest(ldi)]) > 0:
+            ldi = sub.lnext(ldi)
+        elif orient(pts[org[ldi]], pts[sub.dest(rdi)], pts[org[rdi]]) > 0:
+            rdi = sub.rprev(rdi)
+        else:
+            break
+
+    basel = sub.connect(rdi ^ 2, ldi)
+    if org[ldi] == org[ldo]:
+        ldo = basel ^ 2
+    if org[rdi] == org[rdo]:
+        rdo = basel
+
+    # Remontée de la couture entre les deux moitiés
+    countdown = DEADLINE_CHECK_MIN
+    while True:
+        if deadline is not None:
+            countdown -= 1
+            if not countdown:
+                deadline.check()
+                countdown = DEADLINE_CHECK_MIN
+        b_org = pts[org[basel]]
+        b_dest = pts[sub.dest(basel)]
+
+        lcand = sub.onext[basel ^ 2]
+        l_valid = orient(pts[sub.dest(lcand)], b_dest, b_org) > 0
+        if l_valid:
+            while in_circle(
+                b_dest, b_org, pts[sub.dest(lcand)], pts[sub.dest(sub.onext[lcand])]
+            ) > 0:
+                t = sub.onext[lcand]
+                sub.delete_edge(lcand)
+                lcand = t
+            l_valid = orient(pts[sub.dest(lcand)], b_dest, b_org) > 0
+
+        rcand = sub.oprev(basel)
+        r_valid = orient(pts[sub.dest(rcand)], b_dest, b_org) > 0
+        if r_valid:
+            while in_circle(
+                b_dest, b_org, pts[sub.dest(rcand)], pts[sub.dest(sub.oprev(rcand))]
+            ) > 0:
+                t = sub.oprev(rcand)
+                sub.delete_edge(rcand)
+                rcand = t
+            r_valid = orient(pts[sub.dest(rcand)], b_dest, b_org) > 0
+
+        if not l_valid and not r_valid:
+            break
+        if not l_valid or (
+            r_valid
+            and in_circle(
+                pts[sub.dest(lcand)],
+                pts[org[lcand]],
+                pts[org[rcand]],
+                pts[sub.dest(rcand)],
+            ) > 0
+        ):
+            basel = sub.connect(rcand, basel ^ 2)
+        else:
+            basel = sub.connect(basel ^ 2, lcand ^ 2)
+
+    return ldo, rdo
+
+
+def divide_and_conquer(
+    points: list[Point],
+    workers: int | None = 1,
+    deadline: Deadline | None = None,
+    flat: bool = False,
+) -> list[Triangle] | array:
+    """Triangule une liste de points par l'algorithme de Guibas & Stolfi.
+
+    Les doublons exacts sont écartés avant la récursion ; seul le premier
+    point de chaque groupe de doublons est référencé par les triangles.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Liste des points à trianguler.
+    workers : int | None
+        Nombre de processus de calcul ; `None` pour un par cœur. Au-delà
+        d'un processus, les points sont découpés en bandes verticales
+        triangulées en parallèle puis fusionnées le long des coutures.
+    deadline : Deadline | None
+        Échéance vérifiée pendant la récursion (y compris dans les
+        processus de calcul, qui partagent l'horloge monotone).
+    flat : bool
+        Renvoyer les indices dans un tableau 'I' plat plutôt qu'en triplets.
+
+    Returns
+    -------
+    list[Triangle] | array
+        Liste des triangles sous forme de triplets d'indices triés dans `points`
+        (tableau plat des mêmes indices si `flat`).
+
+    Raises
+    ------
+    DeadlineExceeded
+        Si l'échéance est dépassée avant la fin du calcul.
+
+    """
+    order = sorted(range(len(points)), key=points.__getitem__)
+    unique: list[int] = []
+    for i in order:
+        if not unique or points[i] != points[unique[-1]]:
+            unique.append(i)
+
+    if len(unique) < 3:
+        return array("I") if flat else []
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    blocks = min(workers, len(unique) // PARALLEL_MIN_BLOCK)
+    if blocks > 1:
+        return _parallel_delaunay(points, unique, blocks, deadline, flat)
+
+    sub = Subdivision(points)
+    _delaunay(sub, unique, 0, len(unique), deadline)
+    return sub.triangles(flat)
+
+
+# -------------------- VERSION PARALLÈLE --------------------
+
+# Nombre minimal de points par bande : en dessous, le coût de lancement des
+# processus dépasse le gain
+PARALLEL_MIN_BLOCK = 20_000
+
+
+def _triangulate_block(
+    name: str, n_points: int, lo: int, hi: int, deadline: Deadline | None = None
+) -> tuple[array, array, bytes, int, int]:
+    """Triangule une bande lue en mémoire partagée (exécuté dans un worker).
+
+    La mémoire partagée `name` contient les coordonnées (2 * n_points
+    flottants 'd') suivies des indices triés et sans doublon des points
+    ('q'). La bande est triangulée dans une subdivision locale, dont les
+    sommets sont renumérotés en indices globaux avant d'être renvoyés.
+
+    Returns
+    -------
+    tuple[array, array, bytes, int, int]
+        Tableaux `onext` et `org`, drapeaux `alive` et arêtes d'enveloppe
+        (gauche, droite) de la subdivision locale.
+
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        coords = shm.buf[:16 * n_points].cast("d")
+        order = shm.buf[16 * n_points:].cast("q")
+        ids = order[lo:hi].tolist()
+        local = [(coords[2 * i], coords[2 * i + 1]) for i in ids]
+        del coords, order
+    finally:
+        shm.close()
+
+    sub = Subdivision(local)
+    ldo, rdo = _delaunay(sub, range(len(local)), 0, len(local), deadline)
+    org = array("q", [ids[v] if v >= 0 else -1 for v in sub.org])
+    return array("q", sub.onext), org, bytes(sub.alive), ldo, rdo
+
+
+def _parallel_delaunay(
+    points: list[Point],
+    unique: list[int],
+    blocks: int,
+    deadline: Deadline | None = None,
+    flat: bool = False,
+) -> list[Triangle] | array:
+    """Triangule `unique` en `blocks` bandes parallèles puis les fusionne."""
+    n = len(points)
+    shm = shared_memory.SharedMemory(create=True, size=16 * n + 8 * len(unique))
+    try:
+        shm.buf[:16 * n] = array("d", chain.from_iterable(points)).tobytes()
+        shm.buf[16 * n:] = array("q", unique).tobytes()
+        bounds = [len(unique) * k // blocks for k in range(blocks + 1)]
+        with ProcessPoolExecutor(blocks) as pool:
+            parts = list(pool.map(
+                _triangulate_block,
+                [shm.name] * blocks, [n] * blocks, bounds[:-1], bounds[1:],
+                [deadline] * blocks,
+            ))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # Assemblage des subdivisions locales dans une subdivision globale
+    sub = Subdivision(points)
+    hulls = []
+    for onext, org, alive, ldo, rdo in parts:
+        base = len(sub.onext)
+        sub.onext.extend([e + base for e in onext])
+        sub.org.extend(org)
+        sub.alive.extend(map(bool, alive))
+        hulls.append((ldo + base, rdo + base))
+
+    # Fusion des bandes voisines, de gauche à droite
+    ldo, rdo = hulls[0]
+    for rdi, next_rdo in hulls[1:]:
+        if deadline is not None:
+            deadline.check()
+        ldo, rdo = _merge(sub, ldo, rdo, rdi, next_rdo, deadline)
+    return sub.triangles(flat)
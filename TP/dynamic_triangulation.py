@@ -0,0 +1,324 @@
+"""Triangulation de Delaunay dynamique : insertion, suppression, déplacement.
+
+`DelaunayTriangulation` garde un `TriangleMesh` vivant et le modifie
+localement au lieu de tout recalculer :
+
+- l'insertion réutilise la cavité de Bowyer-Watson du moteur incrémental ;
+- la suppression retire l'étoile du sommet et retriangule le polygone de ses
+  voisins par découpe d'oreilles de Delaunay (une oreille convexe dont le
+  cercle circonscrit ne contient aucun autre sommet du polygone) ; pour un
+  sommet de l'enveloppe, le polygone est une chaîne ouverte et ce qui reste
+  après la découpe devient la nouvelle portion d'enveloppe ;
+- le déplacement enchaîne suppression et réinsertion sous le même indice.
+
+Chaque opération renvoie un `TriangulationDiff` listant les triangles finis
+ajoutés et supprimés. Les indices des sommets sont stables : un sommet
+supprimé laisse un trou dans `points`, jamais réutilisé.
+"""
+
+from collections import Counter
+from typing import NamedTuple
+
+import profiling
+from mesh import GHOST, TriangleMesh
+from predicates import incircle, orient2d
+from spatial_sort import brio_order
+
+Point = tuple[float, float]
+Triangle = tuple[int, int, int]
+
+
+class TriangulationDiff(NamedTuple):
+    """Triangles finis ajoutés et supprimés par une opération (triplets triés)."""
+
+    added: list[Triangle]
+    removed: list[Triangle]
+
+
+class DelaunayTriangulation(TriangleMesh):
+    """Triangulation de Delaunay modifiable point par point.
+
+    Tant que les sommets sont tous alignés (ou moins de trois), aucun
+    triangle n'existe : les sommets sont mis en attente et insérés dès
+    qu'un point non aligné arrive.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Points initiaux, insérés dans un ordre BRIO. Les doublons exacts ne
+        deviennent pas des sommets.
+
+    """
+
+    def __init__(self, points: list[Point] = ()):
+        """Crée la triangulation des points initiaux."""
+        super().__init__([(float(x), float(y)) for x, y in points])
+        self._vertex_triangle: dict[int, int] = {}
+        self._finite = 0
+        self._log: Counter = Counter()
+        self._pending: list[int] = brio_order(self.points)
+        self.vertices: set[int] = set(self._pending)
+        self._start()
+        self._log.clear()
+
+    # -------------------- Journal des modifications --------------------
+
+    def _new_triangle(self, a: int, b: int, c: int) -> int:
+        """Alloue un triangle en notant ses sommets et l'ajout."""
+        t = super()._new_triangle(a, b, c)
+        for x in (a, b, c):
+            if x != GHOST:
+                self._vertex_triangle[x] = t
+        if GHOST not in (a, b, c):
+            self._finite += 1
+            self._log[tuple(sorted((a, b, c)))] += 1
+        return t
+
+    def _kill(self, t: int) -> None:
+        """Libère un triangle en notant la suppression."""
+        if not self.is_ghost(t):
+            self._finite -= 1
+            self._log[tuple(sorted(self.verts[3 * t:3 * t + 3]))] -= 1
+        super()._kill(t)
+
+    def _diff(self) -> TriangulationDiff:
+        """Renvoie le bilan net du journal, puis le vide."""
+        added = sorted(t for t, n in self._log.items() if n > 0)
+        removed = sorted(t for t, n in self._log.items() if n < 0)
+        self._log.clear()
+        return TriangulationDiff(added, removed)
+
+    # -------------------- Démarrage --------------------
+
+    def _start(self) -> None:
+        """Construit le premier triangle dès que les sommets en attente le permettent.
+
+        Les autres sommets en attente sont alors insérés ; les doublons
+        exacts sont écartés.
+        """
+        pts = self.points
+        pending = self._pending
+        if len(pending) < 3:
+            return
+        pa = pts[pending[0]]
+        kb = next((k for k, i in enumerate(pending) if pts[i] != pa), None)
+        if kb is None:
+            return
+        pb = pts[pending[kb]]
+        kc = next(
+            (k for k in range(kb + 1, len(pending))
+             if orient2d(pa, pb, pts[pending[k]]) != 0),
+            None,
+        )
+        if kc is None:
+            return
+
+        self._pending = []
+        self.init_triangle(pending[0], pending[kb], pending[kc])
+        for k, i in enumerate(pending):
+            if k not in (0, kb, kc) and not super().insert(i):
+                self.vertices.discard(i)
+
+    def _rebuild(self, vertices: list[int]) -> None:
+        """Vide le maillage et le reconstruit sur les sommets donnés."""
+        for t, alive in enumerate(self.alive):
+            if alive:
+                self._kill(t)
+        self.verts.clear()
+        self.nbrs.clear()
+        self.alive.clear()
+        self._free.clear()
+        self._vertex_triangle.clear()
+        self.last = -1
+        self._pending = [vertices[k] for k in brio_order(
+            [self.points[i] for i in vertices]
+        )]
+        self._start()
+
+    # -------------------- Étoile d'un sommet --------------------
+
+    def _incident_triangle(self, v: int) -> int:
+        """Renvoie un triangle vivant ayant v pour sommet."""
+        t = self._vertex_triangle.get(v, -1)
+        if t >= 0 and self.alive[t] and v in self.verts[3 * t:3 * t + 3]:
+            return t
+        # Repli : localisation du point puis recherche parmi les voisins
+        t = self.locate(self.points[v])
+        for s in (t, *self.nbrs[3 * t:3 * t + 3]):
+            if v in self.verts[3 * s:3 * s + 3]:
+                return s
+        raise RuntimeError(f"Sommet {v} introuvable dans le maillage")
+
+    def star(self, v: int) -> tuple[list[int], list[int]]:
+        """Renvoie les triangles autour de v et le cycle de leurs sommets opposés.
+
+        Les deux listes sont dans le sens direct autour de v ; le cycle
+        contient `GHOST` si v est sur l'enveloppe convexe.
+        """
+        verts = self.verts
+        start = t = self._incident_triangle(v)
+        triangles: list[int] = []
+        ring: list[int] = []
+        while True:
+            k = verts[3 * t:3 * t + 3].index(v)
+            x = verts[3 * t + (k + 1) % 3]
+            triangles.append(t)
+            ring.append(x)
+            # Triangle suivant dans le sens direct : celui qui partage (v, y)
+            t = self.nbrs[3 * t + (k + 1) % 3]
+            if t == start:
+                return triangles, ring
+
+    # -------------------- Retriangulation d'un trou --------------------
+
+    def _is_ear(self, a: int, b: int, c: int, polygon: list[int]) -> bool:
+        """Indique si (a, b, c) est une oreille de Delaunay du polygone."""
+        pts = self.points
+        pa, pb, pc = pts[a], pts[b], pts[c]
+        in_circle, orient = incircle, orient2d
+        if profiling.active:
+            in_circle = profiling.counted("incircle", incircle)
+            orient = profiling.counted("orient2d", orient2d)
+        if orient(pa, pb, pc) <= 0:
+            return False
+        return all(
+            in_circle(pa, pb, pc, pts[d]) <= 0
+            for d in polygon if d != a and d != b and d != c
+        )
+
+    def _fill(self, ring: list[int]) -> list[tuple[int, int, int]]:
+        """Renvoie les triangles (sens direct) qui comblent le trou d'un sommet."""
+        if GHOST in ring:
+            k = ring.index(GHOST)
+            chain = ring[k + 1:] + ring[:k]
+            cyclic = False
+        else:
+            chain = list(ring)
+            cyclic = True
+
+        faces = []
+        while len(chain) >= 3:
+            n = len(chain)
+            for j in range(n if cyclic else n - 2):
+                a, b, c = chain[j], chain[(j + 1) % n], chain[(j + 2) % n]
+                if self._is_ear(a, b, c, chain):
+                    faces.append((a, b, c))
+                    del chain[(j + 1) % n]
+                    break
+            else:
+                break
+        if cyclic and len(chain) > 2:
+            raise RuntimeError("Polygone sans oreille de Delaunay")
+        if not cyclic:
+            # La chaîne restante est la nouvelle portion d'enveloppe
+            faces.extend(
+                (chain[j], chain[j + 1], GHOST) for j in range(len(chain) - 1)
+            )
+        return faces
+
+    # -------------------- Opérations --------------------
+
+    def _check_vertex(self, index: int) -> None:
+        """Lève IndexError si index n'est pas un sommet de la triangulation."""
+        if index not in self.vertices:
+            raise IndexError(f"Sommet {index} absent de la triangulation")
+
+    def _duplicate_of(self, p: Point) -> int | None:
+        """Renvoie le sommet situé exactement en p, s'il existe."""
+        pts = self.points
+        if self._pending or not self.alive:
+            return next((i for i in self._pending if pts[i] == p), None)
+        t = self.locate(p)
+        if self.is_ghost(t):
+            return None
+        self.last = t
+        return next(
+            (v for v in self.verts[3 * t:3 * t + 3] if pts[v] == p), None
+        )
+
+    def _add_vertex(self, i: int) -> None:
+        """Insère le sommet i (coordonnées déjà dans `points`)."""
+        self.vertices.add(i)
+        if self._pending or not self.alive:
+            self._pending.append(i)
+            self._start()
+        else:
+            super().insert(i)
+
+    def _remove_vertex(self, v: int) -> None:
+        """Retire le sommet v et retriangule localement son étoile."""
+        self.vertices.discard(v)
+        self._vertex_triangle.pop(v, None)
+        if self._pending or not self.alive:
+            self._pending.remove(v)
+            return
+
+        triangles, ring = self.star(v)
+        finite = sum(1 for t in triangles if not self.is_ghost(t))
+        if finite == self._finite:
+            # Tous les triangles touchent v : le reste peut être dégénéré
+            self._rebuild(sorted(self.vertices))
+            return
+
+        verts = self.verts
+        outer = {
+            self.nbrs[3 * t + verts[3 * t:3 * t + 3].index(v)] for t in triangles
+        }
+        created = [self._new_triangle(a, b, c) for a, b, c in self._fill(ring)]
+        for t in triangles:
+            self._kill(t)
+        self._link(created + list(outer))
+        self.last = created[0]
+
+    def insert(self, point: Point) -> tuple[int, TriangulationDiff]:
+        """Ajoute un point et renvoie son indice et les triangles modifiés.
+
+        Raises
+        ------
+        ValueError
+            Si un sommet occupe déjà exactement cette position.
+
+        """
+        p = (float(point[0]), float(point[1]))
+        if self._duplicate_of(p) is not None:
+            raise ValueError(f"Un sommet occupe déjà la position {p}")
+        self.points.append(p)
+        i = len(self.points) - 1
+        self._add_vertex(i)
+        return i, self._diff()
+
+    def remove(self, index: int) -> TriangulationDiff:
+        """Retire le sommet `index` et renvoie les triangles modifiés.
+
+        Raises
+        ------
+        IndexError
+            Si `index` n'est pas un sommet de la triangulation.
+
+        """
+        self._check_vertex(index)
+        self._remove_vertex(index)
+        return self._diff()
+
+    def move(self, index: int, point: Point) -> TriangulationDiff:
+        """Déplace le sommet `index` en `point` et renvoie les triangles modifiés.
+
+        Raises
+        ------
+        IndexError
+            Si `index` n'est pas un sommet de la triangulation.
+        ValueError
+            Si un autre sommet occupe déjà exactement la nouvelle position.
+
+        """
+        self._check_vertex(index)
+        p = (float(point[0]), float(point[1]))
+        other = self._duplicate_of(p)
+        if other == index:
+            return self._diff()
+        if other is not None:
+            raise ValueError(f"Un sommet occupe déjà la position {p}")
+        self._remove_vertex(index)
+        self.points[index] = p
+        self._add_vertex(index)
+        return self._diff()
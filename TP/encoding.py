@@ -1,9 +1,72 @@
-"""Fonctions d'encodage et de décodage pour les PointSets et triangles."""
+"""Fonctions d'encodage et de décodage pour les PointSets et triangles.
+
+Deux familles de fonctions partagent le même format binaire :
+
+- `encode_pointset`, `decode_pointset`, `encode_triangles`, `decode_triangles`
+  manipulent des listes de tuples ;
+- les variantes `*_array` manipulent des tampons plats (`array('f')` de
+  coordonnées x0, y0, x1, y1... et `array('I')` d'indices a0, b0, c0...).
+  Le décodage renvoie des `memoryview` sur les données reçues, sans copie ni
+  travail Python par élément, et l'encodage se fait en une seule concaténation.
+
+`pointset_size` lit le nombre de points d'un PointSet dans son en-tête, sans
+le décoder.
+
+`iter_encode_triangles` produit le binaire `Triangles` en morceaux de taille
+bornée, pour envoyer les grandes réponses en flux sans les construire en
+mémoire.
+
+`encode_batch_frame` et `iter_decode_batch` gèrent le flux de trames de
+l'endpoint de triangulation par lots.
+
+`encode_query_results` et `decode_query_results` portent les réponses de
+l'endpoint de requêtes (triangle contenant et plus proche sommet).
+
+`encode_triangles_delta` décrit une triangulation par rapport à une autre
+(sommets modifiés, triangles retirés et ajoutés) ; `apply_triangles_delta`
+reconstruit le binaire `Triangles` complet côté client.
+
+`encode_triangles_compact` et `decode_triangles_compact` gèrent un format
+optionnel plus petit, avec perte : coordonnées quantifiées sur la boîte
+englobante, indices en écarts varint après renumérotation de Hilbert, le tout
+compressé par zlib. Le format `Triangles` reste le format par défaut.
+"""
 import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterator
+from itertools import chain
+
+from spatial_sort import hilbert_order
 
 Point = tuple[float, float]
 Triangle = tuple[int, int, int]
 
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _to_le_bytes(buffer, typecode: str) -> bytes:
+    """Renvoie le contenu d'un tampon typé en octets little-endian."""
+    view = memoryview(buffer)
+    if view.format != typecode or view.itemsize != 4:
+        raise TypeError(f"Tampon de type {typecode!r} sur 4 octets attendu")
+    if _LITTLE_ENDIAN:
+        return view.tobytes()
+    swapped = array(typecode, view)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _le_view(data: bytes, start: int, count: int, typecode: str):
+    """Renvoie une vue typée sur `count` valeurs little-endian de `data`."""
+    raw = memoryview(data)[start:start + 4 * count]
+    if _LITTLE_ENDIAN:
+        return raw.cast(typecode)
+    values = array(typecode, raw.tobytes())
+    values.byteswap()
+    return memoryview(values)
+
 
 # -------------------- POINTSET --------------------
 
@@ -23,18 +86,16 @@ def encode_pointset(points: list[Point]) -> bytes:
         Données binaires représentant le PointSet.
 
     """
-    n = len(points)
-    data = struct.pack("<I", n)
-
+    flat = []
     for idx, (x, y) in enumerate(points):
         # Vérification des types
         if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
             raise TypeError(f"Coordonnées du point {idx} invalides: ({x}, {y})")
+        flat.append(float(x))
+        flat.append(float(y))
 
-        data += struct.pack("<ff", float(x), float(y))
-
-    return data
-
+    # Un seul pack : pas de concaténation quadratique point par point
+    return struct.pack(f"<I{len(flat)}f", len(points), *flat)
 
 
 def decode_pointset(data: bytes) -> list[Point]:
@@ -59,13 +120,24 @@ def decode_pointset(data: bytes) -> list[Point]:
     if len(data) != expected_length:
         raise ValueError("Taille de données incohérente avec le nombre de points")
 
-    points = []
-    offset = 4
-    for _ in range(n_points):
-        x, y = struct.unpack("<ff", data[offset:offset + 8])
-        points.append((x, y))
-        offset += 8
-    return points
+    return list(struct.iter_unpack("<ff", memoryview(data)[4:]))
+
+
+def pointset_size(data: bytes) -> int:
+    """Renvoie le nombre de points annoncé par l'en-tête d'un PointSet binaire.
+
+    Seuls les 4 premiers octets sont lus : le reste n'est ni décodé ni
+    vérifié (voir `decode_pointset`).
+
+    Raises
+    ------
+    ValueError
+        Si les données sont trop courtes pour contenir l'en-tête.
+
+    """
+    if len(data) < 4:
+        raise ValueError("Données trop courtes pour contenir le nombre de points")
+    return struct.unpack_from("<I", data)[0]
 
 
 # -------------------- TRIANGLES --------------------
@@ -89,15 +161,15 @@ def encode_triangles(points: list[Point], triangles: list[Triangle]) -> bytes:
         Données binaires représentant les points et les triangles.
 
     """
-    data = encode_pointset(points)
     n_pts = len(points)
-    n_triangles = len(triangles)
-    data += struct.pack("<I", n_triangles)
+    flat = []
     for a, b, c in triangles:
         if not (0 <= a < n_pts) or not (0 <= b < n_pts) or not (0 <= c < n_pts):
             raise ValueError(f"Triangle {a,b,c} contient un indice invalide")
-        data += struct.pack("<III", a, b, c)
-    return data
+        flat.extend((a, b, c))
+    return encode_pointset(points) + struct.pack(
+        f"<I{len(flat)}I", len(triangles), *flat
+    )
 
 
 def decode_triangles(data: bytes) -> tuple[list[Point], list[Triangle]]:
@@ -127,15 +199,609 @@ def decode_triangles(data: bytes) -> tuple[list[Point], list[Triangle]]:
         triangles = []
     else:
         n_triangles = struct.unpack("<I", data[points_length:points_length + 4])[0]
-        triangles = []
         offset = points_length + 4
-        for _ in range(n_triangles):
-            if offset + 12 > len(data):
-                raise ValueError("Données trop courtes pour triangles")
-            a, b, c = struct.unpack("<III", data[offset:offset + 12])
-            if a >= n_points or b >= n_points or c >= n_points:
-                raise ValueError(f"Indice de triangle hors limites: {(a, b, c)}")
-            triangles.append((a, b, c))
-            offset += 12
+        end = offset + 12 * n_triangles
+        if end > len(data):
+            raise ValueError("Données trop courtes pour triangles")
+        indices = _le_view(data, offset, 3 * n_triangles, "I")
+        if n_triangles and max(indices) >= n_points:
+            raise ValueError(f"Indice de triangle hors limites: {max(indices)}")
+        triangles = list(struct.iter_unpack("<III", memoryview(data)[offset:end]))
+
+    return points, triangles
+
+
+# -------------------- TAMPONS PLATS --------------------
+
+def encode_pointset_array(coords) -> bytes:
+    """Encode un tampon de coordonnées float32 en PointSet binaire.
+
+    Parameters
+    ----------
+    coords : array | memoryview
+        Tampon de type 'f' contenant x0, y0, x1, y1, ...
+
+    Returns
+    -------
+    bytes
+        Données binaires représentant le PointSet.
+
+    """
+    body = _to_le_bytes(coords, "f")
+    if len(body) % 8:
+        raise ValueError("Nombre impair de coordonnées")
+    return struct.pack("<I", len(body) // 8) + body
+
+
+def decode_pointset_array(data: bytes) -> memoryview:
+    """Décode un PointSet binaire en vue plate de coordonnées, sans copie.
+
+    Parameters
+    ----------
+    data : bytes
+        Données binaires représentant un PointSet.
+
+    Returns
+    -------
+    memoryview
+        Vue de type 'f' sur x0, y0, x1, y1, ...
+
+    """
+    if len(data) < 4:
+        raise ValueError("Données trop courtes pour contenir le nombre de points")
+
+    n_points = struct.unpack_from("<I", data)[0]
+    if len(data) != 4 + n_points * 8:
+        raise ValueError("Taille de données incohérente avec le nombre de points")
+    return _le_view(data, 4, 2 * n_points, "f")
+
+
+def encode_triangles_array(coords, indices) -> bytes:
+    """Encode des tampons de coordonnées et d'indices en binaire `Triangles`.
+
+    Parameters
+    ----------
+    coords : array | memoryview
+        Tampon de type 'f' contenant x0, y0, x1, y1, ...
+    indices : array | memoryview
+        Tampon de type 'I' contenant a0, b0, c0, a1, b1, c1, ...
+
+    Returns
+    -------
+    bytes
+        Données binaires représentant les points et les triangles.
+
+    """
+    points_body = _to_le_bytes(coords, "f")
+    triangles_body = _to_le_bytes(indices, "I")
+    if len(points_body) % 8 or len(triangles_body) % 12:
+        raise ValueError("Tampons de taille incohérente")
+
+    n_points = len(points_body) // 8
+    n_triangles = len(triangles_body) // 12
+    if n_triangles and max(memoryview(indices)) >= n_points:
+        raise ValueError("Un triangle contient un indice invalide")
+    return b"".join((
+        struct.pack("<I", n_points),
+        points_body,
+        struct.pack("<I", n_triangles),
+        triangles_body,
+    ))
+
+
+def decode_triangles_array(data: bytes) -> tuple[memoryview, memoryview]:
+    """Décode un binaire `Triangles` en vues plates, sans copie.
+
+    Parameters
+    ----------
+    data : bytes
+        Données binaires encodant les points et les triangles.
+
+    Returns
+    -------
+    tuple[memoryview, memoryview]
+        Vue 'f' sur les coordonnées et vue 'I' sur les indices des triangles.
+
+    """
+    if len(data) < 4:
+        raise ValueError("Données trop courtes pour contenir le nombre de points")
+
+    n_points = struct.unpack_from("<I", data)[0]
+    points_length = 4 + n_points * 8
+    if len(data) < points_length:
+        raise ValueError("Taille de données incohérente avec le nombre de points")
+    coords = _le_view(data, 4, 2 * n_points, "f")
+
+    if len(data) < points_length + 4:
+        return coords, _le_view(data, points_length, 0, "I")
+
+    n_triangles = struct.unpack_from("<I", data, points_length)[0]
+    if points_length + 4 + 12 * n_triangles > len(data):
+        raise ValueError("Données trop courtes pour triangles")
+    indices = _le_view(data, points_length + 4, 3 * n_triangles, "I")
+    if n_triangles and max(indices) >= n_points:
+        raise ValueError(f"Indice de triangle hors limites: {max(indices)}")
+    return coords, indices
+
+
+# -------------------- ENCODAGE EN FLUX --------------------
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_encode_triangles(
+    points: list[Point], triangles: list[Triangle], chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Encode points et triangles en morceaux de taille bornée.
+
+    Produit le même binaire que `encode_triangles`, dans l'ordre : nombre de
+    points, coordonnées, nombre de triangles, indices. Aucun morceau ne
+    dépasse `chunk_size` octets, si bien que la mémoire utilisée ne dépend
+    pas de la taille du maillage. Les données sont validées avant le premier
+    morceau : une erreur ne peut pas survenir au milieu d'une réponse.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Liste des points.
+    triangles : list[Triangle]
+        Liste des triangles (indices).
+    chunk_size : int
+        Taille maximale d'un morceau en octets (au moins 12).
+
+    Returns
+    -------
+    Iterator[bytes]
+        Morceaux successifs du binaire `Triangles`.
+
+    """
+    if chunk_size < 12:
+        raise ValueError("Taille de morceau inférieure à un triangle")
+    for idx, (x, y) in enumerate(points):
+        if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+            raise TypeError(f"Coordonnées du point {idx} invalides: ({x}, {y})")
+    n_pts = len(points)
+    for a, b, c in triangles:
+        if not (0 <= a < n_pts) or not (0 <= b < n_pts) or not (0 <= c < n_pts):
+            raise ValueError(f"Triangle {a,b,c} contient un indice invalide")
+    return _encode_chunks(points, triangles, chunk_size)
+
 
+def _encode_chunks(
+    points: list[Point], triangles: list[Triangle], chunk_size: int
+) -> Iterator[bytes]:
+    """Génère les morceaux du binaire `Triangles` (données déjà validées)."""
+    yield struct.pack("<I", len(points))
+    step = max(1, chunk_size // 8)
+    for start in range(0, len(points), step):
+        block = points[start:start + step]
+        yield struct.pack(f"<{2 * len(block)}f", *chain.from_iterable(block))
+
+    yield struct.pack("<I", len(triangles))
+    step = chunk_size // 12
+    for start in range(0, len(triangles), step):
+        block = triangles[start:start + step]
+        yield struct.pack(f"<{3 * len(block)}I", *chain.from_iterable(block))
+
+
+# -------------------- LOTS DE RÉSULTATS --------------------
+
+_FRAME_HEADER = struct.Struct("<IHI")
+
+
+def encode_batch_frame(index: int, status: int, payload: bytes) -> bytes:
+    """Encode un résultat d'un lot sous forme de trame.
+
+    Format: <IHI> (indice dans la requête, statut HTTP, taille) + contenu,
+    où le contenu est un binaire `Triangles` si le statut vaut 200 et une
+    erreur JSON `Error` sinon.
+
+    Parameters
+    ----------
+    index : int
+        Position de l'identifiant dans la liste reçue.
+    status : int
+        Statut HTTP du résultat.
+    payload : bytes
+        Contenu du résultat.
+
+    Returns
+    -------
+    bytes
+        Trame binaire.
+
+    """
+    return _FRAME_HEADER.pack(index, status, len(payload)) + payload
+
+
+def iter_decode_batch(data: bytes) -> Iterator[tuple[int, int, bytes]]:
+    """Découpe un flux de trames en résultats (indice, statut, contenu).
+
+    Parameters
+    ----------
+    data : bytes
+        Concaténation de trames produites par `encode_batch_frame`.
+
+    Returns
+    -------
+    Iterator[tuple[int, int, bytes]]
+        Résultats dans l'ordre du flux.
+
+    """
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        if offset + _FRAME_HEADER.size > len(view):
+            raise ValueError("En-tête de trame tronqué")
+        index, status, length = _FRAME_HEADER.unpack_from(view, offset)
+        offset += _FRAME_HEADER.size
+        if offset + length > len(view):
+            raise ValueError("Contenu de trame tronqué")
+        yield index, status, bytes(view[offset:offset + length])
+        offset += length
+
+
+# -------------------- RÉSULTATS DE REQUÊTES --------------------
+
+def encode_query_results(located, nearest) -> bytes:
+    """Encode les réponses à un lot de requêtes de localisation.
+
+    Format: <I> (nombre de requêtes n) + n int32 (triangle contenant chaque
+    requête, -1 hors de l'enveloppe) + n int32 (plus proche sommet, -1 sans
+    sommet).
+
+    Parameters
+    ----------
+    located : array | memoryview
+        Tampon 'i' des indices de triangles.
+    nearest : array | memoryview
+        Tampon 'i' des indices de sommets.
+
+    Returns
+    -------
+    bytes
+        Données binaires des réponses.
+
+    """
+    if len(located) != len(nearest):
+        raise ValueError("Autant de triangles que de sommets attendus")
+    return (
+        struct.pack("<I", len(located))
+        + _to_le_bytes(located, "i")
+        + _to_le_bytes(nearest, "i")
+    )
+
+
+def decode_query_results(data: bytes) -> tuple[memoryview, memoryview]:
+    """Décode les réponses d'un lot de requêtes en vues 'i', sans copie.
+
+    Parameters
+    ----------
+    data : bytes
+        Données produites par `encode_query_results`.
+
+    Returns
+    -------
+    tuple[memoryview, memoryview]
+        Triangles contenant les requêtes et plus proches sommets.
+
+    """
+    if len(data) < 4:
+        raise ValueError("Données trop courtes pour contenir le nombre de requêtes")
+    n = struct.unpack_from("<I", data)[0]
+    if len(data) != 4 + 8 * n:
+        raise ValueError("Taille de données incohérente avec le nombre de requêtes")
+    return _le_view(data, 4, n, "i"), _le_view(data, 4 + 4 * n, n, "i")
+
+
+# -------------------- DELTAS DE TRIANGULATION --------------------
+
+def encode_triangles_delta(
+    base_points: list[Point],
+    base_triangles: list[Triangle],
+    points: list[Point],
+    triangles: list[Triangle],
+) -> bytes:
+    """Encode les différences entre deux triangulations.
+
+    Format:
+        [nombre de points <I>]
+        + [nombre de sommets modifiés <I>] + [(indice, x, y) <Iff> ...]
+        + [nombre de triangles retirés <I>] + [positions dans la base <I> ...]
+        + [nombre de triangles ajoutés <I>] + [indices <III> ...].
+
+    Un sommet est « modifié » s'il est nouveau ou si ses coordonnées ont
+    changé. Les triangles retirés sont désignés par leur position dans la
+    liste de la base ; deux triangles sont identiques s'ils ont les mêmes
+    sommets, quel que soit leur ordre.
+
+    Parameters
+    ----------
+    base_points, base_triangles : list
+        Triangulation de référence, déjà connue du destinataire.
+    points, triangles : list
+        Nouvelle triangulation.
+
+    Returns
+    -------
+    bytes
+        Données binaires du delta.
+
+    """
+    n_pts = len(points)
+    changed = []
+    for idx, (x, y) in enumerate(points):
+        if idx >= len(base_points) or base_points[idx] != (x, y):
+            changed.extend((idx, x, y))
+
+    new = {tuple(sorted(t)): t for t in triangles}
+    removed = []
+    for pos, t in enumerate(base_triangles):
+        if new.pop(tuple(sorted(t)), None) is None:
+            removed.append(pos)
+    added = []
+    for a, b, c in new.values():
+        if not (0 <= a < n_pts) or not (0 <= b < n_pts) or not (0 <= c < n_pts):
+            raise ValueError(f"Triangle {a,b,c} contient un indice invalide")
+        added.extend((a, b, c))
+
+    return b"".join((
+        struct.pack("<II", n_pts, len(changed) // 3),
+        struct.pack("<" + "Iff" * (len(changed) // 3), *changed),
+        struct.pack(f"<I{len(removed)}I", len(removed), *removed),
+        struct.pack(f"<I{len(added)}I", len(added) // 3, *added),
+    ))
+
+
+def apply_triangles_delta(base: bytes, delta: bytes) -> bytes:
+    """Reconstruit le binaire `Triangles` à partir de la base et d'un delta.
+
+    Les triangles conservés gardent l'ordre de la base, les triangles
+    ajoutés sont placés à la suite.
+
+    Parameters
+    ----------
+    base : bytes
+        Binaire `Triangles` de référence.
+    delta : bytes
+        Delta produit par `encode_triangles_delta`.
+
+    Returns
+    -------
+    bytes
+        Binaire `Triangles` de la nouvelle triangulation.
+
+    """
+    base_points, base_triangles = decode_triangles(base)
+    view = memoryview(delta)
+    try:
+        n_pts, n_changed = struct.unpack_from("<II", view)
+        offset = 8
+        points = base_points[:n_pts]
+        points.extend([(0., 0.)] * (n_pts - len(points)))
+        changed = view[offset:offset + 12 * n_changed]
+        for idx, x, y in struct.iter_unpack("<Iff", changed):
+            points[idx] = (x, y)
+        offset += 12 * n_changed
+
+        (n_removed,) = struct.unpack_from("<I", view, offset)
+        removed = set(struct.unpack_from(f"<{n_removed}I", view, offset + 4))
+        offset += 4 + 4 * n_removed
+
+        (n_added,) = struct.unpack_from("<I", view, offset)
+        added = struct.iter_unpack("<III", view[offset + 4:offset + 4 + 12 * n_added])
+        if offset + 4 + 12 * n_added != len(view):
+            raise ValueError("Taille du delta incohérente")
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"Delta invalide: {e}") from e
+
+    triangles = [t for pos, t in enumerate(base_triangles) if pos not in removed]
+    triangles.extend(added)
+    return encode_triangles(points, triangles)
+
+
+# -------------------- FORMAT COMPACT --------------------
+
+COMPACT_MAGIC = b"TRC1"
+COMPACT_BITS = 20
+_COMPACT_HEADER = struct.Struct("<IIB4d")
+
+
+def _zigzag(v: int) -> int:
+    """Renvoie l'entier signé replié sur les naturels (0, -1, 1, -2 -> 0, 1, 2, 3)."""
+    return v << 1 if v >= 0 else (-v << 1) - 1
+
+
+def _unzigzag(z: int) -> int:
+    """Inverse de `_zigzag`."""
+    return (z >> 1) ^ -(z & 1)
+
+
+def _write_varints(out: bytearray, values) -> None:
+    """Ajoute des entiers naturels en varint (7 bits par octet, poids faible)."""
+    append = out.append
+    for v in values:
+        while v >= 0x80:
+            append((v & 0x7F) | 0x80)
+            v >>= 7
+        append(v)
+
+
+def _read_varints(data: bytes, pos: int, count: int) -> tuple[list[int], int]:
+    """Lit `count` varints à partir de `pos` ; renvoie les valeurs et la position."""
+    values = []
+    append = values.append
+    for _ in range(count):
+        v = shift = 0
+        while True:
+            b = data[pos]
+            pos += 1
+            v |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        append(v)
+    return values, pos
+
+
+def encode_triangles_compact(
+    points: list[Point],
+    triangles: list[Triangle],
+    bits: int = COMPACT_BITS,
+    level: int = 6,
+) -> bytes:
+    """Encode des points et triangles au format compact (avec perte).
+
+    Les sommets sont renumérotés le long d'une courbe de Hilbert, si bien que
+    des sommets voisins ont des numéros proches. Dans cet ordre :
+
+    - les coordonnées sont quantifiées sur une grille de 2^bits pas par axe
+      dans la boîte englobante, puis écrites en écarts successifs (varint
+      zigzag) ;
+    - chaque triangle commence par son plus petit numéro (rotation, donc
+      même orientation) ; les triangles sont triés et écrits en écarts :
+      a - a précédent, b - a, c - a (varints) ;
+    - la permutation vers l'ordre d'origine est écrite en écarts successifs,
+      pour que le décodage rende les indices du PointSet.
+
+    Format : `COMPACT_MAGIC` + flux zlib de
+    [points <I>][triangles <I>][bits <B>][xmin, ymin, xmax, ymax <4d>]
+    + [permutation] + [coordonnées] + [triangles].
+
+    Parameters
+    ----------
+    points : list[Point]
+        Liste de points (x, y).
+    triangles : list[Triangle]
+        Liste de triangles (indices des points).
+    bits : int
+        Bits de quantification par axe (1 à 32) ; l'erreur par coordonnée
+        est au plus la moitié d'un pas de grille.
+    level : int
+        Niveau de compression zlib.
+
+    Returns
+    -------
+    bytes
+        Données binaires compressées.
+
+    """
+    if not 1 <= bits <= 32:
+        raise ValueError(f"Nombre de bits invalide: {bits}")
+    n_pts = len(points)
+    for t in triangles:
+        if len(t) != 3 or not all(0 <= i < n_pts for i in t):
+            raise ValueError(f"Triangle {t} contient un indice invalide")
+
+    if n_pts:
+        xmin = min(p[0] for p in points)
+        ymin = min(p[1] for p in points)
+        xmax = max(p[0] for p in points)
+        ymax = max(p[1] for p in points)
+    else:
+        xmin = ymin = xmax = ymax = 0.
+    steps = (1 << bits) - 1
+    sx = steps / (xmax - xmin) if xmax > xmin else 0.
+    sy = steps / (ymax - ymin) if ymax > ymin else 0.
+
+    order = hilbert_order(points)
+    rank = [0] * n_pts
+    for k, i in enumerate(order):
+        rank[i] = k
+
+    out = bytearray(_COMPACT_HEADER.pack(
+        n_pts, len(triangles), bits, xmin, ymin, xmax, ymax
+    ))
+    previous = -1
+    deltas = []
+    for i in order:
+        deltas.append(_zigzag(i - previous - 1))
+        previous = i
+    _write_varints(out, deltas)
+
+    qx = qy = 0
+    deltas = []
+    for i in order:
+        x, y = points[i]
+        nx = round((x - xmin) * sx)
+        ny = round((y - ymin) * sy)
+        deltas.append(_zigzag(nx - qx))
+        deltas.append(_zigzag(ny - qy))
+        qx, qy = nx, ny
+    _write_varints(out, deltas)
+
+    renumbered = []
+    for a, b, c in triangles:
+        a, b, c = rank[a], rank[b], rank[c]
+        if b < a and b < c:
+            a, b, c = b, c, a
+        elif c < a and c < b:
+            a, b, c = c, a, b
+        renumbered.append((a, b, c))
+    renumbered.sort()
+    previous = 0
+    deltas = []
+    for a, b, c in renumbered:
+        deltas.extend((a - previous, b - a, c - a))
+        previous = a
+    _write_varints(out, deltas)
+
+    return COMPACT_MAGIC + zlib.compress(out, level)
+
+
+def decode_triangles_compact(data: bytes) -> tuple[list[Point], list[Triangle]]:
+    """Décode le format compact en points et triangles.
+
+    Les indices sont ceux d'origine ; les coordonnées sont celles de la
+    grille de quantification et les triangles sont triés.
+
+    Parameters
+    ----------
+    data : bytes
+        Données binaires produites par `encode_triangles_compact`.
+
+    Returns
+    -------
+    tuple[list[Point], list[Triangle]]
+        Points (x, y) et triangles décodés.
+
+    """
+    if data[:len(COMPACT_MAGIC)] != COMPACT_MAGIC:
+        raise ValueError("Signature du format compact absente")
+    try:
+        body = zlib.decompress(data[len(COMPACT_MAGIC):])
+        n_pts, n_tri, bits, xmin, ymin, xmax, ymax = _COMPACT_HEADER.unpack_from(
+            body
+        )
+        pos = _COMPACT_HEADER.size
+        deltas, pos = _read_varints(body, pos, n_pts)
+        order = []
+        previous = -1
+        for d in deltas:
+            previous += _unzigzag(d) + 1
+            order.append(previous)
+
+        steps = (1 << bits) - 1
+        dx = (xmax - xmin) / steps
+        dy = (ymax - ymin) / steps
+        deltas, pos = _read_varints(body, pos, 2 * n_pts)
+        points: list = [None] * n_pts
+        qx = qy = 0
+        for k, i in enumerate(order):
+            qx += _unzigzag(deltas[2 * k])
+            qy += _unzigzag(deltas[2 * k + 1])
+            points[i] = (xmin + qx * dx, ymin + qy * dy)
+
+        deltas, pos = _read_varints(body, pos, 3 * n_tri)
+        triangles = []
+        a = 0
+        for k in range(0, 3 * n_tri, 3):
+            a += deltas[k]
+            triangles.append((
+                order[a], order[a + deltas[k + 1]], order[a + deltas[k + 2]]
+            ))
+    except (zlib.error, struct.error, IndexError, TypeError) as e:
+        raise ValueError(f"Données compactes invalides: {e}") from e
+    if pos != len(body) or None in points:
+        raise ValueError("Données compactes incohérentes")
     return points, triangles
@@ -0,0 +1,617 @@
+"""Test de charge HTTP du service de triangulation.
+
+Le test démarre un PointSetManager local (`PointSetManagerStub`, HTTP réel,
+conforme à `point_set_manager.yml`), y enregistre des PointSets de plusieurs
+tailles, puis lance `triangulator_server` dans un processus à part (``flask
+run`` à plusieurs threads) branché sur ce PointSetManager. Une cible déjà
+lancée peut aussi être visée avec ``--target`` ; elle doit alors connaître
+les PointSets du PointSetManager local.
+
+Le trafic est en boucle ouverte : les requêtes partent à des instants fixés
+à l'avance (arrivées de Poisson ou régulières au débit `rps`), qu'elles
+aient ou non reçu leur réponse. La latence est mesurée depuis l'instant
+prévu et non depuis l'envoi effectif : l'attente d'un client libre compte,
+comme pour un vrai utilisateur (pas d'omission coordonnée). La taille de
+chaque requête est tirée selon un mélange pondéré (``--mix 100:0.7
+1000:0.25 10000:0.05``).
+
+Le rapport JSON donne le débit obtenu, les percentiles p50/p95/p99/p99.9 de
+latence, les taux d'erreur (global, par statut, par taille) et une
+chronologie par intervalle avec le CPU et la mémoire résidente du serveur,
+sommés sur ses processus de calcul (lus dans ``/proc``, sous Linux
+seulement). Des seuils ``--max-p99``,
+``--max-error-rate`` et ``--min-throughput`` rendent le code de sortie égal
+à 1 s'ils sont franchis, pour conditionner un déploiement ::
+
+    python loadtest.py --rps 50 --duration 30 --max-p99 0.5 --output charge.json
+"""
+
+import argparse
+import contextlib
+import glob
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from encoding import encode_pointset
+from pointset_manager_stub import PointSetManagerStub
+
+RPS = 20.0
+DURATION = 10.0
+# Taille des PointSets : poids relatif de chaque taille
+SIZE_MIX = {100: 0.7, 1_000: 0.25, 10_000: 0.05}
+# PointSets distincts par taille : les autres requêtes touchent le cache
+POINTSETS = 20
+CONCURRENCY = 64
+TIMEOUT = 30.0
+SAMPLE_INTERVAL = 1.0
+PERCENTILES = (50, 95, 99, 99.9)
+SERVICE_START_TIMEOUT = 20.0
+
+_local = threading.local()
+
+
+# -------------------- Statistiques --------------------
+
+def percentile(ordered: list[float], q: float) -> float | None:
+    """Renvoie le percentile q (rang le plus proche) d'une liste triée."""
+    if not ordered:
+        return None
+    # Arrondi : 99.9 / 100 * 1000 vaut 999.0000000000001 en flottants
+    rank = math.ceil(round(q / 100 * len(ordered), 9))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+def _percentile_key(q: float) -> str:
+    """Renvoie le nom d'un percentile dans le rapport (p50, p999...)."""
+    return "p" + f"{q:g}".replace(".", "")
+
+
+def summarize(records: list[tuple], duration: float) -> dict:
+    """Résume des requêtes (débit, erreurs, latences).
+
+    Parameters
+    ----------
+    records : list[tuple]
+        Requêtes (instant prévu, latence, statut, taille, fin) ; un statut
+        0 signale une erreur de connexion ou un délai dépassé.
+    duration : float
+        Durée de la fenêtre, pour le débit.
+
+    Returns
+    -------
+    dict
+        Nombre de requêtes, erreurs, taux d'erreur, débit (réponses
+        réussies par seconde), latences et répartition des statuts.
+
+    """
+    latencies = sorted(r[1] for r in records)
+    errors = sum(1 for r in records if not 200 <= r[2] < 400)
+    statuses: dict[str, int] = {}
+    for r in records:
+        statuses[str(r[2])] = statuses.get(str(r[2]), 0) + 1
+    latency = {_percentile_key(q): percentile(latencies, q) for q in PERCENTILES}
+    latency["mean"] = sum(latencies) / len(latencies) if latencies else None
+    latency["max"] = latencies[-1] if latencies else None
+    return {
+        "requests": len(records),
+        "errors": errors,
+        "error_rate": errors / len(records) if records else 0.0,
+        "throughput": (len(records) - errors) / duration if duration > 0 else 0.0,
+        "latency": latency,
+        "status": dict(sorted(statuses.items())),
+    }
+
+
+# -------------------- Processus serveur --------------------
+
+def _stat(pid: int) -> list[str]:
+    """Renvoie les champs de ``/proc/<pid>/stat`` qui suivent le nom du processus."""
+    with open(f"/proc/{pid}/stat") as f:
+        # Le nom du processus (entre parenthèses) peut contenir des espaces
+        return f.read().rsplit(")", 1)[1].split()
+
+
+def _children(pid: int) -> list[int] | None:
+    """Renvoie les processus enfants directs de pid, lus dans ``/proc``.
+
+    Renvoie None si ``/proc/<pid>/task/*/children`` n'existe pas (noyau
+    sans ce fichier, ou processus terminé).
+    """
+    paths = glob.glob(f"/proc/{pid}/task/*/children")
+    if not paths:
+        return None
+    children = []
+    for path in paths:
+        with contextlib.suppress(OSError), open(path) as f:
+            children.extend(map(int, f.read().split()))
+    return children
+
+
+def _parents() -> dict[int, int]:
+    """Renvoie le parent de chaque processus visible dans ``/proc``."""
+    parents = {}
+    for name in os.listdir("/proc"):
+        if name.isdigit():
+            with contextlib.suppress(OSError, IndexError, ValueError):
+                parents[int(name)] = int(_stat(int(name))[1])
+    return parents
+
+
+class ProcessSampler:
+    """Relève périodiquement le CPU et la mémoire résidente d'un processus.
+
+    Les relevés couvrent le processus et tous ses descendants (processus de
+    calcul du serveur, par exemple) : leurs temps CPU et leurs mémoires
+    résidentes s'additionnent. La mémoire partagée entre eux (pages héritées,
+    mémoire partagée) est comptée une fois par processus. Sans ``/proc``
+    (hors Linux), aucun relevé n'est produit.
+
+    Parameters
+    ----------
+    pid : int
+        Processus observé.
+    interval : float
+        Intervalle entre deux relevés, en secondes.
+
+    """
+
+    def __init__(self, pid: int, interval: float = SAMPLE_INTERVAL):
+        """Crée l'échantillonneur (sans le démarrer)."""
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[dict] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _tree(self) -> list[int]:
+        """Renvoie le processus observé suivi de tous ses descendants."""
+        tree = [self.pid]
+        parents = None
+        for pid in tree:
+            children = _children(pid)
+            if children is None:
+                # Sans fichier `children` : parents relevés sur tout /proc
+                if parents is None:
+                    parents = _parents()
+                children = [child for child, p in parents.items() if p == pid]
+            tree.extend(children)
+        return tree
+
+    def _read(self) -> tuple[dict[int, float], int] | None:
+        """Renvoie le temps CPU cumulé (s) par processus et la mémoire résidente.
+
+        La mémoire résidente (octets) est la somme sur tout l'arbre de
+        processus ; None si le processus observé n'existe plus.
+        """
+        ticks = os.sysconf("SC_CLK_TCK")
+        page = os.sysconf("SC_PAGE_SIZE")
+        cpu: dict[int, float] = {}
+        resident = 0
+        for pid in self._tree():
+            try:
+                fields = _stat(pid)
+                with open(f"/proc/{pid}/statm") as f:
+                    pages = int(f.read().split()[1])
+            except (OSError, IndexError, ValueError):
+                # Un descendant a pu se terminer entre-temps
+                if pid == self.pid:
+                    return None
+                continue
+            cpu[pid] = (int(fields[11]) + int(fields[12])) / ticks
+            resident += pages * page
+        return cpu, resident
+
+    def _run(self) -> None:
+        """Relève le processus et ses descendants jusqu'à l'arrêt."""
+        start = time.perf_counter()
+        previous = self._read()
+        last = start
+        while not self._stop.wait(self.interval) and previous is not None:
+            current = self._read()
+            now = time.perf_counter()
+            if current is None:
+                return
+            # Un processus apparu depuis le relevé précédent compte en entier ;
+            # le dernier intervalle d'un processus terminé est perdu
+            used = sum(
+                seconds - previous[0].get(pid, 0.)
+                for pid, seconds in current[0].items()
+            )
+            self.samples.append({
+                "t": round(now - start, 3),
+                "cpu_percent": 100 * used / (now - last),
+                "rss_bytes": current[1],
+                "processes": len(current[0]),
+            })
+            previous, last = current, now
+
+    def start(self) -> "ProcessSampler":
+        """Démarre les relevés."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> list[dict]:
+        """Arrête les relevés et les renvoie."""
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+def _free_port() -> int:
+    """Renvoie un port TCP libre sur la boucle locale."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_service(
+    manager_url: str, timeout: float = SERVICE_START_TIMEOUT
+) -> tuple[subprocess.Popen, str]:
+    """Lance `triangulator_server` dans un processus et attend qu'il réponde.
+
+    Parameters
+    ----------
+    manager_url : str
+        URL du PointSetManager (POINTSET_MANAGER_URL du service).
+    timeout : float
+        Délai maximal de démarrage, en secondes.
+
+    Returns
+    -------
+    tuple[subprocess.Popen, str]
+        Processus du service et son URL racine.
+
+    Raises
+    ------
+    RuntimeError
+        Si le service s'arrête ou ne répond pas à temps.
+
+    """
+    port = _free_port()
+    env = {**os.environ, "POINTSET_MANAGER_URL": manager_url}
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "flask", "--app", "triangulator_server", "run",
+            "--host", "127.0.0.1", "--port", str(port), "--with-threads",
+        ],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Le service s'est arrêté au démarrage")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/metrics")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    process.wait()
+    raise RuntimeError("Le service n'a pas répondu à temps")
+
+
+# -------------------- Trafic --------------------
+
+def populate(
+    stub: PointSetManagerStub, mix: dict[int, float], count: int, seed: int
+) -> dict[int, list[str]]:
+    """Enregistre `count` PointSets aléatoires de chaque taille du mélange."""
+    rng = random.Random(seed)
+    ids = {}
+    for size in mix:
+        ids[size] = [
+            stub.add(encode_pointset(
+                [(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(size)]
+            ))
+            for _ in range(count)
+        ]
+    return ids
+
+
+def _get(host: str, port: int, path: str, timeout: float) -> int:
+    """Envoie un GET sur la connexion du thread et renvoie le statut HTTP."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    except (OSError, http.client.HTTPException):
+        conn.close()
+        _local.conn = None
+        raise
+
+
+def drive(
+    target: str,
+    ids: dict[int, list[str]],
+    mix: dict[int, float],
+    rps: float,
+    duration: float,
+    arrival: str = "poisson",
+    concurrency: int = CONCURRENCY,
+    timeout: float = TIMEOUT,
+    seed: int = 0,
+) -> tuple[list[tuple], float]:
+    """Envoie le trafic en boucle ouverte et renvoie les requêtes mesurées.
+
+    Returns
+    -------
+    tuple[list[tuple], float]
+        Requêtes (instant prévu, latence, statut, taille, fin), instants
+        relatifs au début du trafic, et débit réellement envoyé.
+
+    """
+    if arrival not in ("poisson", "uniform"):
+        raise ValueError(f"Loi d'arrivée inconnue: {arrival!r}")
+    url = urlsplit(target)
+    rng = random.Random(seed)
+    sizes = list(mix)
+    weights = [mix[s] for s in sizes]
+    records: list[tuple] = []
+    lock = threading.Lock()
+    start = time.perf_counter() + 0.05
+
+    def one(scheduled: float, size: int, pointset_id: str) -> None:
+        try:
+            status = _get(url.hostname, url.port, f"/triangulation/{pointset_id}",
+                          timeout)
+        except (OSError, http.client.HTTPException):
+            status = 0
+        end = time.perf_counter() - start
+        with lock:
+            records.append((scheduled, end - scheduled, status, size, end))
+
+    sent = 0
+    offset = 0.0
+    with ThreadPoolExecutor(concurrency, thread_name_prefix="load") as pool:
+        while offset < duration:
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            size = rng.choices(sizes, weights)[0]
+            pool.submit(one, offset, size, rng.choice(ids[size]))
+            sent += 1
+            offset += rng.expovariate(rps) if arrival == "poisson" else 1 / rps
+    return sorted(records), sent / duration
+
+
+def timeline(
+    records: list[tuple], samples: list[dict], interval: float
+) -> list[dict]:
+    """Regroupe les réponses et les relevés du serveur par intervalle."""
+    if not records:
+        return []
+    buckets: dict[int, list[tuple]] = {}
+    for r in records:
+        buckets.setdefault(int(r[4] // interval), []).append(r)
+    rows = []
+    for k in range(max(buckets) + 1):
+        bucket = buckets.get(k, [])
+        latencies = sorted(r[1] for r in bucket)
+        errors = sum(1 for r in bucket if not 200 <= r[2] < 400)
+        # Relevé du serveur le plus proche de la fin de l'intervalle
+        end = (k + 1) * interval
+        sample = min(samples, key=lambda s: abs(s["t"] - end), default={})
+        rows.append({
+            "t": end,
+            "throughput": (len(bucket) - errors) / interval,
+            "errors": errors,
+            "p50": percentile(latencies, 50),
+            "p99": percentile(latencies, 99),
+            "cpu_percent": sample.get("cpu_percent"),
+            "rss_bytes": sample.get("rss_bytes"),
+            "processes": sample.get("processes"),
+        })
+    return rows
+
+
+def run(
+    rps: float = RPS,
+    duration: float = DURATION,
+    mix: dict[int, float] | None = None,
+    pointsets: int = POINTSETS,
+    arrival: str = "poisson",
+    concurrency: int = CONCURRENCY,
+    seed: int = 0,
+    target: str | None = None,
+    manager_latency: float = 0.0,
+    manager_failure_rate: float = 0.0,
+    interval: float = SAMPLE_INTERVAL,
+) -> dict:
+    """Lance un test de charge complet et renvoie son rapport JSON.
+
+    Parameters
+    ----------
+    rps : float
+        Débit visé, en requêtes par seconde.
+    duration : float
+        Durée d'envoi du trafic, en secondes.
+    mix : dict[int, float] | None
+        Poids relatif de chaque taille de PointSet (`SIZE_MIX` par défaut).
+    pointsets : int
+        Nombre de PointSets distincts par taille.
+    arrival : str
+        Loi des arrivées : "poisson" ou "uniform".
+    concurrency : int
+        Nombre maximal de requêtes simultanées côté client.
+    seed : int
+        Graine des PointSets et du trafic.
+    target : str | None
+        URL d'un service déjà lancé ; None pour en démarrer un (et relever
+        son CPU et sa mémoire).
+    manager_latency : float
+        Latence ajoutée par le PointSetManager local, en secondes.
+    manager_failure_rate : float
+        Probabilité qu'une requête au PointSetManager local échoue en 503.
+    interval : float
+        Largeur des intervalles de la chronologie, en secondes.
+
+    Returns
+    -------
+    dict
+        Rapport avec les clés "meta", "summary", "by_size", "timeline" et
+        "manager".
+
+    """
+    mix = dict(mix or SIZE_MIX)
+    with PointSetManagerStub() as stub:
+        ids = populate(stub, mix, pointsets, seed)
+        stub.latency = manager_latency
+        stub.failure_rate = manager_failure_rate
+        process = sampler = None
+        if target is None:
+            process, target = start_service(stub.url)
+            sampler = ProcessSampler(process.pid, interval).start()
+        try:
+            records, sent_rps = drive(
+                target, ids, mix, rps, duration, arrival, concurrency, seed=seed
+            )
+        finally:
+            samples = sampler.stop() if sampler is not None else []
+            if process is not None:
+                process.terminate()
+                process.wait()
+        manager = {"requests": stub.requests, "connections": stub.connections}
+
+    elapsed = max((r[4] for r in records), default=duration)
+    return {
+        "meta": {
+            "target": target,
+            "rps": rps,
+            "sent_rps": sent_rps,
+            "duration": duration,
+            "arrival": arrival,
+            "mix": {str(size): weight for size, weight in mix.items()},
+            "pointsets": pointsets,
+            "concurrency": concurrency,
+            "seed": seed,
+            "manager_latency": manager_latency,
+            "manager_failure_rate": manager_failure_rate,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "summary": summarize(records, elapsed),
+        "by_size": {
+            str(size): summarize([r for r in records if r[3] == size], elapsed)
+            for size in mix
+        },
+        "timeline": timeline(records, samples, interval),
+        "manager": manager,
+    }
+
+
+def check(
+    report: dict,
+    max_p99: float | None = None,
+    max_error_rate: float | None = None,
+    min_throughput: float | None = None,
+) -> list[str]:
+    """Renvoie les seuils franchis par un rapport (liste vide si aucun)."""
+    summary = report["summary"]
+    failures = []
+    p99 = summary["latency"]["p99"]
+    if max_p99 is not None and (p99 is None or p99 > max_p99):
+        failures.append(f"p99 {p99} s > {max_p99} s")
+    if max_error_rate is not None and summary["error_rate"] > max_error_rate:
+        failures.append(
+            f"taux d'erreur {summary['error_rate']:.4f} > {max_error_rate}"
+        )
+    if min_throughput is not None and summary["throughput"] < min_throughput:
+        failures.append(
+            f"débit {summary['throughput']:.1f} req/s < {min_throughput} req/s"
+        )
+    return failures
+
+
+def _parse_mix(values: list[str]) -> dict[int, float]:
+    """Lit un mélange de tailles ``taille:poids`` en ligne de commande."""
+    mix = {}
+    for value in values:
+        size, _, weight = value.partition(":")
+        mix[int(size)] = float(weight or 1)
+    return mix
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Lance le test de charge en ligne de commande ; renvoie le code de sortie."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rps", type=float, default=RPS)
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument(
+        "--mix", nargs="+", default=[f"{s}:{w}" for s, w in SIZE_MIX.items()],
+        help="tailles de PointSets et leurs poids, ex. 100:0.7 1000:0.3",
+    )
+    parser.add_argument("--pointsets", type=int, default=POINTSETS)
+    parser.add_argument(
+        "--arrival", choices=("poisson", "uniform"), default="poisson"
+    )
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", help="URL d'un service déjà lancé")
+    parser.add_argument("--manager-latency", type=float, default=0.0)
+    parser.add_argument("--manager-failure-rate", type=float, default=0.0)
+    parser.add_argument("--interval", type=float, default=SAMPLE_INTERVAL)
+    parser.add_argument("--output", help="fichier JSON du rapport")
+    parser.add_argument("--max-p99", type=float, help="seuil de latence p99 (s)")
+    parser.add_argument("--max-error-rate", type=float)
+    parser.add_argument("--min-throughput", type=float)
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.rps, args.duration, _parse_mix(args.mix), args.pointsets,
+        args.arrival, args.concurrency, args.seed, args.target,
+        args.manager_latency, args.manager_failure_rate, args.interval,
+    )
+    summary = report["summary"]
+    latency = summary["latency"]
+    print(
+        f"{summary['requests']} requêtes, {summary['throughput']:.1f} req/s "
+        f"(envoyé {report['meta']['sent_rps']:.1f}), "
+        f"erreurs {summary['error_rate']:.2%}"
+    )
+    print("latence " + "  ".join(
+        f"{name}={value * 1000:.1f} ms" for name, value in latency.items()
+        if value is not None
+    ))
+    for row in report["timeline"]:
+        cpu, rss = row["cpu_percent"], row["rss_bytes"]
+        print(
+            f"t={row['t']:6.1f} s  {row['throughput']:7.1f} req/s  "
+            f"erreurs {row['errors']:4d}"
+            + (f"  CPU {cpu:5.1f} %  RSS {rss / 1e6:7.1f} Mo" if rss else "")
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    failures = check(
+        report, args.max_p99, args.max_error_rate, args.min_throughput
+    )
+    for line in failures:
+        print(f"SEUIL {line}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
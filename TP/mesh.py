@@ -0,0 +1,321 @@
+"""Maillage triangulaire à tableaux de voisinage pour l'insertion incrémentale.
+
+Chaque triangle occupe trois cases consécutives dans `verts` (sommets dans le
+sens direct) et dans `nbrs` (le voisin d'indice i est opposé au sommet i). Un
+sommet fantôme `GHOST` ferme l'enveloppe convexe : chaque arête d'enveloppe
+porte un triangle fantôme, si bien que tout point du plan appartient à un
+triangle et que l'insertion hors de l'enveloppe ne demande aucun cas particulier.
+
+L'insertion localise le point par une marche de visibilité depuis le dernier
+triangle créé, puis étend la cavité de Bowyer-Watson par propagation sur les
+voisins uniquement : son coût dépend de la taille de la cavité et non de celle
+du maillage.
+"""
+
+from array import array
+
+import profiling
+from deadline import Deadline
+from predicates import incircle, orient2d
+from spatial_sort import ORDERINGS
+
+Point = tuple[float, float]
+Triangle = tuple[int, int, int]
+GHOST = -1
+
+
+class TriangleMesh:
+    """Triangulation de Delaunay incrémentale sur des tableaux de voisinage.
+
+    Les sommets sont des indices dans `points`. Les emplacements des triangles
+    supprimés sont recyclés via une liste libre.
+    """
+
+    def __init__(self, points: list[Point]):
+        """Crée un maillage vide sur la liste de points donnée."""
+        self.points = points
+        self.verts: list[int] = []
+        self.nbrs: list[int] = []
+        self.alive: list[bool] = []
+        self._free: list[int] = []
+        self.last = -1
+
+    # -------------------- Structure --------------------
+
+    def _new_triangle(self, a: int, b: int, c: int) -> int:
+        """Alloue un triangle (a, b, c) sans voisins et renvoie son indice."""
+        if self._free:
+            t = self._free.pop()
+            self.verts[3 * t:3 * t + 3] = (a, b, c)
+            self.nbrs[3 * t:3 * t + 3] = (-1, -1, -1)
+            self.alive[t] = True
+        else:
+            t = len(self.alive)
+            self.verts.extend((a, b, c))
+            self.nbrs.extend((-1, -1, -1))
+            self.alive.append(True)
+        return t
+
+    def _kill(self, t: int) -> None:
+        """Libère l'emplacement du triangle t."""
+        self.alive[t] = False
+        self._free.append(t)
+
+    def is_ghost(self, t: int) -> bool:
+        """Indique si le triangle t est un triangle fantôme."""
+        v = self.verts
+        return v[3 * t] == GHOST or v[3 * t + 1] == GHOST or v[3 * t + 2] == GHOST
+
+    def _hull_edge(self, t: int) -> tuple[int, int]:
+        """Renvoie l'arête finie (a, b) du triangle fantôme t, dans son sens."""
+        v = self.verts
+        for i in range(3):
+            if v[3 * t + i] == GHOST:
+                return v[3 * t + (i + 1) % 3], v[3 * t + (i + 2) % 3]
+        raise ValueError(f"Le triangle {t} n'est pas un triangle fantôme")
+
+    def _link(self, triangles: list[int]) -> None:
+        """Relie entre eux les triangles donnés qui partagent une arête."""
+        v = self.verts
+        edges: dict[tuple[int, int], tuple[int, int]] = {}
+        for t in triangles:
+            for i in range(3):
+                a = v[3 * t + (i + 1) % 3]
+                b = v[3 * t + (i + 2) % 3]
+                other = edges.pop((b, a), None)
+                if other is None:
+                    edges[(a, b)] = (t, i)
+                else:
+                    s, j = other
+                    self.nbrs[3 * t + i] = s
+                    self.nbrs[3 * s + j] = t
+
+    def init_triangle(self, a: int, b: int, c: int) -> None:
+        """Initialise le maillage avec le triangle non dégénéré (a, b, c)."""
+        pts = self.points
+        if orient2d(pts[a], pts[b], pts[c]) < 0:
+            b, c = c, b
+        first = self._new_triangle(a, b, c)
+        ghosts = [
+            self._new_triangle(b, a, GHOST),
+            self._new_triangle(c, b, GHOST),
+            self._new_triangle(a, c, GHOST),
+        ]
+        self._link([first, *ghosts])
+        self.last = first
+
+    # -------------------- Prédicats --------------------
+
+    def _in_conflict(
+        self, t: int, p: Point, in_circle=incircle, orient=orient2d
+    ) -> bool:
+        """Indique si p est dans le cercle circonscrit (ouvert) de t.
+
+        Pour un triangle fantôme, le « cercle » est le demi-plan extérieur
+        ouvert, augmenté de l'intérieur de l'arête d'enveloppe. `in_circle`
+        et `orient` remplacent les prédicats (versions comptées du profilage).
+        """
+        pts = self.points
+        v = self.verts
+        if self.is_ghost(t):
+            a, b = self._hull_edge(t)
+            pa, pb = pts[a], pts[b]
+            o = orient(pa, pb, p)
+            if o != 0:
+                return o > 0
+            return min(pa, pb) < p < max(pa, pb)
+        return in_circle(pts[v[3 * t]], pts[v[3 * t + 1]], pts[v[3 * t + 2]], p) > 0
+
+    # -------------------- Localisation --------------------
+
+    def locate(self, p: Point, start: int | None = None) -> int:
+        """Renvoie un triangle contenant p par marche de visibilité.
+
+        La marche part de `start` (par défaut le dernier triangle créé) et
+        franchit à chaque pas une arête qui sépare strictement le triangle
+        courant de p. Elle s'arrête sur un triangle fantôme si p est
+        strictement hors de l'enveloppe convexe.
+        """
+        pts = self.points
+        v = self.verts
+        nbrs = self.nbrs
+        t = self.last if start is None else start
+        orient = orient2d
+        if profiling.active:
+            orient = profiling.counted("orient2d", orient2d)
+        if self.is_ghost(t):
+            t = nbrs[3 * t + v[3 * t:3 * t + 3].index(GHOST)]
+        offset = 0
+        while not self.is_ghost(t):
+            base = 3 * t
+            for k in range(3):
+                i = (k + offset) % 3
+                a = v[base + (i + 1) % 3]
+                b = v[base + (i + 2) % 3]
+                if orient(pts[a], pts[b], p) < 0:
+                    t = nbrs[base + i]
+                    break
+            else:
+                break
+            # Décalage tournant de l'arête testée en premier : évite les cycles
+            offset += 1
+        if profiling.active:
+            # `offset` compte les arêtes franchies
+            profiling.record("walk_steps", offset)
+        return t
+
+    # -------------------- Insertion --------------------
+
+    def insert(self, i: int) -> bool:
+        """Insère le sommet i dans le maillage.
+
+        Returns
+        -------
+        bool
+            False si le point coïncide avec un sommet existant (non inséré).
+
+        """
+        pts = self.points
+        v = self.verts
+        nbrs = self.nbrs
+        p = pts[i]
+
+        t = self.locate(p)
+        if not self.is_ghost(t) and any(pts[v[3 * t + k]] == p for k in range(3)):
+            return False
+
+        # Cavité : propagation aux voisins en conflit uniquement
+        in_circle, orient = incircle, orient2d
+        if profiling.active:
+            in_circle = profiling.counted("incircle", incircle)
+            orient = profiling.counted("orient2d", orient2d)
+        cavity = {t}
+        stack = [t]
+        while stack:
+            s = stack.pop()
+            for k in range(3):
+                n = nbrs[3 * s + k]
+                if n not in cavity and self._in_conflict(n, p, in_circle, orient):
+                    cavity.add(n)
+                    stack.append(n)
+        if profiling.active:
+            profiling.record("cavity_size", len(cavity))
+
+        # Arêtes frontières (u, w) avec leur voisin extérieur
+        boundary = []
+        for s in cavity:
+            for k in range(3):
+                n = nbrs[3 * s + k]
+                if n not in cavity:
+                    u = v[3 * s + (k + 1) % 3]
+                    w = v[3 * s + (k + 2) % 3]
+                    boundary.append((u, w, n, s))
+
+        # Étoile de p : triangle (u, w, i) pour chaque arête frontière
+        starts: dict[int, int] = {}
+        ends: dict[int, int] = {}
+        for u, w, n, s in boundary:
+            nt = self._new_triangle(u, w, i)
+            nbrs[3 * nt + 2] = n
+            nbrs[3 * n + nbrs[3 * n:3 * n + 3].index(s)] = nt
+            starts[u] = nt
+            ends[w] = nt
+        for nt in starts.values():
+            u, w = v[3 * nt], v[3 * nt + 1]
+            nbrs[3 * nt] = starts[w]
+            nbrs[3 * nt + 1] = ends[u]
+            if GHOST not in (u, w):
+                self.last = nt
+        # Libérés après coup : un emplacement recyclé trop tôt rendrait ambigus
+        # les pointeurs des voisins extérieurs encore à mettre à jour
+        for s in cavity:
+            self._kill(s)
+        return True
+
+    # -------------------- Résultat --------------------
+
+    def triangles(self, flat: bool = False) -> list[Triangle] | array:
+        """Renvoie les triangles finis sous forme de triplets d'indices triés.
+
+        Avec `flat`, les indices sont écrits dans un tableau 'I' plat.
+        """
+        v = self.verts
+        if flat:
+            result = array("I")
+            for t, alive in enumerate(self.alive):
+                if alive and not self.is_ghost(t):
+                    result.extend(sorted(v[3 * t:3 * t + 3]))
+            return result
+        return [
+            tuple(sorted(v[3 * t:3 * t + 3]))
+            for t, alive in enumerate(self.alive)
+            if alive and not self.is_ghost(t)
+        ]
+
+
+def incremental(
+    points: list[Point],
+    ordering: str = "brio",
+    deadline: Deadline | None = None,
+    flat: bool = False,
+) -> list[Triangle] | array:
+    """Triangule une liste de points par insertion incrémentale localisée.
+
+    Les points sont insérés selon un ordre spatial (voir `spatial_sort`) qui
+    garde les marches de localisation courtes ; les doublons exacts sont
+    ignorés et seul le premier point inséré de chaque groupe est référencé.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Liste des points à trianguler.
+    ordering : str
+        Ordre d'insertion parmi `spatial_sort.ORDERINGS` : "brio" (par
+        défaut), "hilbert" ou "input" (ordre de l'appelant).
+    deadline : Deadline | None
+        Échéance vérifiée avant chaque insertion.
+    flat : bool
+        Renvoyer les indices dans un tableau 'I' plat plutôt qu'en triplets.
+
+    Returns
+    -------
+    list[Triangle] | array
+        Liste des triangles sous forme de triplets d'indices triés dans `points`
+        (tableau plat des mêmes indices si `flat`).
+
+    Raises
+    ------
+    DeadlineExceeded
+        Si l'échéance est dépassée avant la fin des insertions.
+
+    """
+    n = len(points)
+    empty = array("I") if flat else []
+    if n < 3:
+        return empty
+    try:
+        order = ORDERINGS[ordering](points)
+    except KeyError:
+        raise ValueError(f"Ordre d'insertion inconnu: {ordering!r}") from None
+
+    # Premier triangle non dégénéré : a, b distincts puis c non colinéaire
+    pa = points[order[0]]
+    kb = next((k for k in range(1, n) if points[order[k]] != pa), None)
+    if kb is None:
+        return empty
+    pb = points[order[kb]]
+    kc = next(
+        (k for k in range(kb + 1, n) if orient2d(pa, pb, points[order[k]]) != 0),
+        None,
+    )
+    if kc is None:
+        return empty
+
+    mesh = TriangleMesh(points)
+    mesh.init_triangle(order[0], order[kb], order[kc])
+    for k in range(1, n):
+        if k != kb and k != kc:
+            if deadline is not None:
+                deadline.check()
+            mesh.insert(order[k])
+    return mesh.triangles(flat)
@@ -0,0 +1,255 @@
+"""Métriques du service au format texte de Prometheus.
+
+Trois types, sur le modèle de `prometheus_client` mais sans dépendance :
+
+- `Counter` : valeur qui ne fait que croître (requêtes, erreurs...) ;
+- `Gauge` : valeur instantanée (requêtes en cours, taille du cache...) ;
+- `Histogram` : répartition d'observations dans des seaux cumulés
+  (latences, nombres de points...), avec leur somme et leur nombre.
+
+Chaque métrique peut porter des étiquettes (`labels`), et une valeur peut
+être lue au moment de l'export via `callback` (par exemple les compteurs
+internes du cache). `Registry.render` produit le texte servi par `/metrics`.
+Les mises à jour sont protégées par un verrou : les métriques se partagent
+entre les threads du serveur, mais pas entre processus.
+"""
+
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seaux par défaut, en secondes : de la milliseconde à la minute
+LATENCY_BUCKETS = (
+    .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10., 30., 60.
+)
+# Seaux de tailles (points, triangles) : puissances de 10
+SIZE_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur d'étiquette pour le format texte."""
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    """Renvoie le bloc `{nom="valeur",...}` d'une série, ou une chaîne vide."""
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    """Renvoie une valeur au format Prometheus."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base commune : nom, aide, étiquettes et séries par valeurs d'étiquettes."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        callback: Callable[[], float] | None = None,
+    ):
+        """Crée une métrique sans aucune série."""
+        if callback is not None and labels:
+            raise ValueError("Une métrique lue par callback n'a pas d'étiquettes")
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._series: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        """Renvoie les valeurs d'étiquettes dans l'ordre déclaré."""
+        if set(labels) != set(self.labels):
+            raise ValueError(
+                f"{self.name} attend les étiquettes {self.labels}, pas {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labels)
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        """Renvoie les échantillons (suffixe, étiquettes, valeur) à exporter."""
+        if self.callback is not None:
+            yield "", "", self.callback()
+            return
+        with self._lock:
+            series = list(self._series.items())
+        if not series and not self.labels:
+            # Une métrique sans étiquettes est exportée dès sa création
+            series = [((), 0)]
+        for key, value in sorted(series):
+            yield "", _format_labels(self.labels, key), value
+
+    def render(self) -> str:
+        """Renvoie le bloc texte de la métrique (HELP, TYPE et échantillons)."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(
+            f"{self.name}{suffix}{labels} {_format_value(value)}"
+            for suffix, labels, value in self._samples()
+        )
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    """Compteur croissant."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Augmente le compteur de la série désignée par `labels`."""
+        if amount < 0:
+            raise ValueError("Un compteur ne peut que croître")
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Renvoie la valeur courante d'une série (0 si elle n'existe pas)."""
+        if self.callback is not None:
+            return self.callback()
+        with self._lock:
+            return self._series.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    """Valeur instantanée, qui peut augmenter ou diminuer."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Ajoute `amount` (éventuellement négatif) à la série."""
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        """Retire `amount` à la série."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        """Remplace la valeur de la série."""
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    @contextmanager
+    def track(self, **labels):
+        """Compte un traitement en cours le temps du bloc `with`."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Répartition d'observations dans des seaux cumulés."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        """Crée un histogramme ; la borne +Inf est ajoutée automatiquement."""
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        """Ajoute une observation à la série désignée par `labels`."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [compte par seau (non cumulé), somme, nombre]
+                series = self._series[key] = [[0] * len(self.buckets), 0., 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        """Renvoie le nombre d'observations d'une série."""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series[2] if series is not None else 0
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe la durée du bloc `with`, en secondes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        """Renvoie les seaux cumulés, la somme et le nombre de chaque série."""
+        with self._lock:
+            series = [
+                (key, list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            ]
+        for key, counts, total, count in sorted(series):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts, strict=True):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                yield "_bucket", _format_labels(self.labels, key, le), cumulative
+            yield "_bucket", _format_labels(self.labels, key, 'le="+Inf"'), count
+            yield "_sum", _format_labels(self.labels, key), total
+            yield "_count", _format_labels(self.labels, key), count
+
+
+class Registry:
+    """Ensemble de métriques exportées ensemble."""
+
+    def __init__(self):
+        """Crée un registre vide."""
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Ajoute une métrique au registre et la renvoie."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrique déjà enregistrée: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels=(), callback=None):
+        """Crée et enregistre un `Counter`."""
+        return self.register(Counter(name, documentation, labels, callback))
+
+    def gauge(self, name: str, documentation: str, labels=(), callback=None):
+        """Crée et enregistre une `Gauge`."""
+        return self.register(Gauge(name, documentation, labels, callback))
+
+    def histogram(
+        self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS
+    ):
+        """Crée et enregistre un `Histogram`."""
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Renvoie toutes les métriques au format texte de Prometheus."""
+        return "".join(m.render() for m in self._metrics.values())
@@ -0,0 +1,307 @@
+"""Requêtes sur une triangulation construite : localisation et plus proche sommet.
+
+`PointLocator` indexe une triangulation figée (celle renvoyée par
+`triangulate` ou décodée d'un binaire `Triangles`) pour répondre à deux
+questions sur des points quelconques, sans parcourir tous les triangles :
+
+- `locate` : quel triangle contient q ? La recherche saute d'abord dans une
+  grille uniforme de germes (un triangle par cellule, environ deux triangles
+  par cellule en moyenne), puis marche par visibilité jusqu'au triangle
+  cherché, en franchissant à chaque pas une arête qui sépare q du triangle
+  courant. Franchir une arête d'enveloppe signifie que q est hors de
+  l'enveloppe convexe.
+- `nearest` : quel sommet est le plus proche de q ? Depuis le sommet le plus
+  proche du triangle atteint, une descente gloutonne sur le graphe de
+  Delaunay passe au voisin plus proche tant qu'il en existe un ; sur une
+  triangulation de Delaunay, elle s'arrête toujours sur le plus proche sommet.
+
+Sur des points répartis uniformément, chaque requête coûte O(1) en moyenne
+après une construction en O(n) ; une cellule sans triangle reprend le germe
+d'une cellule voisine. Les variantes `*_many` traitent un lot de requêtes et
+renvoient des `array('i')`.
+"""
+
+import math
+from array import array
+from collections.abc import Iterable, Sequence
+
+from predicates import orient2d
+
+Point = tuple[float, float]
+Triangle = tuple[int, int, int]
+OUTSIDE = -1
+# Nombre moyen de triangles par cellule de la grille de germes
+SEED_TRIANGLES_PER_CELL = 2
+
+
+class PointLocator:
+    """Index de localisation et de plus proche sommet sur une triangulation.
+
+    Parameters
+    ----------
+    points : Sequence[Point]
+        Sommets de la triangulation.
+    triangles : Sequence[Triangle]
+        Triangles (triplets d'indices dans `points`, dans n'importe quel
+        sens) d'une triangulation de Delaunay ; les indices renvoyés par
+        `locate` sont leurs positions dans cette séquence.
+
+    """
+
+    def __init__(self, points: Sequence[Point], triangles: Sequence[Triangle]):
+        """Construit l'index : orientation, voisinage, graphe et germes."""
+        self.points = [(float(x), float(y)) for x, y in points]
+        self.n_triangles = len(triangles)
+        self._build_mesh(triangles)
+        self._build_graph()
+        self._build_seeds()
+
+    @classmethod
+    def from_triangulation(cls, triangulation) -> "PointLocator":
+        """Construit l'index d'une `Triangulation` compacte."""
+        return cls(triangulation.points, triangulation.triangles)
+
+    # -------------------- Construction --------------------
+
+    def _build_mesh(self, triangles: Sequence[Triangle]) -> None:
+        """Oriente les triangles dans le sens direct et relie leurs voisins.
+
+        `verts[3t + k]` est le sommet k du triangle t et `nbrs[3t + k]` le
+        triangle opposé à ce sommet (OUTSIDE sur l'enveloppe).
+        """
+        pts = self.points
+        verts = array("i")
+        for a, b, c in triangles:
+            if orient2d(pts[a], pts[b], pts[c]) < 0:
+                b, c = c, b
+            verts.extend((a, b, c))
+        nbrs = array("i", [OUTSIDE]) * len(verts)
+        edges: dict[tuple[int, int], int] = {}
+        for slot in range(len(verts)):
+            base = slot - slot % 3
+            k = slot % 3
+            u = verts[base + (k + 1) % 3]
+            w = verts[base + (k + 2) % 3]
+            twin = edges.pop((w, u), None)
+            if twin is None:
+                edges[(u, w)] = slot
+            else:
+                nbrs[slot] = twin // 3
+                nbrs[twin] = base // 3
+        self.verts = verts
+        self.nbrs = nbrs
+
+    def _build_graph(self) -> None:
+        """Construit les listes d'adjacence des sommets (format CSR)."""
+        verts = self.verts
+        nbrs = self.nbrs
+        degree = array("i", [0]) * (len(self.points) + 1)
+        pairs = []
+        for slot in range(len(verts)):
+            t = slot // 3
+            # Chaque arête n'est retenue qu'une fois, par le triangle de rang
+            # le plus élevé ou par son unique triangle sur l'enveloppe
+            if nbrs[slot] < t:
+                k = slot % 3
+                u = verts[3 * t + (k + 1) % 3]
+                w = verts[3 * t + (k + 2) % 3]
+                pairs.append((u, w))
+                degree[u + 1] += 1
+                degree[w + 1] += 1
+        for i in range(len(self.points)):
+            degree[i + 1] += degree[i]
+        self.offsets = degree
+        adjacency = array("i", [0]) * degree[-1]
+        fill = array("i", degree)
+        for u, w in pairs:
+            adjacency[fill[u]] = w
+            fill[u] += 1
+            adjacency[fill[w]] = u
+            fill[w] += 1
+        self.adjacency = adjacency
+
+    def _build_seeds(self) -> None:
+        """Range un triangle germe par cellule d'une grille sur la boîte englobante."""
+        pts = self.points
+        verts = self.verts
+        if self.n_triangles == 0:
+            self._grid_side = 0
+            self.seeds = array("i")
+            return
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        self._xmin, self._ymin = min(xs), min(ys)
+        side = max(1, math.isqrt(self.n_triangles // SEED_TRIANGLES_PER_CELL))
+        span_x = max(xs) - self._xmin
+        span_y = max(ys) - self._ymin
+        self._scale_x = side / span_x if span_x > 0 else 0.
+        self._scale_y = side / span_y if span_y > 0 else 0.
+        self._grid_side = side
+        seeds = array("i", [OUTSIDE]) * (side * side)
+        for t in range(self.n_triangles):
+            a, b, c = verts[3 * t], verts[3 * t + 1], verts[3 * t + 2]
+            cx = (pts[a][0] + pts[b][0] + pts[c][0]) / 3
+            cy = (pts[a][1] + pts[b][1] + pts[c][1]) / 3
+            seeds[self._cell(cx, cy)] = t
+        # Une cellule vide reprend le germe d'une voisine de la même ligne,
+        # ou de la ligne précédente si toute la ligne est vide
+        for j in range(side):
+            row = range(j * side, (j + 1) * side)
+            last = OUTSIDE
+            for cell in (*row, *reversed(row)):
+                if seeds[cell] == OUTSIDE:
+                    seeds[cell] = last
+                else:
+                    last = seeds[cell]
+            if last == OUTSIDE and j > 0:
+                seeds[row.start:row.stop] = seeds[row.start - side:row.start]
+        self.seeds = seeds
+
+    def _cell(self, x: float, y: float) -> int:
+        """Renvoie la cellule de la grille de germes qui contient (x, y)."""
+        side = self._grid_side
+        i = min(max(int((x - self._xmin) * self._scale_x), 0), side - 1)
+        j = min(max(int((y - self._ymin) * self._scale_y), 0), side - 1)
+        return j * side + i
+
+    # -------------------- Requêtes --------------------
+
+    def _walk(self, q: Point, t: int) -> tuple[int, int]:
+        """Marche par visibilité depuis t.
+
+        Returns
+        -------
+        tuple[int, int]
+            Triangle contenant q (OUTSIDE hors de l'enveloppe) et dernier
+            triangle visité.
+
+        """
+        pts = self.points
+        v = self.verts
+        nbrs = self.nbrs
+        offset = 0
+        while True:
+            base = 3 * t
+            for k in range(3):
+                i = (k + offset) % 3
+                a = v[base + (i + 1) % 3]
+                b = v[base + (i + 2) % 3]
+                if orient2d(pts[a], pts[b], q) < 0:
+                    n = nbrs[base + i]
+                    if n == OUTSIDE:
+                        return OUTSIDE, t
+                    t = n
+                    break
+            else:
+                return t, t
+            # Décalage tournant de l'arête testée en premier : évite les cycles
+            offset += 1
+
+    def _seed(self, q: Point, previous: int) -> int:
+        """Renvoie le triangle de départ d'une marche vers q."""
+        seed = self.seeds[self._cell(q[0], q[1])]
+        # Premières lignes vides (points très inégalement répartis) : la
+        # marche repart du résultat précédent
+        return previous if seed == OUTSIDE else seed
+
+    def _descend(self, q: Point, v: int) -> int:
+        """Descend le graphe de Delaunay depuis v jusqu'au sommet le plus proche."""
+        pts = self.points
+        offsets = self.offsets
+        adjacency = self.adjacency
+        qx, qy = q
+        best = (pts[v][0] - qx) ** 2 + (pts[v][1] - qy) ** 2
+        improved = True
+        while improved:
+            improved = False
+            for k in range(offsets[v], offsets[v + 1]):
+                w = adjacency[k]
+                d = (pts[w][0] - qx) ** 2 + (pts[w][1] - qy) ** 2
+                if d < best:
+                    best, v, improved = d, w, True
+        return v
+
+    def _nearest_from(self, q: Point, t: int) -> int:
+        """Renvoie le plus proche sommet de q en partant du triangle t."""
+        pts = self.points
+        qx, qy = q
+        start = min(
+            self.verts[3 * t:3 * t + 3],
+            key=lambda v: (pts[v][0] - qx) ** 2 + (pts[v][1] - qy) ** 2,
+        )
+        return self._descend(q, start)
+
+    def _nearest_scan(self, q: Point) -> int:
+        """Renvoie le plus proche point par parcours complet (sans triangle)."""
+        if not self.points:
+            return OUTSIDE
+        qx, qy = q
+        pts = self.points
+        return min(
+            range(len(pts)),
+            key=lambda i: (pts[i][0] - qx) ** 2 + (pts[i][1] - qy) ** 2,
+        )
+
+    def locate(self, q: Point) -> int:
+        """Renvoie l'indice d'un triangle qui contient q, ou OUTSIDE (-1).
+
+        Un point sur une arête ou un sommet est attribué à l'un des
+        triangles qui le contiennent.
+        """
+        return self.locate_many((q,))[0]
+
+    def nearest(self, q: Point) -> int:
+        """Renvoie l'indice du sommet le plus proche de q (-1 sans sommet).
+
+        Seuls les sommets d'au moins un triangle sont candidats (les
+        doublons écartés par la triangulation ne sont jamais renvoyés), sauf
+        pour une triangulation sans triangle, parcourue entièrement.
+        """
+        return self.nearest_many((q,))[0]
+
+    def locate_many(self, queries: Iterable[Point]) -> array:
+        """Renvoie le triangle contenant chaque requête (`array('i')`)."""
+        return self.query_many(queries, nearest=False)[0]
+
+    def nearest_many(self, queries: Iterable[Point]) -> array:
+        """Renvoie le plus proche sommet de chaque requête (`array('i')`)."""
+        return self.query_many(queries)[1]
+
+    def query_many(
+        self, queries: Iterable[Point], nearest: bool = True
+    ) -> tuple[array, array | None]:
+        """Localise un lot de requêtes et cherche leurs plus proches sommets.
+
+        Parameters
+        ----------
+        queries : Iterable[Point]
+            Points (x, y) à interroger.
+        nearest : bool
+            Chercher aussi le plus proche sommet (sinon le second résultat
+            vaut None).
+
+        Returns
+        -------
+        tuple[array, array | None]
+            Triangles contenant les requêtes (OUTSIDE hors de l'enveloppe)
+            et plus proches sommets, dans l'ordre des requêtes.
+
+        """
+        located = array("i")
+        closest = array("i") if nearest else None
+        if self.n_triangles == 0:
+            for q in queries:
+                located.append(OUTSIDE)
+                if nearest:
+                    closest.append(self._nearest_scan(q))
+            return located, closest
+
+        previous = 0
+        for x, y in queries:
+            q = (float(x), float(y))
+            t, last = self._walk(q, self._seed(q, previous))
+            previous = last
+            located.append(t)
+            if nearest:
+                closest.append(self._nearest_from(q, last))
+        return located, closest
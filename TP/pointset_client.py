@@ -0,0 +1,293 @@
+"""Client HTTP du PointSetManager (`GET /pointset/{pointSetId}`).
+
+Le client garde un pool de connexions HTTP/1.1 persistantes (keep-alive) pour
+ne pas payer une poignée de main TCP à chaque récupération, sépare les délais
+de connexion et de lecture, retente les échecs transitoires avec un recul
+exponentiel borné, et coupe court grâce à un disjoncteur quand le
+PointSetManager est durablement indisponible.
+
+Les erreurs sont levées sous forme de `PointSetManagerError`, qui porte le
+code et le statut HTTP à renvoyer au client selon `triangulator.yml`.
+"""
+
+import http.client
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class PointSetManagerError(RuntimeError):
+    """Échec de récupération d'un PointSet, traduit en erreur `Error`."""
+
+    def __init__(self, code: str, message: str, status: int):
+        """Crée une erreur avec son code interne et son statut HTTP."""
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+
+
+def _unavailable(message: str) -> PointSetManagerError:
+    """Renvoie l'erreur 503 standard du PointSetManager."""
+    return PointSetManagerError("POINTSET_MANAGER_ERROR", message, 503)
+
+
+class CircuitBreaker:
+    """Disjoncteur : s'ouvre après `threshold` échecs consécutifs.
+
+    Ouvert, il refuse les appels pendant `reset_timeout` secondes, puis laisse
+    passer un appel d'essai (semi-ouvert) : un succès le referme, un échec le
+    rouvre pour une nouvelle période.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float, clock=time.monotonic):
+        """Crée un disjoncteur fermé."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """Renvoie l'état courant : "closed", "open" ou "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Indique si un appel peut être tenté maintenant."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Enregistre un succès : referme le disjoncteur."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        """Enregistre un échec : ouvre le disjoncteur au-delà du seuil."""
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = self._clock()
+            self._trial = False
+
+
+class PointSetManagerClient:
+    """Client du PointSetManager avec pool, délais, reprises et disjoncteur.
+
+    Parameters
+    ----------
+    base_url : str
+        URL racine du PointSetManager, par exemple "http://psm:8080".
+    connect_timeout, read_timeout : float
+        Délais en secondes pour établir la connexion et pour chaque lecture.
+    retries : int
+        Nombre de nouvelles tentatives après un échec transitoire.
+    backoff : float
+        Attente avant la première reprise, doublée à chaque reprise.
+    pool_size : int
+        Nombre maximal de connexions inactives conservées.
+    breaker_threshold : int
+        Nombre d'échecs consécutifs qui ouvre le disjoncteur.
+    breaker_reset : float
+        Durée d'ouverture du disjoncteur, en secondes.
+
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float = 1.0,
+        read_timeout: float = 5.0,
+        retries: int = 2,
+        backoff: float = 0.05,
+        pool_size: int = 8,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 10.0,
+    ):
+        """Crée un client ; aucune connexion n'est ouverte d'avance."""
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"URL du PointSetManager invalide: {base_url!r}")
+        self._connection_class = (
+            http.client.HTTPSConnection if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.host = url.hostname
+        self.port = url.port
+        self.prefix = url.path.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.connections_opened = 0
+
+    # -------------------- Pool de connexions --------------------
+
+    def _acquire(
+        self, remaining: float | None = None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """Prend une connexion inactive du pool ou en ouvre une nouvelle.
+
+        L'ouverture est bornée par `connect_timeout` et par le temps restant
+        `remaining` avant l'échéance de la requête. Renvoie la connexion et un
+        booléen indiquant si elle était réutilisée.
+        """
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            pass
+        timeout = self.connect_timeout
+        if remaining is not None:
+            timeout = min(timeout, remaining)
+        conn = self._connection_class(self.host, self.port, timeout=timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        self.connections_opened += 1
+        return conn, False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        """Remet une connexion réutilisable dans le pool, ou la ferme."""
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        """Ferme toutes les connexions inactives du pool."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # -------------------- Requête --------------------
+
+    def _request(
+        self, path: str, deadline: float | None
+    ) -> tuple[int, bytes | bytearray]:
+        """Exécute un GET et renvoie (statut, corps) ; lève OSError si réseau.
+
+        Une connexion réutilisée que le serveur a fermée entre-temps est
+        remplacée une fois par une connexion neuve, sans compter d'échec.
+        L'échéance est vérifiée avant de prendre une connexion : une requête
+        déjà hors délai ne ferme pas une connexion saine du pool.
+        """
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Délai de la requête dépassé")
+            conn, reused = self._acquire(remaining)
+            try:
+                if remaining is not None:
+                    conn.sock.settimeout(min(self.read_timeout, remaining))
+                conn.request("GET", path, headers={"Connection": "keep-alive"})
+                response = conn.getresponse()
+                body = _read_body(response)
+            except (http.client.RemoteDisconnected, BrokenPipeError) as e:
+                conn.close()
+                if reused:
+                    continue
+                raise OSError(str(e)) from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise OSError(str(e)) from e
+            if response.will_close:
+                conn.close()
+            else:
+                conn.sock.settimeout(self.read_timeout)
+                self._release(conn)
+            return response.status, body
+
+    def fetch(
+        self, pointSetId: str, deadline: float | None = None
+    ) -> bytes | bytearray:
+        """Récupère le PointSet binaire `pointSetId`.
+
+        Parameters
+        ----------
+        pointSetId : str
+            Identifiant du PointSet.
+        deadline : float | None
+            Instant `time.monotonic()` au-delà duquel abandonner.
+
+        Returns
+        -------
+        bytes | bytearray
+            Représentation binaire du PointSet (le tampon de réception).
+
+        Raises
+        ------
+        PointSetManagerError
+            404 si le PointSet n'existe pas, 400 si l'identifiant est refusé,
+            503 si le PointSetManager est injoignable ou indisponible.
+
+        """
+        path = f"{self.prefix}/pointset/{pointSetId}"
+        last_error = "PointSetManager unavailable"
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                raise _unavailable("PointSetManager circuit open")
+            try:
+                status, body = self._request(path, deadline)
+            except OSError as e:
+                status, body, last_error = None, b"", str(e)
+
+            if status == 200:
+                self.breaker.record_success()
+                return body
+            if status in (400, 404):
+                # Réponse métier : le service fonctionne, inutile de retenter
+                self.breaker.record_success()
+                if status == 404:
+                    raise PointSetManagerError(
+                        "POINTSET_NOT_FOUND", f"PointSet {pointSetId} not found.", 404
+                    )
+                raise PointSetManagerError(
+                    "INVALID_POINTSET_ID", "The PointSetID format is invalid.", 400
+                )
+            if status is not None:
+                last_error = f"PointSetManager answered HTTP {status}"
+
+            self.breaker.record_failure()
+            if attempt < self.retries:
+                pause = self.backoff * (2 ** attempt)
+                if deadline is not None and time.monotonic() + pause >= deadline:
+                    break
+                time.sleep(pause)
+        raise _unavailable(last_error)
+
+
+def _read_body(response: http.client.HTTPResponse) -> bytes | bytearray:
+    """Lit le corps d'une réponse dans un tampon préalloué si sa taille est connue."""
+    length = response.getheader("Content-Length")
+    if length is None:
+        return response.read()
+    buffer = bytearray(int(length))
+    view = memoryview(buffer)
+    filled = 0
+    while filled < len(buffer):
+        n = response.readinto(view[filled:])
+        if not n:
+            raise http.client.IncompleteRead(bytes(view[:filled]), len(buffer) - filled)
+        filled += n
+    return buffer
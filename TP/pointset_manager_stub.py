@@ -0,0 +1,173 @@
+"""PointSetManager local de substitution, conforme à `point_set_manager.yml`.
+
+Serveur HTTP/1.1 réel (connexions persistantes) qui stocke les PointSets en
+mémoire. Il sert aux tests du client HTTP et aux tests de charge : il peut
+injecter des pannes (réponses 503, pour les `fail_next` prochaines requêtes
+ou au hasard avec la probabilité `failure_rate`) et de la latence, et compte
+les connexions TCP acceptées.
+
+Lancement autonome : ``python pointset_manager_stub.py [port]``.
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from encoding import decode_pointset
+
+_POINTSET_PATH = re.compile(r"^/pointset/([^/]+)$")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Gestionnaire des routes `/pointset` et `/pointset/{pointSetId}`."""
+
+    protocol_version = "HTTP/1.1"
+    server: "PointSetManagerStub"
+
+    def setup(self):
+        """Compte chaque nouvelle connexion TCP."""
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        """Désactive le journal d'accès sur la sortie d'erreur."""
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, code: str, message: str) -> None:
+        body = json.dumps({"code": code, "message": message}).encode()
+        self._send(status, body, "application/json")
+
+    def _injected_failure(self) -> bool:
+        """Applique la latence et les pannes programmées ; True si panne."""
+        stub = self.server
+        if stub.latency:
+            time.sleep(stub.latency)
+        with stub.lock:
+            if stub.fail_next > 0:
+                stub.fail_next -= 1
+                failing = True
+            else:
+                failing = stub.rng.random() < stub.failure_rate
+        if failing:
+            self._error(503, "UNAVAILABLE", "Storage layer unavailable.")
+        return failing
+
+    def do_GET(self):
+        """Renvoie le PointSet binaire demandé."""
+        with self.server.lock:
+            self.server.requests += 1
+        match = _POINTSET_PATH.match(self.path)
+        if match is None:
+            self._error(404, "NOT_FOUND", "Unknown route.")
+            return
+        if self._injected_failure():
+            return
+        try:
+            pointset_id = str(uuid.UUID(match.group(1)))
+        except ValueError:
+            self._error(400, "INVALID_ID", "The PointSetID format is invalid.")
+            return
+        data = self.server.pointsets.get(pointset_id)
+        if data is None:
+            self._error(404, "NOT_FOUND", "The requested resource could not be found.")
+            return
+        self._send(200, data, "application/octet-stream")
+
+    def do_POST(self):
+        """Enregistre un nouveau PointSet binaire et renvoie son identifiant."""
+        length = int(self.headers.get("Content-Length", 0))
+        data = self.rfile.read(length)
+        if self.path != "/pointset":
+            self._error(404, "NOT_FOUND", "Unknown route.")
+            return
+        try:
+            decode_pointset(data)
+        except ValueError:
+            self._error(400, "INVALID_POINTSET", "Invalid binary format.")
+            return
+        pointset_id = self.server.add(data)
+        body = json.dumps({"pointSetId": pointset_id}).encode()
+        self._send(201, body, "application/json")
+
+
+class PointSetManagerStub(ThreadingHTTPServer):
+    """PointSetManager en mémoire, lancé dans un thread de fond.
+
+    Parameters
+    ----------
+    host : str
+        Adresse d'écoute.
+    port : int
+        Port d'écoute ; 0 pour un port libre choisi par le système.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """Crée le serveur (sans le démarrer)."""
+        super().__init__((host, port), _Handler)
+        self.lock = threading.Lock()
+        self.pointsets: dict[str, bytes] = {}
+        self.fail_next = 0
+        self.failure_rate = 0.0
+        self.rng = random.Random()
+        self.latency = 0.0
+        self.connections = 0
+        self.requests = 0
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Renvoie l'URL racine du serveur."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, data: bytes, pointset_id: str | None = None) -> str:
+        """Enregistre un PointSet binaire et renvoie son identifiant."""
+        pointset_id = pointset_id or str(uuid.uuid4())
+        with self.lock:
+            self.pointsets[pointset_id] = bytes(data)
+        return pointset_id
+
+    def start(self) -> "PointSetManagerStub":
+        """Démarre le serveur dans un thread de fond."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Arrête le serveur et libère le port."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        """Démarre le serveur à l'entrée d'un bloc `with`."""
+        return self.start()
+
+    def __exit__(self, *exc):
+        """Arrête le serveur à la sortie d'un bloc `with`."""
+        self.stop()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+    stub = PointSetManagerStub("0.0.0.0", port)
+    print(f"PointSetManager stub running on {stub.url}")
+    stub.serve_forever()
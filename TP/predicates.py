@@ -0,0 +1,112 @@
+"""Prédicats géométriques robustes : orientation et test du cercle circonscrit.
+
+Les deux prédicats sont écrits sous forme de déterminants et suivent le schéma
+adaptatif de Shewchuk : le déterminant est d'abord évalué en flottants, avec
+une borne d'erreur calculée à partir de la permanente des mêmes termes. Si le
+résultat dépasse cette borne, son signe est garanti exact ; sinon (points
+presque alignés ou cocycliques) le déterminant est recalculé exactement en
+rationnels avec `fractions.Fraction`. Le chemin exact est rare en pratique.
+
+Seul le signe des valeurs renvoyées est significatif.
+"""
+
+from fractions import Fraction
+
+Point = tuple[float, float]
+
+_EPSILON = 2.0 ** -53
+ORIENT_ERRBOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+INCIRCLE_ERRBOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+
+
+def _sign(value: Fraction) -> float:
+    """Renvoie le signe d'un rationnel sous forme de flottant."""
+    return 1.0 if value > 0 else -1.0 if value < 0 else 0.0
+
+
+def _orient2d_exact(a: Point, b: Point, c: Point) -> float:
+    """Évalue exactement le signe de orient2d en rationnels."""
+    ax, ay = Fraction(a[0]), Fraction(a[1])
+    bx, by = Fraction(b[0]), Fraction(b[1])
+    cx, cy = Fraction(c[0]), Fraction(c[1])
+    return _sign((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def _incircle_exact(a: Point, b: Point, c: Point, d: Point) -> float:
+    """Évalue exactement le signe de incircle en rationnels."""
+    dx, dy = Fraction(d[0]), Fraction(d[1])
+    adx, ady = Fraction(a[0]) - dx, Fraction(a[1]) - dy
+    bdx, bdy = Fraction(b[0]) - dx, Fraction(b[1]) - dy
+    cdx, cdy = Fraction(c[0]) - dx, Fraction(c[1]) - dy
+    return _sign(
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+    )
+
+
+def orient2d(a: Point, b: Point, c: Point) -> float:
+    """Détermine l'orientation du triangle (a, b, c).
+
+    Returns
+    -------
+    float
+        Positif si (a, b, c) tourne dans le sens direct, négatif dans le sens
+        horaire, nul si les trois points sont alignés.
+
+    """
+    detleft = (a[0] - c[0]) * (b[1] - c[1])
+    detright = (a[1] - c[1]) * (b[0] - c[0])
+    det = detleft - detright
+    errbound = ORIENT_ERRBOUND * (abs(detleft) + abs(detright))
+    if det > errbound or -det > errbound:
+        return det
+    return _orient2d_exact(a, b, c)
+
+
+def incircle(a: Point, b: Point, c: Point, d: Point) -> float:
+    """Situe d par rapport au cercle circonscrit du triangle (a, b, c).
+
+    Le triangle (a, b, c) doit être dans le sens direct ; dans le sens horaire
+    le signe du résultat est inversé.
+
+    Returns
+    -------
+    float
+        Positif si d est strictement dans le cercle, négatif s'il est
+        strictement dehors, nul si les quatre points sont cocycliques.
+
+    """
+    dx, dy = d
+    adx = a[0] - dx
+    ady = a[1] - dy
+    bdx = b[0] - dx
+    bdy = b[1] - dy
+    cdx = c[0] - dx
+    cdy = c[1] - dy
+
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    alift = adx * adx + ady * ady
+    blift = bdx * bdx + bdy * bdy
+    clift = cdx * cdx + cdy * cdy
+
+    det = (
+        alift * (bdxcdy - cdxbdy)
+        + blift * (cdxady - adxcdy)
+        + clift * (adxbdy - bdxady)
+    )
+    permanent = (
+        (abs(bdxcdy) + abs(cdxbdy)) * alift
+        + (abs(cdxady) + abs(adxcdy)) * blift
+        + (abs(adxbdy) + abs(bdxady)) * clift
+    )
+    errbound = INCIRCLE_ERRBOUND * permanent
+    if det > errbound or -det > errbound:
+        return det
+    return _incircle_exact(a, b, c, d)
+
@@ -0,0 +1,163 @@
+"""Pré-traitement des points avant triangulation : doublons et dégénérescences.
+
+Les capteurs renvoient souvent des points répétés ou presque confondus. Les
+moteurs écartent déjà les doublons exacts, mais après un tri ou un ordre
+spatial qui porte sur tous les points, et des points presque confondus
+produisent des triangles minuscules aux prédicats coûteux (chemin exact).
+`prepare` fait une passe en O(n) avant le moteur :
+
+- fusion des points à distance au plus `tolerance` d'un point déjà retenu,
+  par une grille de hachage uniforme de pas `tolerance` (seules les 9
+  cellules voisines sont examinées) ; avec `tolerance=0`, seuls les doublons
+  exacts sont fusionnés, par un dictionnaire ;
+- détection des entrées dégénérées (moins de trois points distincts ou tous
+  alignés), qui n'ont aucun triangle : le moteur n'est alors pas appelé.
+
+Le premier point de chaque groupe (dans l'ordre d'entrée) le représente ;
+`Prepared.index` donne l'indice d'origine de chaque représentant, pour que
+les triangles référencent toujours la liste de l'appelant.
+"""
+
+import math
+from array import array
+from typing import NamedTuple
+
+from predicates import orient2d
+
+Point = tuple[float, float]
+Triangle = tuple[int, int, int]
+
+
+class Prepared(NamedTuple):
+    """Points retenus pour la triangulation.
+
+    Attributes
+    ----------
+    points : list[Point]
+        Représentants, dans l'ordre d'entrée.
+    index : list[int]
+        Indice d'origine de chaque représentant (croissant).
+    degenerate : bool
+        Vrai si les points n'ont aucun triangle (moins de trois points
+        distincts, ou tous alignés).
+
+    """
+
+    points: list[Point]
+    index: list[int]
+    degenerate: bool
+
+
+def merge_points(
+    points: list[Point], tolerance: float = 0.
+) -> tuple[list[Point], list[int]]:
+    """Fusionne les points confondus à `tolerance` près.
+
+    Un point est fusionné avec le premier représentant situé à une distance
+    au plus `tolerance` ; la fusion n'est pas transitive (une chaîne de
+    points espacés de `tolerance` garde un représentant tous les deux pas).
+
+    Parameters
+    ----------
+    points : list[Point]
+        Points à fusionner.
+    tolerance : float
+        Distance de fusion ; 0 pour les seuls doublons exacts.
+
+    Returns
+    -------
+    tuple[list[Point], list[int]]
+        Représentants et leurs indices dans `points`.
+
+    Raises
+    ------
+    ValueError
+        Si `tolerance` est négative ou non finie.
+
+    """
+    if not (0 <= tolerance < math.inf):
+        raise ValueError(f"Tolérance de fusion invalide: {tolerance!r}")
+    kept: list[Point] = []
+    index: list[int] = []
+
+    if tolerance == 0:
+        seen: set[Point] = set()
+        for i, p in enumerate(points):
+            if p not in seen:
+                seen.add(p)
+                kept.append(p)
+                index.append(i)
+        return kept, index
+
+    # Grille de pas `tolerance` : un point proche est dans une cellule voisine
+    inv = 1.0 / tolerance
+    tol2 = tolerance * tolerance
+    grid: dict[tuple[int, int], list[int]] = {}
+    for i, p in enumerate(points):
+        x, y = p
+        cx = math.floor(x * inv)
+        cy = math.floor(y * inv)
+        if not _has_neighbour(grid, kept, cx, cy, x, y, tol2):
+            grid.setdefault((cx, cy), []).append(len(kept))
+            kept.append(p)
+            index.append(i)
+    return kept, index
+
+
+def _has_neighbour(grid, kept, cx, cy, x, y, tol2) -> bool:
+    """Indique si un représentant des 9 cellules voisines est à portée."""
+    for gx in (cx - 1, cx, cx + 1):
+        for gy in (cy - 1, cy, cy + 1):
+            for k in grid.get((gx, gy), ()):
+                qx, qy = kept[k]
+                if (qx - x) ** 2 + (qy - y) ** 2 <= tol2:
+                    return True
+    return False
+
+
+def is_degenerate(points: list[Point]) -> bool:
+    """Indique si des points distincts n'ont aucun triangle (moins de 3, alignés).
+
+    La recherche s'arrête au premier point non aligné avec les deux premiers :
+    elle est immédiate sur des données ordinaires, linéaire au pire.
+    """
+    if len(points) < 3:
+        return True
+    a, b = points[0], points[1]
+    return all(orient2d(a, b, c) == 0 for c in points[2:])
+
+
+def prepare(points: list[Point], tolerance: float = 0.) -> Prepared:
+    """Fusionne les points confondus et détecte les entrées dégénérées.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Points à trianguler.
+    tolerance : float
+        Distance de fusion (voir `merge_points`).
+
+    Returns
+    -------
+    Prepared
+        Représentants, indices d'origine et indicateur de dégénérescence.
+
+    """
+    kept, index = merge_points(points, tolerance)
+    return Prepared(kept, index, is_degenerate(kept))
+
+
+def restore_indices(
+    triangles: list[Triangle] | array, index: list[int]
+) -> list[Triangle] | array:
+    """Renvoie les triangles renumérotés dans la liste d'origine.
+
+    Les triangles sont des triplets ou un tableau 'I' plat, renvoyé sous la
+    même forme. `index` étant croissant, des triplets triés le restent.
+    """
+    if not index or index[-1] == len(index) - 1:
+        # Aucun point fusionné : les indices sont déjà ceux d'origine
+        return triangles
+    if isinstance(triangles, array):
+        return array("I", map(index.__getitem__, triangles))
+    return [(index[a], index[b], index[c]) for a, b, c in triangles]
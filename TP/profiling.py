@@ -0,0 +1,220 @@
+"""Profilage échantillonné, à la demande, des triangulations lentes.
+
+`Profile` encadre un appel (``with Profile(delay=1.0): triangulate(...)``).
+Un thread attend `delay` secondes ; si l'appel n'est pas terminé, il relève
+ensuite la pile du thread profilé toutes les `interval` secondes. Un appel
+rapide ne coûte donc qu'un thread endormi, sans échantillon ni compteur.
+
+Dès le début de l'échantillonnage, des compteurs d'algorithme sont activés :
+
+- appels aux prédicats `incircle` et `orient2d` dans les boucles des
+  moteurs : sous `active`, chaque boucle remplace ses prédicats par les
+  enveloppes de `counted`, liées au profil courant ; les modules ne sont
+  jamais modifiés ;
+- longueur des marches de localisation (`walk_steps`) et taille des cavités
+  de Bowyer-Watson (`cavity_size`), signalées par `mesh` via `record` tant
+  que `active` est vrai.
+
+Les compteurs sont propres au contexte de l'appel profilé (`contextvars`) :
+les triangulations concurrentes d'autres threads ne s'y ajoutent pas, et les
+calculs exécutés dans d'autres processus n'y apparaissent pas. Un profil
+terminé se transmet (pickle) au processus qui doit l'écrire.
+
+`Profile.save` écrit les piles au format « collapsed stacks » (une ligne
+``cadre;cadre;... nombre`` par pile, lisible par flamegraph.pl ou speedscope)
+et les compteurs dans un fichier JSON voisin.
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+SAMPLE_INTERVAL = 0.005
+
+# Vrai tant qu'au moins un profil compte ; lu par les moteurs avant `record`
+# et `counted`
+active = False
+
+_current: contextvars.ContextVar["Profile | None"] = contextvars.ContextVar(
+    "profile", default=None
+)
+_lock = threading.Lock()
+_counting_profiles = 0
+
+
+def record(name: str, value: int) -> None:
+    """Ajoute une mesure d'algorithme (total, nombre et maximum) au profil courant."""
+    profile = _current.get()
+    if profile is not None and profile.counting:
+        counters = profile.counters
+        counters[name] += value
+        counters[f"{name}_count"] += 1
+        if value > counters[f"{name}_max"]:
+            counters[f"{name}_max"] = value
+
+
+def counted(name: str, fn):
+    """Renvoie `fn` enveloppée pour compter ses appels dans le profil courant.
+
+    Les moteurs l'appellent sous `active`, à l'entrée d'une boucle, et
+    utilisent l'enveloppe à la place du prédicat. Hors d'un profil qui
+    compte, `fn` est renvoyée telle quelle.
+    """
+    profile = _current.get()
+    if profile is None or not profile.counting:
+        return fn
+    counters = profile.counters
+
+    def wrapper(*args):
+        counters[name] += 1
+        return fn(*args)
+
+    return wrapper
+
+
+def _start_counting() -> None:
+    """Active les compteurs des moteurs (au premier profil qui compte)."""
+    global active, _counting_profiles
+    with _lock:
+        _counting_profiles += 1
+        active = True
+
+
+def _stop_counting() -> None:
+    """Désactive les compteurs des moteurs (au dernier profil qui compte)."""
+    global active, _counting_profiles
+    with _lock:
+        _counting_profiles -= 1
+        active = _counting_profiles > 0
+
+
+def _collapse(frame) -> str:
+    """Renvoie la pile d'un cadre, de la racine au sommet, séparée par des `;`."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Profile:
+    """Profil échantillonné d'un appel, déclenché après un délai.
+
+    Parameters
+    ----------
+    delay : float
+        Durée après laquelle l'échantillonnage et les compteurs démarrent ;
+        0 pour profiler tout l'appel.
+    interval : float
+        Intervalle entre deux échantillons, en secondes.
+
+    """
+
+    def __init__(self, delay: float = 0., interval: float = SAMPLE_INTERVAL):
+        """Crée un profil inactif."""
+        self.delay = delay
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.counters: Counter = Counter()
+        self.counting = False
+        self.duration = 0.
+        self._started: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def triggered(self) -> bool:
+        """Indique si l'appel a duré assez longtemps pour être échantillonné."""
+        return self._started is not None
+
+    def __enter__(self) -> "Profile":
+        """Démarre le thread d'échantillonnage pour le thread courant."""
+        self._start = time.perf_counter()
+        self._token = _current.set(self)
+        self._thread = threading.Thread(
+            target=self._run, args=(threading.get_ident(),),
+            name="profile-sampler", daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Arrête l'échantillonnage et les compteurs."""
+        self.duration = time.perf_counter() - self._start
+        self._stop.set()
+        self._thread.join()
+        _current.reset(self._token)
+        if self.counting:
+            self.counting = False
+            _stop_counting()
+
+    def __getstate__(self) -> dict:
+        """Renvoie l'état d'un profil terminé, sans son thread (pickle)."""
+        state = self.__dict__.copy()
+        for name in ("_stop", "_thread", "_token"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restaure un profil terminé reçu d'un autre processus."""
+        self.__dict__.update(state)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self, thread_id: int) -> None:
+        """Attend le délai puis échantillonne la pile du thread profilé."""
+        if self._stop.wait(self.delay):
+            return
+        self._started = time.perf_counter()
+        self.counting = True
+        _start_counting()
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+            del frame
+            self._stop.wait(self.interval)
+
+    def collapsed(self) -> str:
+        """Renvoie les piles au format « collapsed stacks », fréquentes d'abord."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def save(self, directory: str, name: str, **meta) -> str:
+        """Écrit `<name>.folded` (piles) et `<name>.json` (compteurs, contexte).
+
+        Parameters
+        ----------
+        directory : str
+            Répertoire de destination, créé s'il n'existe pas.
+        name : str
+            Nom de base des deux fichiers.
+        **meta
+            Informations de contexte ajoutées au JSON (taille, motif...).
+
+        Returns
+        -------
+        str
+            Chemin commun des deux fichiers, sans extension.
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, name)
+        with open(base + ".folded", "w") as f:
+            f.write(self.collapsed())
+        sampled = self.duration - (self._started - self._start) if self.triggered else 0
+        report = {
+            **meta,
+            "duration": self.duration,
+            "sampled_duration": sampled,
+            "interval": self.interval,
+            "samples": sum(self.stacks.values()),
+            "counters": dict(self.counters),
+        }
+        with open(base + ".json", "w") as f:
+            json.dump(report, f, indent=2)
+        return base
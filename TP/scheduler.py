@@ -0,0 +1,262 @@
+"""Ordonnancement des triangulations par taille : voies séparées.
+
+Le coût d'une triangulation croît en O(n log n) avec le nombre de points n,
+lisible dans l'en-tête du PointSet avant tout décodage (`pointset_size`). Un
+`Scheduler` range chaque calcul dans la première voie (`Lane`) dont la borne
+`max_points` le contient ; chaque voie a sa propre limite de calculs
+simultanés et sa propre file, si bien qu'une rafale de gros PointSets ne
+retarde jamais les petits.
+
+Une voie exécute ses calculs soit dans le thread appelant, soit dans son
+propre pool de processus (`processes=True`). Dans un seul processus Python,
+des triangulations simultanées se disputent le GIL : un calcul long retarde
+chaque reprise d'un calcul court d'un intervalle de bascule (5 ms). Les gros
+calculs, envoyés dans des processus, laissent donc le GIL du serveur aux
+petits. Ces processus démarrent par `POOL_START_METHOD`, sans hériter de
+l'état du processus serveur.
+
+L'attente d'une place est bornée par l'échéance de la requête
+(`DeadlineExceeded`) et, si `max_queue` est donné, par la longueur de la
+file (`LaneFull`, à refuser tout de suite plutôt que d'accumuler).
+"""
+
+import multiprocessing
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+
+from deadline import Deadline, DeadlineExceeded
+from encoding import pointset_size
+
+# Démarrage des processus de voie : un pool créé pendant une requête ne doit
+# pas hériter de l'état du thread qui l'a créé (contexte de requête, profils
+# en cours...), ce que ferait un `fork` ; `forkserver` part d'un processus
+# propre, `spawn` à défaut
+POOL_START_METHOD = (
+    "forkserver"
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn"
+)
+
+
+class LaneFull(RuntimeError):
+    """File d'attente d'une voie pleine : le calcul est refusé."""
+
+
+class Lane:
+    """Voie d'exécution des calculs jusqu'à une certaine taille.
+
+    Parameters
+    ----------
+    name : str
+        Nom de la voie (métriques, journaux).
+    max_points : int | None
+        Nombre maximal de points des PointSets de la voie ; None pour la
+        dernière voie, sans limite.
+    slots : int
+        Nombre maximal de calculs simultanés (taille du pool de processus
+        si `processes`).
+    max_queue : int | None
+        Nombre maximal de calculs en attente d'une place ; None sans limite.
+    processes : bool
+        Exécuter les calculs dans un pool de processus propre à la voie
+        plutôt que dans le thread appelant.
+    executor : Executor | None
+        Exécuteur à utiliser à la place du pool de processus (tests).
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_points: int | None,
+        slots: int,
+        max_queue: int | None = None,
+        processes: bool = False,
+        executor: Executor | None = None,
+    ):
+        """Crée une voie vide ; le pool de processus est créé au premier calcul."""
+        if slots < 1:
+            raise ValueError(f"Une voie a au moins une place: {slots!r}")
+        self.name = name
+        self.max_points = max_points
+        self.slots = slots
+        self.max_queue = max_queue
+        self.processes = processes or executor is not None
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._free = threading.BoundedSemaphore(slots)
+        self._lock = threading.Lock()
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def accepts(self, n_points: int) -> bool:
+        """Indique si un PointSet de `n_points` points relève de cette voie."""
+        return self.max_points is None or n_points <= self.max_points
+
+    @property
+    def executor(self) -> Executor | None:
+        """Renvoie le pool de la voie (créé au premier usage), None si en ligne."""
+        if not self.processes:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.slots,
+                    mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                )
+            return self._executor
+
+    def _acquire(self, deadline: Deadline | None = None) -> None:
+        """Réserve une place de la voie, en attendant au plus jusqu'à l'échéance.
+
+        Raises
+        ------
+        LaneFull
+            Si `max_queue` calculs attendent déjà une place.
+        DeadlineExceeded
+            Si aucune place ne se libère avant l'échéance.
+
+        """
+        with self._lock:
+            if self._free.acquire(blocking=False):
+                acquired = True
+            elif self.max_queue is not None and self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise LaneFull(f"File de la voie {self.name} pleine")
+            else:
+                acquired = False
+                self.waiting += 1
+        if not acquired:
+            try:
+                timeout = None if deadline is None else deadline.remaining()
+                acquired = self._free.acquire(timeout=timeout)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if not acquired:
+                raise DeadlineExceeded(f"Aucune place libre dans la voie {self.name}")
+        with self._lock:
+            self.running += 1
+
+    def _release(self, *_) -> None:
+        """Libère une place réservée par `_acquire`."""
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+        self._free.release()
+
+    @contextmanager
+    def slot(self, deadline: Deadline | None = None):
+        """Réserve une place de la voie pendant le bloc `with`.
+
+        Raises
+        ------
+        LaneFull
+            Si `max_queue` calculs attendent déjà une place.
+        DeadlineExceeded
+            Si aucune place ne se libère avant l'échéance.
+
+        """
+        self._acquire(deadline)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def run(self, fn: Callable, *args, deadline: Deadline | None = None):
+        """Exécute fn(*args) dans la voie et renvoie son résultat.
+
+        Le calcul attend une place (voir `slot`), puis s'exécute dans le
+        thread appelant ou dans le pool de la voie ; dans ce cas fn et ses
+        arguments doivent être transmissibles (pickle). Un calcul du pool
+        non terminé à l'échéance est abandonné (`DeadlineExceeded`), mais sa
+        place n'est rendue qu'à la fin effective du calcul dans son
+        processus : fn doit vérifier l'échéance elle-même pour la libérer.
+        """
+        executor = self.executor
+        if executor is None:
+            with self.slot(deadline):
+                return fn(*args)
+        self._acquire(deadline)
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Appelé à la fin du calcul, ou tout de suite s'il est déjà fini
+        future.add_done_callback(self._release)
+        try:
+            return future.result(
+                timeout=None if deadline is None else deadline.remaining()
+            )
+        except TimeoutError as e:
+            if isinstance(e, DeadlineExceeded) or future.done():
+                raise
+            future.cancel()
+            raise DeadlineExceeded(
+                f"Calcul de la voie {self.name} non terminé à l'échéance"
+            ) from e
+
+    def stats(self) -> dict[str, int]:
+        """Renvoie les compteurs de la voie."""
+        with self._lock:
+            return {
+                "running": self.running,
+                "waiting": self.waiting,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def close(self) -> None:
+        """Arrête le pool de processus de la voie, s'il a été créé."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._owns_executor:
+            executor.shutdown(wait=True)
+
+
+class Scheduler:
+    """Répartit les calculs entre des voies selon la taille des PointSets.
+
+    Parameters
+    ----------
+    lanes : Sequence[Lane]
+        Voies par `max_points` croissant ; la dernière doit être sans
+        limite (`max_points=None`).
+
+    """
+
+    def __init__(self, lanes: Sequence[Lane]):
+        """Crée l'ordonnanceur et vérifie que chaque taille a sa voie."""
+        if not lanes or lanes[-1].max_points is not None:
+            raise ValueError("La dernière voie doit accepter toutes les tailles")
+        self.lanes = list(lanes)
+
+    def lane_for(self, n_points: int) -> Lane:
+        """Renvoie la voie d'un PointSet de `n_points` points."""
+        return next(lane for lane in self.lanes if lane.accepts(n_points))
+
+    def lane_of(self, binary_data: bytes) -> Lane:
+        """Renvoie la voie d'un PointSet binaire, d'après son seul en-tête.
+
+        Un en-tête illisible est rangé dans la première voie : le décodage
+        échouera aussitôt.
+        """
+        try:
+            n_points = pointset_size(binary_data)
+        except ValueError:
+            n_points = 0
+        return self.lane_for(n_points)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Renvoie les compteurs de chaque voie, par nom."""
+        return {lane.name: lane.stats() for lane in self.lanes}
+
+    def close(self) -> None:
+        """Arrête les pools de processus des voies."""
+        for lane in self.lanes:
+            lane.close()
@@ -0,0 +1,206 @@
+"""Déduplication des calculs concurrents identiques (« single-flight »).
+
+Quand plusieurs requêtes demandent au même moment le même résultat, seule la
+première (le meneur) exécute le calcul ; les suivantes attendent sa fin et
+reçoivent le même résultat, ou la même exception.
+
+Entre processus (plusieurs workers du serveur), l'option `lock_dir` ajoute un
+verrou fichier par clé : un seul processus calcule à la fois, publie son
+résultat dans le répertoire s'il s'agit de `bytes`, et les processus qui
+attendaient le verrou relisent ce résultat au lieu de recalculer. Un autre
+type de résultat n'est pas publié : les processus en attente recalculent (ou
+relisent le résultat là où le calcul l'a rangé). Un répertoire en mémoire
+(`/dev/shm`) évite toute écriture disque.
+
+Un résultat publié ne sert qu'aux processus qui attendaient déjà : passé
+`result_ttl` secondes, il est supprimé avec son verrou par un balayage du
+répertoire, fait au plus une fois par `result_ttl`.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import suppress
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - plateformes sans verrous POSIX
+    fcntl = None
+
+
+class _Call:
+    """Calcul en cours partagé entre le meneur et ses suiveurs."""
+
+    def __init__(self):
+        """Crée un calcul en attente."""
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Regroupe les appels concurrents portant sur la même clé.
+
+    Parameters
+    ----------
+    lock_dir : str | None
+        Répertoire partagé entre processus pour les verrous et résultats ;
+        `None` pour ne dédupliquer qu'entre threads du même processus.
+    result_ttl : float
+        Durée de conservation d'un résultat publié dans `lock_dir`, en
+        secondes.
+
+    """
+
+    def __init__(self, lock_dir: str | None = None, result_ttl: float = 60.):
+        """Crée un groupe sans calcul en cours."""
+        if lock_dir is not None and fcntl is None:
+            raise ValueError("La déduplication entre processus requiert fcntl")
+        self.lock_dir = lock_dir
+        self.result_ttl = result_ttl
+        self._last_sweep = 0.
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def in_flight(self) -> int:
+        """Renvoie le nombre de calculs en cours."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: str, fn, timeout: float | None = None):
+        """Exécute fn() une seule fois pour tous les appels concurrents sur key.
+
+        Parameters
+        ----------
+        key : str
+            Clé identifiant le calcul.
+        fn : callable
+            Calcul sans argument ; avec `lock_dir`, seul un résultat `bytes`
+            est partagé avec les autres processus.
+        timeout : float | None
+            Attente maximale d'un suiveur, en secondes (None : sans limite).
+            Le meneur n'est pas concerné : c'est à fn() de s'arrêter à temps.
+
+        Returns
+        -------
+        object
+            Résultat de fn(), partagé par tous les appelants concurrents.
+
+        Raises
+        ------
+        TimeoutError
+            Si le calcul du meneur n'est pas terminé après `timeout` secondes
+            (il continue pour les autres appelants).
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"Calcul de {key} toujours en cours")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run(key, fn)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _run(self, key: str, fn):
+        """Exécute fn() sous le verrou inter-processus de la clé, s'il existe."""
+        if self.lock_dir is None:
+            return fn()
+
+        self._sweep()
+        base = os.path.join(
+            self.lock_dir, hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        )
+        started = time.time_ns()
+        with self._locked(base + ".lock"):
+            with suppress(FileNotFoundError):
+                # Résultat publié pendant notre attente : on le réutilise
+                if os.stat(base + ".bin").st_mtime_ns >= started:
+                    with open(base + ".bin", "rb") as f:
+                        return f.read()
+            result = fn()
+            if isinstance(result, bytes | bytearray):
+                tmp = f"{base}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(result)
+                os.replace(tmp, base + ".bin")
+            return result
+
+    @staticmethod
+    def _locked(path: str):
+        """Renvoie le fichier verrou `path`, ouvert et verrouillé en exclusif.
+
+        Le fichier est à fermer par l'appelant (ce qui libère le verrou). Si
+        le balayage l'a supprimé pendant l'attente, le verrou obtenu porte sur
+        un fichier orphelin : on recommence sur le nouveau fichier.
+        """
+        while True:
+            lock_file = open(path, "a+b")  # noqa: SIM115 - fermé par l'appelant
+            # Bloque tant qu'un autre processus calcule la même clé
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            with suppress(FileNotFoundError):
+                if os.stat(path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                    return lock_file
+            lock_file.close()
+
+    def _sweep(self) -> None:
+        """Supprime les résultats publiés expirés et leurs verrous inutilisés.
+
+        Un verrou n'est supprimé que s'il est libre, en le tenant : un
+        processus qui l'avait ouvert le voit disparaître et en recrée un.
+        """
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep < self.result_ttl:
+                return
+            self._last_sweep = now
+        for entry in os.scandir(self.lock_dir):
+            name, ext = os.path.splitext(entry.path)
+            if ext == ".tmp":
+                with suppress(FileNotFoundError):
+                    if now - entry.stat().st_mtime > self.result_ttl:
+                        os.unlink(entry.path)
+            if ext != ".lock":
+                continue
+            try:
+                fd = os.open(entry.path, os.O_RDWR)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue  # calcul en cours
+            try:
+                try:
+                    age = now - os.stat(name + ".bin").st_mtime
+                except FileNotFoundError:
+                    age = None
+                if age is None or age > self.result_ttl:
+                    with suppress(FileNotFoundError):
+                        os.unlink(name + ".bin")
+                    with suppress(FileNotFoundError):
+                        os.unlink(entry.path)
+            finally:
+                os.close(fd)
@@ -0,0 +1,129 @@
+"""Ordres d'insertion spatiaux pour la triangulation incrémentale.
+
+Insérer des points voisins à la suite garde la marche de localisation courte :
+le triangle de départ (le dernier créé) est déjà proche du point suivant.
+Deux ordres sont proposés :
+
+- `hilbert_order` trie les points le long d'une courbe de Hilbert ;
+- `brio_order` (Biased Randomized Insertion Order) répartit d'abord les points
+  en tours aléatoires de tailles croissantes, puis trie chaque tour le long de
+  la courbe. L'aléa protège contre les cavités pathologiques d'un ordre
+  purement déterministe, la courbe conserve la localité.
+
+Les fonctions renvoient des permutations d'indices : les points eux-mêmes ne
+sont jamais déplacés, si bien que les triangles produits référencent toujours
+l'ordre d'origine.
+"""
+
+import random
+
+Point = tuple[float, float]
+HILBERT_BITS = 10
+BRIO_MIN_ROUND = 64
+
+
+def hilbert_keys(points: list[Point], bits: int = HILBERT_BITS) -> list[int]:
+    """Renvoie l'indice de Hilbert de chaque point sur une grille 2^bits.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Points à indexer ; la grille couvre leur boîte englobante.
+    bits : int
+        Nombre de bits de quantification par axe.
+
+    Returns
+    -------
+    list[int]
+        Indice de Hilbert de chaque point, dans l'ordre de `points`.
+
+    """
+    if not points:
+        return []
+
+    side = 1 << bits
+    xmin = min(p[0] for p in points)
+    ymin = min(p[1] for p in points)
+    span = max(
+        max(p[0] for p in points) - xmin,
+        max(p[1] for p in points) - ymin,
+    )
+    scale = (side - 1) / span if span > 0 else 0.0
+
+    keys = []
+    for px, py in points:
+        x = int((px - xmin) * scale)
+        y = int((py - ymin) * scale)
+        d = 0
+        s = side >> 1
+        while s:
+            rx = 1 if x & s else 0
+            ry = 1 if y & s else 0
+            d += s * s * ((3 * rx) ^ ry)
+            if not ry:
+                if rx:
+                    x = side - 1 - x
+                    y = side - 1 - y
+                x, y = y, x
+            s >>= 1
+        keys.append(d)
+    return keys
+
+
+def hilbert_order(points: list[Point], bits: int = HILBERT_BITS) -> list[int]:
+    """Renvoie les indices de `points` triés le long d'une courbe de Hilbert."""
+    keys = hilbert_keys(points, bits)
+    return sorted(range(len(points)), key=keys.__getitem__)
+
+
+def brio_order(
+    points: list[Point],
+    seed: int | None = 0,
+    bits: int = HILBERT_BITS,
+) -> list[int]:
+    """Renvoie un ordre d'insertion BRIO des indices de `points`.
+
+    Les indices sont mélangés puis découpés en tours dont la taille double
+    d'un tour au suivant (le dernier contient la moitié des points, les tours
+    initiaux plus petits que `BRIO_MIN_ROUND` sont regroupés). Chaque tour est
+    ensuite trié le long de la courbe de Hilbert.
+
+    Parameters
+    ----------
+    points : list[Point]
+        Points à ordonner.
+    seed : int | None
+        Graine du tirage aléatoire ; `None` pour un ordre non reproductible.
+    bits : int
+        Nombre de bits de quantification de la courbe de Hilbert.
+
+    Returns
+    -------
+    list[int]
+        Permutation des indices de `points`.
+
+    """
+    keys = hilbert_keys(points, bits)
+    indices = list(range(len(points)))
+    random.Random(seed).shuffle(indices)
+
+    # Découpage en tours de tailles doublées : ..., n/8, n/4, n/2
+    rounds = []
+    end = len(indices)
+    while end > BRIO_MIN_ROUND:
+        start = end // 2
+        rounds.append(indices[start:end])
+        end = start
+    rounds.append(indices[:end])
+
+    order: list[int] = []
+    for chunk in reversed(rounds):
+        order.extend(sorted(chunk, key=keys.__getitem__))
+    return order
+
+
+ORDERINGS = {
+    "input": lambda points: list(range(len(points))),
+    "hilbert": hilbert_order,
+    "brio": brio_order,
+}
@@ -2,9 +2,16 @@
 
 import math
 import struct
+from array import array
 
 import pytest
-from encoding import decode_pointset, encode_pointset
+from encoding import (
+    decode_pointset,
+    decode_pointset_array,
+    encode_pointset,
+    encode_pointset_array,
+    pointset_size,
+)
 
 # -------------------- Tests d'encodage --------------------
 
@@ -83,6 +90,16 @@ def test_decode_pointset_extra_data():
         decode_pointset(data)
 
 
+
+def test_pointset_size_reads_header_only():
+    """Test that the point count is read from the header without decoding."""
+    data = encode_pointset([(0.0, 1.0), (2.0, 3.0), (4.0, 5.0)])
+    assert pointset_size(data) == 3
+    assert pointset_size(data[:4]) == 3
+    with pytest.raises(ValueError):
+        pointset_size(b"\x01\x00")
+
+
 # -------------------- Test round-trip --------------------
 
 
@@ -93,3 +110,51 @@ def test_round_trip_simple():
     for (x1, y1), (x2, y2) in zip(pointset, decoded,strict=True):
         assert math.isclose(x1, x2, rel_tol=1e-6)
         assert math.isclose(y1, y2, rel_tol=1e-6)
+
+
+# -------------------- Tampons plats --------------------
+
+
+def test_encode_pointset_array_matches_tuples():
+    """L'encodage d'un tampon plat produit le même binaire que les tuples."""
+    coords = array("f", [0.5, 1.5, 2.25, -3.0])
+    assert encode_pointset_array(coords) == encode_pointset([(0.5, 1.5), (2.25, -3.)])
+
+
+def test_encode_pointset_array_wrong_type():
+    """Un tampon qui n'est pas en float32 lève TypeError."""
+    with pytest.raises(TypeError):
+        encode_pointset_array(array("d", [0.0, 1.0]))
+
+
+def test_encode_pointset_array_odd_length():
+    """Un nombre impair de coordonnées lève ValueError."""
+    with pytest.raises(ValueError):
+        encode_pointset_array(array("f", [0.0, 1.0, 2.0]))
+
+
+def test_decode_pointset_array_is_view():
+    """Le décodage renvoie une vue float32 sur les données, sans copie."""
+    data = struct.pack("<Iffff", 2, 0.0, 1.0, 2.0, 3.0)
+    coords = decode_pointset_array(data)
+    assert isinstance(coords, memoryview)
+    assert coords.format == "f"
+    assert coords.tolist() == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_decode_pointset_array_empty():
+    """Un PointSet vide donne une vue vide."""
+    assert len(decode_pointset_array(struct.pack("<I", 0))) == 0
+
+
+@pytest.mark.parametrize("data", [b"\x00\x00\x00", struct.pack("<Iff", 2, 1., 2.)])
+def test_decode_pointset_array_invalid(data):
+    """Des données tronquées ou incohérentes lèvent ValueError."""
+    with pytest.raises(ValueError):
+        decode_pointset_array(data)
+
+
+def test_round_trip_array():
+    """Round-trip encode->decode sur tampons plats."""
+    coords = array("f", [0.5, 1.5, 2.25, 3.0, -7.0, 8.5])
+    assert decode_pointset_array(encode_pointset_array(coords)).tolist() == list(coords)
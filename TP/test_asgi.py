@@ -0,0 +1,251 @@
+"""Tests pour le point d'entrée ASGI du service de triangulation."""
+import asyncio
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+import triangulator_server as service
+from encoding import decode_triangles, encode_pointset
+from scheduler import Lane, Scheduler
+from triangulator_asgi import TriangulatorASGI
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Vide le cache des triangulations avant chaque test."""
+    service.cache.clear()
+
+
+@pytest.fixture
+def asgi():
+    """Renvoie une application ASGI calculant dans un pool de threads."""
+    executor = ThreadPoolExecutor(4)
+    application = TriangulatorASGI(workers=2, executor=executor)
+    yield application
+    application.close()
+    executor.shutdown()
+
+
+async def request(application, path, method="GET", headers=()):
+    """Exécute une requête ASGI et renvoie (statut, en-têtes, corps)."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+    await application(scope, receive, send)
+    headers = dict(sent[0]["headers"])
+    return sent[0]["status"], headers, sent[1]["body"]
+
+
+def get(application, path, method="GET", headers=()):
+    """Version synchrone de `request`."""
+    return asyncio.run(request(application, path, method, headers))
+
+
+def test_asgi_success_matches_flask(asgi):
+    """Renvoie le même binaire que la chaîne de traitement synchrone."""
+    pointSetId = str(uuid.uuid4())
+    status, headers, body = get(asgi, f"/triangulation/{pointSetId}")
+
+    assert status == 200
+    assert headers[b"content-type"] == b"application/octet-stream"
+    assert int(headers[b"content-length"]) == len(body)
+    assert body == service.compute_triangulation(pointSetId)
+    coords, triangles = decode_triangles(body)
+    assert len(coords) >= 3 and triangles
+
+
+def test_asgi_invalid_uuid(asgi):
+    """Renvoie 400 si le PointSetID n'est pas un UUID valide."""
+    status, headers, body = get(asgi, "/triangulation/invalid-uuid")
+    assert status == 400
+    assert headers[b"content-type"] == b"application/json"
+    assert json.loads(body)["code"] == "INVALID_POINTSET_ID"
+
+
+def test_asgi_unknown_route_and_method(asgi):
+    """Renvoie 404 hors de la route et 405 pour une autre méthode que GET."""
+    assert get(asgi, "/autre")[0] == 404
+    assert get(asgi, f"/triangulation/{uuid.uuid4()}", method="POST")[0] == 405
+
+
+def test_asgi_pointset_manager_error(asgi):
+    """Renvoie le statut d'erreur traduit depuis le PointSetManager."""
+    with patch.object(
+        service, "fetch_payload",
+        side_effect=service.ServiceError("POINTSET_NOT_FOUND", "absent", 404),
+    ):
+        status, _, body = get(asgi, f"/triangulation/{uuid.uuid4()}")
+    assert status == 404
+    assert json.loads(body)["code"] == "POINTSET_NOT_FOUND"
+
+
+def test_asgi_serves_cached_result_without_fetch(asgi):
+    """Une requête répétée est servie par le cache sans nouvelle récupération."""
+    pointSetId = str(uuid.uuid4())
+    first = get(asgi, f"/triangulation/{pointSetId}")
+    with patch.object(service, "fetch_payload") as fetch:
+        second = get(asgi, f"/triangulation/{pointSetId}")
+    fetch.assert_not_called()
+    assert first == second
+
+
+def test_asgi_coalesces_concurrent_requests(asgi):
+    """Les requêtes concurrentes sur le même PointSet partagent un calcul."""
+    pointSetId = str(uuid.uuid4())
+    calls = []
+    original = service.triangulate_pointset
+
+    def counted(data, deadline=None):
+        calls.append(data)
+        return original(data, deadline)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(request(asgi, f"/triangulation/{pointSetId}") for _ in range(8))
+        )
+
+    with patch.object(service, "triangulate_pointset", counted):
+        results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert {r[0] for r in results} == {200}
+    assert len({r[2] for r in results}) == 1
+    assert asgi.pending == 0
+
+
+def test_asgi_back_pressure_returns_503(asgi):
+    """Au-delà de `max_pending` calculs admis, renvoie 503 avec Retry-After."""
+    asgi.max_pending = 1
+    release = threading.Event()
+    original = service.triangulate_pointset
+
+    def blocked(data, deadline=None):
+        release.wait(5)
+        return original(data, deadline)
+
+    async def scenario():
+        slow = asyncio.ensure_future(request(asgi, f"/triangulation/{uuid.uuid4()}"))
+        while asgi.pending == 0:
+            await asyncio.sleep(0.001)
+        rejected = await request(asgi, f"/triangulation/{uuid.uuid4()}")
+        release.set()
+        return await slow, rejected
+
+    with patch.object(service, "triangulate_pointset", blocked):
+        accepted, rejected = asyncio.run(scenario())
+
+    assert accepted[0] == 200
+    assert rejected[0] == 503
+    assert rejected[1][b"retry-after"] == b"1"
+    assert json.loads(rejected[2])["code"] == "TRIANGULATOR_OVERLOADED"
+    assert asgi.rejected == 1
+    assert asgi.pending == 0
+
+
+def test_asgi_computes_in_lanes(asgi):
+    """Les calculs passent par les places et les files des voies."""
+    small = asgi.scheduler.lanes[0]
+    assert get(asgi, f"/triangulation/{uuid.uuid4()}")[0] == 200
+    assert small.stats()["completed"] == 1
+
+    single = Lane("single", None, slots=1, max_queue=0)
+    asgi.scheduler = Scheduler([single])
+    with single.slot():
+        status, headers, body = get(asgi, f"/triangulation/{uuid.uuid4()}")
+    assert status == 503
+    assert headers[b"retry-after"] == b"1"
+    assert json.loads(body)["code"] == "TRIANGULATOR_OVERLOADED"
+
+
+def test_asgi_client_deadline(asgi):
+    """L'en-tête X-Request-Deadline borne la requête ; invalide, il donne 400."""
+    path = f"/triangulation/{uuid.uuid4()}"
+    status, _, body = get(asgi, path, headers=[(b"x-request-deadline", b"0")])
+    assert status == 504
+    assert json.loads(body)["code"] == "DEADLINE_EXCEEDED"
+    status, _, body = get(asgi, path, headers=[(b"x-request-deadline", b"vite")])
+    assert status == 400
+    assert json.loads(body)["code"] == "INVALID_DEADLINE"
+    assert get(asgi, path, headers=[(b"x-request-deadline", b"30")])[0] == 200
+
+
+def test_asgi_request_budget(asgi, monkeypatch):
+    """Un calcul plus long que le budget de la requête donne 504."""
+    monkeypatch.setattr(service, "REQUEST_BUDGET", 0.05)
+    release = threading.Event()
+
+    def blocked(data, deadline=None):
+        release.wait(5)
+        raise service.deadline_exceeded()
+
+    with patch.object(service, "triangulate_pointset", blocked):
+        status, _, body = get(asgi, f"/triangulation/{uuid.uuid4()}")
+        release.set()
+    assert status == 504
+    assert json.loads(body)["code"] == "DEADLINE_EXCEEDED"
+
+
+def test_asgi_unexpected_errors_answered(asgi):
+    """Les erreurs imprévues donnent une réponse 500, jamais une requête muette."""
+    with patch.object(service, "triangulate_pointset",
+                      side_effect=ValueError("indice invalide")):
+        status, _, body = get(asgi, f"/triangulation/{uuid.uuid4()}")
+    assert status == 500
+    assert json.loads(body)["code"] == "TRIANGULATION_FAILED"
+
+    with patch.object(service, "fetch_payload", side_effect=OSError("coupure")):
+        status, headers, body = get(asgi, f"/triangulation/{uuid.uuid4()}")
+    assert status == 500
+    assert headers[b"content-type"] == b"application/json"
+    assert json.loads(body)["code"] == "INTERNAL_ERROR"
+    assert asgi.pending == 0
+
+
+def test_asgi_process_pool_propagates_errors(monkeypatch):
+    """Le pool de processus d'une voie renvoie résultats et erreurs de traitement."""
+    lanes = Scheduler([
+        Lane("small", service.SMALL_LANE_MAX_POINTS, slots=1),
+        Lane("large", None, slots=1, processes=True),
+    ])
+    monkeypatch.setattr(service, "scheduler", lanes)
+    application = TriangulatorASGI(workers=1)
+    n_points = service.SMALL_LANE_MAX_POINTS + 1
+    points = [(float(i % 50), float(i // 50)) for i in range(n_points)]
+    truncated = encode_pointset(points)[:-8]
+    try:
+        assert get(application, f"/triangulation/{uuid.uuid4()}")[0] == 200
+        with patch.object(service, "fetch_payload", return_value=truncated):
+            status, _, body = get(application, f"/triangulation/{uuid.uuid4()}")
+        assert status == 500
+        assert json.loads(body)["code"] == "INVALID_POINTSET_BINARY"
+        assert lanes.lane_for(n_points).stats()["completed"] == 1
+    finally:
+        application.close()
+        lanes.close()
+
+
+def test_asgi_lifespan_shutdown_closes_pools():
+    """Le message `lifespan.shutdown` arrête les pools de l'application."""
+    application = TriangulatorASGI(workers=1)
+    get(application, f"/triangulation/{uuid.uuid4()}")
+    messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+    sent = []
+
+    async def receive():
+        return next(messages)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(application({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert application._threads is None and application._io is None
@@ -0,0 +1,162 @@
+"""Tests du banc d'essai et mesures de passage à l'échelle (marqueur `benchmark`).
+
+Les mesures complètes ne tournent que sur demande (``make bench_test``). La
+première exécution enregistre la référence dans `benchmark_baseline.json`
+(ou dans le fichier désigné par `BENCHMARK_BASELINE`) ; les suivantes s'y
+comparent avec la tolérance `BENCHMARK_TOLERANCE`.
+"""
+
+import json
+import math
+import os
+
+import benchmark
+import pytest
+
+BASELINE = os.environ.get(
+    "BENCHMARK_BASELINE",
+    os.path.join(os.path.dirname(__file__), "benchmark_baseline.json"),
+)
+BENCH_SIZES = (250, 1000, 4000)
+
+
+def fake_report(seconds, exponent=1.0):
+    """Renvoie un rapport minimal avec une mesure et un exposant."""
+    return {
+        "results": [{
+            "operation": "triangulate", "distribution": "uniform",
+            "n": 1000, "seconds": seconds,
+        }],
+        "exponents": {"triangulate/uniform": exponent},
+    }
+
+
+@pytest.mark.parametrize("name", list(benchmark.DISTRIBUTIONS))
+def test_distributions_are_reproducible(name):
+    """Chaque distribution donne n points, identiques pour une même graine."""
+    generate = benchmark.DISTRIBUTIONS[name]
+    points = generate(100, benchmark.random.Random(1))
+    assert len(points) == 100
+    assert points == generate(100, benchmark.random.Random(1))
+    assert len(set(points)) == 100
+
+
+def test_fit_exponent():
+    """La pente retrouve l'exposant d'une loi de puissance."""
+    sizes = [100, 1000, 10000]
+    assert benchmark.fit_exponent(sizes, [n ** 2 * 1e-9 for n in sizes]) == (
+        pytest.approx(2.0)
+    )
+    nlogn = benchmark.fit_exponent(sizes, [n * math.log(n) for n in sizes])
+    assert 1.0 < nlogn < 1.3
+    assert benchmark.fit_exponent([100], [1.0]) is None
+
+
+def test_compare_reports_regressions():
+    """Un ralentissement ou un exposant au-delà des tolérances est signalé."""
+    baseline = fake_report(0.1)
+    assert benchmark.compare(fake_report(0.12), baseline) == []
+    assert len(benchmark.compare(fake_report(0.2), baseline)) == 1
+    assert len(benchmark.compare(fake_report(0.1, exponent=1.5), baseline)) == 1
+    # Une durée de référence trop courte n'est pas comparée
+    assert benchmark.compare(fake_report(0.01), fake_report(1e-4)) == []
+
+
+def test_run_small_report():
+    """Un petit banc produit un rapport JSON complet."""
+    seen = []
+    report = benchmark.run(
+        sizes=(50, 100), distributions=("uniform", "grid"),
+        operations=("triangulate", "decode_triangles"), repeat=1,
+        progress=seen.append,
+    )
+    assert len(report["results"]) == len(seen) == 8
+    entry = report["results"][0]
+    assert entry["seconds"] > 0 and entry["peak_bytes"] > 0
+    assert set(report["exponents"]) == {
+        "triangulate/uniform", "decode_triangles/uniform",
+        "triangulate/grid", "decode_triangles/grid",
+    }
+    json.dumps(report)
+    with pytest.raises(ValueError):
+        benchmark.run(sizes=(10,), operations=("inconnue",))
+
+
+def test_codecs_reuse_timed_triangulation(monkeypatch):
+    """Les entrées des codecs viennent de la triangulation chronométrée."""
+    calls = []
+    triangulate = benchmark.triangulate
+
+    def counting(points):
+        calls.append(len(points))
+        return triangulate(points)
+
+    monkeypatch.setattr(benchmark, "triangulate", counting)
+    report = benchmark.run(
+        sizes=(50,), distributions=("uniform",),
+        operations=("encode_triangles", "triangulate"), repeat=1, memory=False,
+    )
+    assert calls == [50]
+    assert [r["operation"] for r in report["results"]] == [
+        "triangulate", "encode_triangles",
+    ]
+    calls.clear()
+    benchmark.run(
+        sizes=(50,), distributions=("uniform",),
+        operations=("decode_triangles",), repeat=1, memory=False,
+    )
+    assert calls == [50]
+
+
+def test_large_size_is_opt_in(monkeypatch):
+    """La taille 10⁶ n'est mesurée que sur demande (`--large`)."""
+    assert max(benchmark.SIZES) < benchmark.LARGE_SIZE
+    seen = []
+    monkeypatch.setattr(
+        benchmark, "run", lambda sizes, *args: seen.append(sizes) or {
+            "exponents": {},
+        },
+    )
+    benchmark.main(["--sizes", "30"])
+    benchmark.main(["--sizes", "30", "--large"])
+    assert seen == [[30], [30, benchmark.LARGE_SIZE]]
+
+
+def test_cli_baseline(tmp_path, capsys):
+    """La ligne de commande enregistre le JSON et signale les régressions."""
+    output = tmp_path / "resultats.json"
+    args = [
+        "--sizes", "30", "60", "--distributions", "uniform",
+        "--operations", "triangulate", "--repeat", "1", "--no-memory",
+    ]
+    assert benchmark.main([*args, "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["results"][0]["peak_bytes"] is None
+
+    for r in report["results"]:
+        r["seconds"] = 1e-9
+    output.write_text(json.dumps(report))
+    # Le banc dure bien plus que les durées falsifiées de la référence
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(benchmark, "MIN_SECONDS", 0.)
+        assert benchmark.main([*args, "--baseline", str(output)]) == 1
+    assert "RÉGRESSION" in capsys.readouterr().out
+
+
+@pytest.mark.benchmark
+def test_scaling_against_baseline():
+    """Mesure les courbes de passage à l'échelle et les compare à la référence."""
+    report = benchmark.run(sizes=BENCH_SIZES, repeat=3)
+
+    # Indépendant de la machine : aucune triangulation ne devient quadratique
+    for dist in benchmark.DISTRIBUTIONS:
+        assert report["exponents"][f"triangulate/{dist}"] < 1.5
+
+    if not os.path.exists(BASELINE):
+        with open(BASELINE, "w") as f:
+            json.dump(report, f, indent=2)
+        pytest.skip(f"Référence enregistrée dans {BASELINE}")
+    with open(BASELINE) as f:
+        baseline = json.load(f)
+    tolerance = float(os.environ.get("BENCHMARK_TOLERANCE", benchmark.TOLERANCE))
+    assert benchmark.compare(report, baseline, tolerance) == []
@@ -0,0 +1,99 @@
+"""Tests des échéances et de l'annulation des triangulations."""
+
+import pickle
+import random
+
+import divide_conquer
+import pytest
+from deadline import Deadline, DeadlineExceeded
+from Triangulator import ENGINES, triangulate, triangulate_compact
+
+
+def random_points(n: int, seed: int = 0) -> list[tuple[float, float]]:
+    """Renvoie n points aléatoires dans le carré unité."""
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random()) for _ in range(n)]
+
+
+def test_deadline_remaining_and_expiry():
+    """Une échéance future court, une échéance passée est dépassée."""
+    running = Deadline.after(60)
+    assert not running.expired()
+    assert 0 < running.remaining() <= 60
+    running.check()
+
+    past = Deadline.after(-1)
+    assert past.expired()
+    assert past.remaining() == 0.
+    with pytest.raises(DeadlineExceeded):
+        past.check()
+
+
+def test_deadline_without_limit_and_cancel():
+    """Sans limite, seule l'annulation arrête le traitement."""
+    deadline = Deadline()
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    deadline.cancel()
+    assert deadline.expired()
+    with pytest.raises(DeadlineExceeded, match="annulé"):
+        deadline.check()
+
+
+def test_deadline_is_picklable():
+    """Une échéance se transmet aux processus de calcul."""
+    deadline = Deadline.after(60)
+    copy = pickle.loads(pickle.dumps(deadline))
+    assert copy.at == deadline.at
+    assert not copy.cancelled
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_engines_stop_at_deadline(engine):
+    """Chaque moteur abandonne le calcul d'une échéance dépassée."""
+    points = random_points(2 * divide_conquer.DEADLINE_CHECK_MIN)
+    with pytest.raises(DeadlineExceeded):
+        triangulate(points, engine=engine, deadline=Deadline.after(-1))
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_engines_finish_before_deadline(engine):
+    """Une échéance lointaine ne change pas le résultat."""
+    points = random_points(200)
+    expected = triangulate(points, engine=engine)
+    assert triangulate(points, engine=engine, deadline=Deadline.after(60)) == (
+        expected
+    )
+
+
+def test_parallel_stops_at_deadline(monkeypatch):
+    """La version parallèle abandonne aussi le calcul des bandes."""
+    monkeypatch.setattr(divide_conquer, "PARALLEL_MIN_BLOCK", 4)
+    deadline = Deadline.after(60)
+    deadline.cancel()
+    with pytest.raises(DeadlineExceeded):
+        divide_conquer.divide_and_conquer(
+            random_points(400), workers=2, deadline=deadline
+        )
+
+
+def test_merge_stops_at_deadline():
+    """La fusion de deux grandes moitiés vérifie l'échéance le long de la couture."""
+    n = 4 * divide_conquer.DEADLINE_CHECK_MIN
+    # Deux colonnes face à face : la couture compte une arête par point
+    points = [(float(x), float(y)) for x in (0, 1) for y in range(n)]
+    sub = divide_conquer.Subdivision(points)
+    order = sorted(range(2 * n), key=points.__getitem__)
+    ldo, ldi = divide_conquer._delaunay(sub, order, 0, n)
+    rdi, rdo = divide_conquer._delaunay(sub, order, n, 2 * n)
+    with pytest.raises(DeadlineExceeded):
+        divide_conquer._merge(sub, ldo, ldi, rdi, rdo, Deadline.after(-1))
+
+
+def test_triangulate_compact_stops_at_deadline():
+    """Le résultat compact suit la même échéance que `triangulate`."""
+    points = random_points(200)
+    with pytest.raises(DeadlineExceeded):
+        triangulate_compact(points, deadline=Deadline.after(-1))
+    result = triangulate_compact(points, deadline=Deadline.after(60))
+    assert list(result.triangles) == triangulate(points)
@@ -0,0 +1,120 @@
+"""Tests unitaires pour la triangulation dynamique `DelaunayTriangulation`."""
+
+import random
+
+import pytest
+from dynamic_triangulation import DelaunayTriangulation, TriangulationDiff
+from predicates import incircle, orient2d
+from Triangulator import triangulate
+
+
+def random_points(n, seed):
+    """Renvoie n points aléatoires reproductibles."""
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random()) for _ in range(n)]
+
+
+def reference(dt):
+    """Renvoie la triangulation recalculée de zéro sur les sommets courants."""
+    vertices = sorted(dt.vertices)
+    triangles = triangulate([dt.points[v] for v in vertices])
+    return {tuple(sorted(vertices[i] for i in t)) for t in triangles}
+
+
+def assert_delaunay(dt):
+    """Vérifie le cercle vide (prédicats exacts) de chaque triangle."""
+    pts = dt.points
+    for t in dt.triangles():
+        a, b, c = (pts[i] for i in t)
+        if orient2d(a, b, c) < 0:
+            a, b = b, a
+        for v in dt.vertices - set(t):
+            assert incircle(a, b, c, pts[v]) <= 0
+
+
+def test_initial_points_match_triangulate():
+    """La construction donne la même triangulation que `triangulate`."""
+    points = random_points(200, 0)
+    dt = DelaunayTriangulation(points)
+    assert set(dt.triangles()) == set(triangulate(points))
+
+
+def test_insert_returns_index_and_diff():
+    """L'insertion renvoie le nouvel indice et les triangles modifiés."""
+    dt = DelaunayTriangulation([(0., 0.), (2., 0.), (0., 2.)])
+    index, diff = dt.insert((.5, .5))
+    assert index == 3
+    assert diff == TriangulationDiff(
+        added=[(0, 1, 3), (0, 2, 3), (1, 2, 3)], removed=[(0, 1, 2)]
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_edits_stay_delaunay(seed):
+    """Après des insertions, suppressions et déplacements, le résultat est exact."""
+    rng = random.Random(100 + seed)
+    dt = DelaunayTriangulation(random_points(60, seed))
+    for _ in range(80):
+        op = rng.random()
+        if op < .4:
+            dt.remove(rng.choice(sorted(dt.vertices)))
+        elif op < .7:
+            dt.insert((rng.random(), rng.random()))
+        else:
+            dt.move(rng.choice(sorted(dt.vertices)), (rng.random(), rng.random()))
+        assert set(dt.triangles()) == reference(dt)
+
+
+def test_diff_replays_changes():
+    """Appliquer les diffs successifs reproduit la triangulation courante."""
+    rng = random.Random(101)
+    dt = DelaunayTriangulation(random_points(40, 1))
+    current = set(dt.triangles())
+    for _ in range(30):
+        diff = dt.move(rng.choice(sorted(dt.vertices)), (rng.random(), rng.random()))
+        assert set(diff.removed) <= current
+        current = (current - set(diff.removed)) | set(diff.added)
+    assert current == set(dt.triangles())
+
+
+def test_grid_edits_with_cocircular_points():
+    """Les suppressions sur une grille (points cocycliques) restent valides."""
+    rng = random.Random(2)
+    grid = [(float(i), float(j)) for i in range(7) for j in range(7)]
+    dt = DelaunayTriangulation(grid)
+    for _ in range(25):
+        dt.remove(rng.choice(sorted(dt.vertices)))
+        assert_delaunay(dt)
+        assert len(reference(dt)) == len(dt.triangles())
+
+
+def test_collinear_points_wait_for_a_triangle():
+    """Des sommets alignés restent en attente jusqu'au premier point non aligné."""
+    dt = DelaunayTriangulation([(0., 0.), (1., 0.), (2., 0.)])
+    assert dt.triangles() == []
+    _, diff = dt.insert((1., 1.))
+    assert diff.added == [(0, 1, 3), (1, 2, 3)]
+    diff = dt.remove(3)
+    assert diff.removed == [(0, 1, 3), (1, 2, 3)]
+    assert dt.triangles() == []
+
+
+def test_duplicates_and_unknown_vertices():
+    """Un doublon exact ou un sommet inconnu est refusé."""
+    dt = DelaunayTriangulation([(0., 0.), (1., 0.), (0., 1.), (1., 0.)])
+    assert dt.vertices == {0, 1, 2}
+    with pytest.raises(ValueError):
+        dt.insert((0., 1.))
+    with pytest.raises(ValueError):
+        dt.move(0, (1., 0.))
+    with pytest.raises(IndexError):
+        dt.remove(3)
+    dt.remove(0)
+    with pytest.raises(IndexError):
+        dt.remove(0)
+
+
+def test_move_to_same_position_is_noop():
+    """Déplacer un sommet sur sa propre position ne change rien."""
+    dt = DelaunayTriangulation(random_points(20, 3))
+    assert dt.move(5, dt.points[5]) == TriangulationDiff([], [])
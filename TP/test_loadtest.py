@@ -0,0 +1,102 @@
+"""Tests du test de charge HTTP (statistiques, seuils, exécution courte)."""
+
+import json
+import os
+import subprocess
+import sys
+
+import loadtest
+import pytest
+
+
+def records(latencies, status=200, size=100):
+    """Renvoie des requêtes factices (prévu, latence, statut, taille, fin)."""
+    return [(i * .1, lat, status, size, i * .1 + lat)
+            for i, lat in enumerate(latencies)]
+
+
+def test_percentile_nearest_rank():
+    """Le percentile suit la méthode du rang le plus proche."""
+    values = list(range(1, 1001))
+    assert loadtest.percentile(values, 50) == 500
+    assert loadtest.percentile(values, 99) == 990
+    assert loadtest.percentile(values, 99.9) == 999
+    assert loadtest.percentile([7], 99.9) == 7
+    assert loadtest.percentile([], 50) is None
+
+
+def test_summarize_counts_errors():
+    """Les statuts d'erreur et de connexion (0) comptent dans le taux d'erreur."""
+    sample = records([.01] * 8) + records([.5], status=503) + records([2.], status=0)
+    summary = loadtest.summarize(sample, duration=2.)
+    assert summary["requests"] == 10 and summary["errors"] == 2
+    assert summary["error_rate"] == pytest.approx(.2)
+    assert summary["throughput"] == pytest.approx(4.)
+    assert summary["status"] == {"0": 1, "200": 8, "503": 1}
+    assert summary["latency"]["p50"] == .01
+    assert summary["latency"]["p999"] == summary["latency"]["max"] == 2.
+    assert set(summary["latency"]) == {"p50", "p95", "p99", "p999", "mean", "max"}
+
+
+def test_timeline_buckets():
+    """Les réponses sont regroupées par intervalle de fin avec le relevé serveur."""
+    sample = records([.05, .05, .05, .05, .05, .05, .05, .05, .05, .05, .05, .05])
+    samples = [{"t": 1.0, "cpu_percent": 50., "rss_bytes": 10}]
+    rows = loadtest.timeline(sample, samples, interval=1.)
+    assert [row["t"] for row in rows] == [1., 2.]
+    assert rows[0]["throughput"] == 10 and rows[1]["throughput"] == 2
+    assert rows[0]["cpu_percent"] == 50.
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="sans /proc")
+def test_sampler_sums_child_processes():
+    """Le CPU d'un processus enfant compte dans les relevés de son parent."""
+    # Le parent attend pendant que son enfant calcule
+    burn = "import time\nt = time.time()\nwhile time.time() - t < 1.: pass"
+    code = f"import subprocess, sys\nsubprocess.run([sys.executable, '-c', {burn!r}])"
+    process = subprocess.Popen([sys.executable, "-c", code])
+    try:
+        sampler = loadtest.ProcessSampler(process.pid, .25).start()
+        process.wait(10)
+        samples = sampler.stop()
+    finally:
+        process.kill()
+    assert max(s["processes"] for s in samples) >= 2
+    assert max(s["cpu_percent"] for s in samples) > 50
+
+
+def test_check_thresholds():
+    """Chaque seuil franchi est signalé."""
+    report = {"summary": loadtest.summarize(records([.1, .2, .3]), 1.)}
+    assert loadtest.check(report, max_p99=.5, max_error_rate=0, min_throughput=2) == []
+    assert len(loadtest.check(report, max_p99=.25, min_throughput=5)) == 2
+
+
+def test_short_run_against_local_service(tmp_path):
+    """Une courte charge traverse le vrai service et son PointSetManager local."""
+    output = tmp_path / "charge.json"
+    code = loadtest.main([
+        "--rps", "20", "--duration", "1", "--mix", "30:3", "200:1",
+        "--pointsets", "3", "--interval", ".5", "--output", str(output),
+        "--max-error-rate", "0",
+    ])
+    assert code == 0
+    report = json.loads(output.read_text())
+    summary = report["summary"]
+    assert summary["requests"] > 0 and summary["errors"] == 0
+    assert summary["latency"]["p99"] > 0
+    assert set(report["by_size"]) == {"30", "200"}
+    # Au plus un appel au PointSetManager par PointSet : le reste est en cache
+    assert 0 < report["manager"]["requests"] <= 6
+    assert report["timeline"]
+
+
+def test_manager_failures_reported():
+    """Les pannes du PointSetManager apparaissent en erreurs 503."""
+    report = loadtest.run(
+        rps=10, duration=.5, mix={30: 1}, pointsets=2, manager_failure_rate=1.,
+    )
+    summary = report["summary"]
+    assert summary["errors"] == summary["requests"] > 0
+    assert set(summary["status"]) == {"503"}
+    assert loadtest.check(report, max_error_rate=.5)
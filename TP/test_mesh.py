@@ -0,0 +1,102 @@
+"""Tests unitaires pour le maillage à voisinage et l'insertion incrémentale."""
+
+import random
+
+import pytest
+from divide_conquer import divide_and_conquer
+from mesh import GHOST, TriangleMesh, incremental
+
+
+def build_mesh(points):
+    """Construit un maillage en insérant tous les points après le premier triangle."""
+    mesh = TriangleMesh(points)
+    mesh.init_triangle(0, 1, 2)
+    for i in range(3, len(points)):
+        mesh.insert(i)
+    return mesh
+
+
+def random_pointset(n, seed):
+    """Renvoie n points aléatoires reproductibles."""
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(n)]
+
+
+def assert_consistent(mesh):
+    """Vérifie la réciprocité des voisinages et le sens direct des triangles."""
+    v = mesh.verts
+    for t, alive in enumerate(mesh.alive):
+        if not alive:
+            continue
+        for i in range(3):
+            n = mesh.nbrs[3 * t + i]
+            assert mesh.alive[n]
+            assert t in mesh.nbrs[3 * n:3 * n + 3]
+            a, b = v[3 * t + (i + 1) % 3], v[3 * t + (i + 2) % 3]
+            edges_n = {
+                (v[3 * n + (j + 1) % 3], v[3 * n + (j + 2) % 3]) for j in range(3)
+            }
+            assert (b, a) in edges_n
+        if not mesh.is_ghost(t):
+            a, b, c = (mesh.points[k] for k in v[3 * t:3 * t + 3])
+            assert (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0]) > 0
+
+
+def test_init_triangle_orients_ccw():
+    """Le premier triangle est réorienté dans le sens direct."""
+    mesh = TriangleMesh([(0., 0.), (0., 1.), (1., 0.)])
+    mesh.init_triangle(0, 1, 2)
+    assert mesh.triangles() == [(0, 1, 2)]
+    assert sum(mesh.alive) == 4
+    assert_consistent(mesh)
+
+
+def test_locate_inside_and_outside():
+    """La marche trouve le triangle contenant, ou un fantôme hors enveloppe."""
+    mesh = build_mesh([(0., 0.), (4., 0.), (0., 4.), (4., 4.), (2., 1.)])
+    t = mesh.locate((1., .5))
+    assert not mesh.is_ghost(t)
+    assert 4 in mesh.verts[3 * t:3 * t + 3] or 0 in mesh.verts[3 * t:3 * t + 3]
+    assert mesh.is_ghost(mesh.locate((10., 10.)))
+
+
+def test_insert_duplicate_is_ignored():
+    """Un point déjà présent n'est pas inséré."""
+    mesh = TriangleMesh([(0., 0.), (1., 0.), (0., 1.), (1., 0.)])
+    mesh.init_triangle(0, 1, 2)
+    assert mesh.insert(3) is False
+    assert mesh.triangles() == [(0, 1, 2)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mesh_stays_consistent(seed):
+    """Les voisinages restent réciproques après des insertions aléatoires."""
+    mesh = build_mesh(random_pointset(80, seed))
+    assert_consistent(mesh)
+
+
+def test_collinear_hull_points():
+    """Les points alignés sur l'enveloppe sont insérés sans casser le maillage."""
+    points = [(0., 1.), (0., 0.), (3., 0.), (4., 0.), (2., 0.),
+              (1., 1.), (6., 0.), (5., 0.), (2., 1.)]
+    mesh = build_mesh(points)
+    assert_consistent(mesh)
+    assert {i for t in mesh.triangles() for i in t} == set(range(len(points)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_matches_divide_conquer(seed):
+    """En position générale, les deux moteurs rapides donnent le même résultat."""
+    points = random_pointset(100, seed)
+    assert set(incremental(points)) == set(divide_and_conquer(points))
+
+
+def test_incremental_all_collinear():
+    """Des points tous alignés ne produisent aucun triangle."""
+    assert incremental([(0., 0.), (1., 1.), (2., 2.), (0., 0.)]) == []
+
+
+def test_ghost_vertex_never_returned():
+    """Aucun triangle renvoyé ne référence le sommet fantôme."""
+    triangles = incremental(random_pointset(30, 42))
+    assert all(GHOST not in t for t in triangles)
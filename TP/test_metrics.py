@@ -0,0 +1,72 @@
+"""Tests unitaires pour les métriques au format Prometheus."""
+
+import pytest
+from metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_counter_with_labels():
+    """Un compteur étiqueté exporte une ligne par série, triées."""
+    c = Counter("errors_total", "Erreurs.", labels=("code",))
+    c.inc(code="B")
+    c.inc(2, code="A")
+    assert c.value(code="A") == 2
+    assert c.render() == (
+        "# HELP errors_total Erreurs.\n"
+        "# TYPE errors_total counter\n"
+        'errors_total{code="A"} 2.0\n'
+        'errors_total{code="B"} 1.0\n'
+    )
+    with pytest.raises(ValueError):
+        c.inc(-1, code="A")
+    with pytest.raises(ValueError):
+        c.inc(status="500")
+
+
+def test_gauge_track_and_callback():
+    """Une jauge suit les traitements en cours ; un callback est lu à l'export."""
+    g = Gauge("in_flight", "En cours.")
+    with g.track():
+        assert g.value() == 1
+    assert g.value() == 0
+    g.set(7)
+    assert "in_flight 7.0" in g.render()
+    assert "size 42.0" in Gauge("size", "Taille.", callback=lambda: 42).render()
+    with pytest.raises(ValueError):
+        Gauge("bad", "Étiquettes et callback.", labels=("a",), callback=lambda: 0)
+
+
+def test_histogram_cumulative_buckets():
+    """Les seaux sont cumulés, +Inf vaut le nombre total d'observations."""
+    h = Histogram("latency_seconds", "Durées.", labels=("stage",), buckets=(.1, 1.))
+    for value in (.05, .5, .7, 3.):
+        h.observe(value, stage="fetch")
+    lines = h.render().splitlines()
+    assert lines[2:] == [
+        'latency_seconds_bucket{stage="fetch",le="0.1"} 1.0',
+        'latency_seconds_bucket{stage="fetch",le="1.0"} 3.0',
+        'latency_seconds_bucket{stage="fetch",le="+Inf"} 4.0',
+        'latency_seconds_sum{stage="fetch"} 4.25',
+        'latency_seconds_count{stage="fetch"} 4.0',
+    ]
+    with h.time(stage="decode"):
+        pass
+    assert h.count(stage="decode") == 1
+
+
+def test_label_values_escaped():
+    """Guillemets, barres obliques et retours à la ligne sont échappés."""
+    c = Counter("c", "Aide.", labels=("v",))
+    c.inc(v='a"b\\c\nd')
+    assert 'c{v="a\\"b\\\\c\\nd"} 1.0' in c.render()
+
+
+def test_registry_render():
+    """Le registre concatène ses métriques et refuse les doublons."""
+    registry = Registry()
+    registry.counter("a_total", "A.").inc()
+    registry.histogram("b_seconds", "B.").observe(.2)
+    text = registry.render()
+    assert text.index("# TYPE a_total counter") < text.index("# TYPE b_seconds")
+    assert "b_seconds_count 1.0" in text
+    with pytest.raises(ValueError):
+        registry.counter("a_total", "Doublon.")
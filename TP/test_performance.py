@@ -1,14 +1,21 @@
 """Tests de performance pour l'encodage, décodage et triangulation."""
 import random
+import sys
 import time
+from array import array
 
 import pytest
+from dynamic_triangulation import DelaunayTriangulation
 from encoding import (
     decode_pointset,
     decode_triangles,
+    decode_triangles_array,
     encode_pointset,
     encode_triangles,
+    encode_triangles_array,
+    encode_triangles_compact,
 )
+from triangulation_result import Triangulation
 from Triangulator import triangulate
 
 # -------------------------------------------------------
@@ -98,3 +105,72 @@ def test_triangulate_perf():
 
     assert isinstance(triangles, list)
     assert duration < 2.0
+
+
+@pytest.mark.performance
+def test_triangulate_divide_conquer_perf():
+    """Measure performance of the divide-and-conquer engine with 5000 points."""
+    points = random_points(5000)
+    start = time.perf_counter()
+    triangles = triangulate(points, engine="divide_conquer")
+    duration = time.perf_counter() - start
+
+    assert len(triangles) > 0
+    assert duration < 2.0
+
+
+@pytest.mark.performance
+def test_array_codec_perf():
+    """Measure the flat-buffer codec round trip with 200000 points."""
+    coords = array("f", (random.random() for _ in range(400000)))
+    indices = array("I", (random.randrange(200000) for _ in range(600000)))
+
+    start = time.perf_counter()
+    data = encode_triangles_array(coords, indices)
+    decoded_coords, decoded_indices = decode_triangles_array(data)
+    duration = time.perf_counter() - start
+
+    assert len(decoded_coords) == len(coords)
+    assert len(decoded_indices) == len(indices)
+    assert duration < 0.5
+
+
+@pytest.mark.performance
+def test_compact_result_memory():
+    """Measure the memory footprint of the compact result against tuples."""
+    points = random_points(5000)
+    triangles = triangulate(points)
+    result = Triangulation.from_lists(points, triangles)
+
+    tuples_size = sys.getsizeof(triangles) + sum(map(sys.getsizeof, triangles))
+    assert memoryview(result.indices).nbytes * 5 <= tuples_size
+
+
+@pytest.mark.performance
+def test_compact_encoding_size():
+    """Measure the compact wire format size against the Triangles format."""
+    points = random_points(5000)
+    triangles = triangulate(points)
+
+    start = time.perf_counter()
+    compact = encode_triangles_compact(points, triangles)
+    duration = time.perf_counter() - start
+
+    assert len(compact) * 3 <= len(encode_triangles(points, triangles))
+    assert duration < 1.0
+
+
+@pytest.mark.performance
+def test_dynamic_edit_perf():
+    """Measure local moves in a 5000-point dynamic triangulation."""
+    points = random_points(5000)
+    dt = DelaunayTriangulation(points)
+
+    start = time.perf_counter()
+    for i in range(500):
+        x, y = points[i]
+        dt.move(i, (x + 1e-3, y + 1e-3))
+    duration = time.perf_counter() - start
+
+    assert len(dt.vertices) == 5000
+    assert duration / 500 < 0.005
@@ -0,0 +1,97 @@
+"""Tests unitaires des requêtes de localisation et de plus proche sommet."""
+
+import random
+
+import pytest
+from point_location import OUTSIDE, PointLocator
+from predicates import orient2d
+from triangulation_result import Triangulation
+from Triangulator import triangulate
+
+
+def random_points(n, seed=0):
+    """Renvoie n points aléatoires reproductibles."""
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random()) for _ in range(n)]
+
+
+def contains(points, triangle, q):
+    """Vérifie que q est dans le triangle (bord compris)."""
+    a, b, c = (points[i] for i in triangle)
+    sign = orient2d(a, b, c)
+    return all(orient2d(u, w, q) * sign >= 0 for u, w in ((a, b), (b, c), (c, a)))
+
+
+def brute_nearest_distance(points, q):
+    """Renvoie la distance au carré du plus proche point, par parcours complet."""
+    return min((x - q[0]) ** 2 + (y - q[1]) ** 2 for x, y in points)
+
+
+@pytest.mark.parametrize("n", [3, 10, 500])
+def test_queries_match_brute_force(n):
+    """Localisation et plus proche sommet concordent avec un parcours complet."""
+    points = random_points(n, n)
+    triangles = triangulate(points)
+    locator = PointLocator(points, triangles)
+    rng = random.Random(1)
+    queries = [(rng.uniform(-.3, 1.3), rng.uniform(-.3, 1.3)) for _ in range(300)]
+    located, nearest = locator.query_many(queries)
+    for q, t, v in zip(queries, located, nearest, strict=True):
+        if t == OUTSIDE:
+            assert not any(contains(points, tri, q) for tri in triangles)
+        else:
+            assert contains(points, triangles[t], q)
+        p = points[v]
+        assert (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 == (
+            brute_nearest_distance(points, q)
+        )
+
+
+def test_vertices_and_edges():
+    """Un sommet ou un point d'arête est attribué à un triangle qui le porte."""
+    points = [(0., 0.), (2., 0.), (0., 2.), (2., 2.)]
+    triangles = triangulate(points)
+    locator = PointLocator(points, triangles)
+    for i, p in enumerate(points):
+        assert i in triangles[locator.locate(p)]
+        assert locator.nearest(p) == i
+    assert contains(points, triangles[locator.locate((1., 1.))], (1., 1.))
+    assert locator.locate((3., 1.)) == OUTSIDE
+    assert locator.nearest((3., 1.)) in (1, 3)
+
+
+def test_single_methods_match_batch():
+    """`locate` et `nearest` donnent les résultats du lot."""
+    points = random_points(200)
+    locator = PointLocator.from_triangulation(
+        Triangulation.from_lists(points, triangulate(points))
+    )
+    queries = random_points(50, seed=9)
+    assert list(locator.locate_many(queries)) == [locator.locate(q) for q in queries]
+    assert list(locator.nearest_many(queries)) == [locator.nearest(q) for q in queries]
+    assert locator.query_many(queries, nearest=False)[1] is None
+
+
+def test_clustered_points():
+    """Des amas denses laissent des cellules vides sans fausser les réponses."""
+    rng = random.Random(4)
+    points = [(rng.gauss(cx, .01), rng.gauss(cy, .01))
+              for cx, cy in ((0., 0.), (1., 1.), (0., 1.)) for _ in range(100)]
+    triangles = triangulate(points)
+    locator = PointLocator(points, triangles)
+    for q in random_points(100, seed=5):
+        t = locator.locate(q)
+        assert t == OUTSIDE or contains(points, triangles[t], q)
+        v = locator.nearest(q)
+        assert (points[v][0] - q[0]) ** 2 + (points[v][1] - q[1]) ** 2 == (
+            brute_nearest_distance(points, q)
+        )
+
+
+def test_without_triangles():
+    """Sans triangle, tout est hors enveloppe et le plus proche est cherché partout."""
+    points = [(0., 0.), (1., 1.), (2., 2.)]
+    locator = PointLocator(points, triangulate(points))
+    assert locator.locate((1., 1.)) == OUTSIDE
+    assert locator.nearest((1.9, 2.2)) == 2
+    assert PointLocator([], []).nearest((0., 0.)) == OUTSIDE
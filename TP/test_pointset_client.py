@@ -0,0 +1,162 @@
+"""Tests du client HTTP du PointSetManager contre un serveur local réel."""
+
+import http.client
+import time
+import uuid
+
+import pytest
+from encoding import encode_pointset
+from pointset_client import CircuitBreaker, PointSetManagerClient, PointSetManagerError
+from pointset_manager_stub import PointSetManagerStub
+
+PAYLOAD = encode_pointset([(0., 0.), (1., 0.), (0., 1.)])
+
+
+@pytest.fixture
+def stub():
+    """Démarre un PointSetManager local pour la durée du test."""
+    with PointSetManagerStub() as server:
+        yield server
+
+
+@pytest.fixture
+def client(stub):
+    """Renvoie un client rapide (reprises sans attente) vers le serveur local."""
+    c = PointSetManagerClient(stub.url, backoff=0.0, breaker_threshold=3)
+    yield c
+    c.close()
+
+
+class FakeClock:
+    """Horloge manuelle pour tester le disjoncteur."""
+
+    def __init__(self):
+        """Démarre l'horloge à zéro."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Renvoie l'instant courant."""
+        return self.now
+
+
+def test_fetch_success(stub, client):
+    """Un PointSet enregistré est renvoyé tel quel."""
+    pointset_id = stub.add(PAYLOAD)
+    assert bytes(client.fetch(pointset_id)) == PAYLOAD
+
+
+def test_connections_are_reused(stub, client):
+    """Les requêtes successives réutilisent la même connexion TCP."""
+    pointset_id = stub.add(PAYLOAD)
+    for _ in range(5):
+        client.fetch(pointset_id)
+    assert stub.connections == 1
+    assert client.connections_opened == 1
+
+
+def test_expired_deadline_keeps_pooled_connection(stub, client):
+    """Une requête déjà hors délai ne ferme pas la connexion saine du pool."""
+    pointset_id = stub.add(PAYLOAD)
+    client.fetch(pointset_id)
+    with pytest.raises(PointSetManagerError) as exc:
+        client.fetch(pointset_id, deadline=time.monotonic() - 1)
+    assert exc.value.status == 503
+    client.fetch(pointset_id)
+    assert stub.connections == 1
+    assert client.connections_opened == 1
+
+
+def test_connect_timeout_bounded_by_deadline(stub, client, monkeypatch):
+    """L'ouverture d'une connexion n'attend pas au-delà de l'échéance."""
+    timeouts = []
+
+    class Recording(http.client.HTTPConnection):
+        """Connexion qui relève son délai d'ouverture."""
+
+        def __init__(self, host, port, timeout):
+            """Relève `timeout` puis crée la connexion."""
+            timeouts.append(timeout)
+            super().__init__(host, port, timeout=timeout)
+
+    monkeypatch.setattr(client, "_connection_class", Recording)
+    pointset_id = stub.add(PAYLOAD)
+    client.fetch(pointset_id, deadline=time.monotonic() + .5)
+    assert len(timeouts) == 1 and timeouts[0] <= .5
+    assert timeouts[0] < client.connect_timeout
+
+
+def test_fetch_not_found(client):
+    """Un PointSet absent donne POINTSET_NOT_FOUND / 404, sans reprise."""
+    with pytest.raises(PointSetManagerError) as exc:
+        client.fetch(str(uuid.uuid4()))
+    assert exc.value.status == 404
+    assert exc.value.code == "POINTSET_NOT_FOUND"
+
+
+def test_fetch_invalid_id(client):
+    """Un identifiant refusé par le PointSetManager donne une erreur 400."""
+    with pytest.raises(PointSetManagerError) as exc:
+        client.fetch("pas-un-uuid")
+    assert exc.value.status == 400
+
+
+def test_transient_503_is_retried(stub, client):
+    """Une panne passagère est absorbée par les reprises."""
+    pointset_id = stub.add(PAYLOAD)
+    stub.fail_next = 2
+    assert bytes(client.fetch(pointset_id)) == PAYLOAD
+    assert stub.requests == 3
+
+
+def test_persistent_503_is_unavailable(stub, client):
+    """Au-delà des reprises, l'erreur POINTSET_MANAGER_ERROR / 503 est levée."""
+    pointset_id = stub.add(PAYLOAD)
+    stub.fail_next = 10
+    with pytest.raises(PointSetManagerError) as exc:
+        client.fetch(pointset_id)
+    assert exc.value.status == 503
+    assert exc.value.code == "POINTSET_MANAGER_ERROR"
+    assert stub.requests == 3
+
+
+def test_connection_refused_is_unavailable():
+    """Un PointSetManager injoignable donne une erreur 503."""
+    with PointSetManagerStub() as server:
+        url = server.url
+    c = PointSetManagerClient(url, retries=1, backoff=0.0)
+    with pytest.raises(PointSetManagerError) as exc:
+        c.fetch(str(uuid.uuid4()))
+    assert exc.value.status == 503
+
+
+def test_circuit_opens_after_failures(stub, client):
+    """Le disjoncteur ouvert refuse les appels sans contacter le serveur."""
+    pointset_id = stub.add(PAYLOAD)
+    stub.fail_next = 100
+    with pytest.raises(PointSetManagerError):
+        client.fetch(pointset_id)
+    requests = stub.requests
+    with pytest.raises(PointSetManagerError, match="circuit open"):
+        client.fetch(pointset_id)
+    assert stub.requests == requests
+
+
+def test_circuit_breaker_half_open():
+    """Après le délai, un essai est permis ; son succès referme le circuit."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_invalid_base_url():
+    """Une URL sans schéma HTTP est refusée."""
+    with pytest.raises(ValueError):
+        PointSetManagerClient("ftp://example")
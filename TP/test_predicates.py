@@ -0,0 +1,63 @@
+"""Tests unitaires pour les prédicats orient2d et incircle."""
+
+from fractions import Fraction
+
+from predicates import incircle, orient2d
+
+
+def sign(x):
+    """Renvoie le signe de x (-1, 0 ou 1)."""
+    return (x > 0) - (x < 0)
+
+
+def exact_orient(a, b, c):
+    """Renvoie orient2d calculé exactement en rationnels."""
+    ax, ay, bx, by, cx, cy = (Fraction(v) for v in (*a, *b, *c))
+    return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+
+def test_orient2d_signs():
+    """Sens direct positif, sens horaire négatif, alignés nul."""
+    assert orient2d((0., 0.), (1., 0.), (0., 1.)) > 0
+    assert orient2d((0., 0.), (0., 1.), (1., 0.)) < 0
+    assert orient2d((0., 0.), (1., 1.), (3., 3.)) == 0
+
+
+def test_orient2d_near_collinear_is_exact():
+    """Sur des points presque alignés, le signe est celui du calcul exact."""
+    ulp = 2.0 ** -53
+    b, c = (12., 12.), (24., 24.)
+    naive_wrong = 0
+    for i in range(32):
+        for j in range(32):
+            a = (0.5 + i * ulp, 0.5 + j * ulp)
+            expected = sign(exact_orient(a, b, c))
+            assert sign(orient2d(a, b, c)) == expected
+            naive = (a[0] - c[0]) * (b[1] - c[1]) - (a[1] - c[1]) * (b[0] - c[0])
+            naive_wrong += sign(naive) != expected
+    # Le cas est bien pathologique pour le calcul flottant direct
+    assert naive_wrong > 0
+
+
+def test_incircle_signs():
+    """Intérieur positif, extérieur négatif pour un triangle direct."""
+    a, b, c = (0., 0.), (2., 0.), (0., 2.)
+    assert incircle(a, b, c, (1., 1.)) > 0
+    assert incircle(a, b, c, (3., 3.)) < 0
+    assert incircle(a, c, b, (1., 1.)) < 0
+
+
+def test_incircle_cocircular_is_zero():
+    """Quatre points cocycliques donnent exactement zéro."""
+    assert incircle((0., 0.), (1., 0.), (1., 1.), (0., 1.)) == 0
+    assert incircle((1e8, 0.), (1e8 + 1., 0.), (1e8 + 1., 1.), (1e8, 1.)) == 0
+
+
+def test_incircle_near_cocircular_is_exact():
+    """Un point à un ulp du cercle est classé du bon côté."""
+    a, b, c = (0., 0.), (1., 0.), (1., 1.)
+    inside = (0.0, 1.0 - 2.0 ** -53)
+    outside = (0.0, 1.0 + 2.0 ** -52)
+    assert incircle(a, b, c, inside) > 0
+    assert incircle(a, b, c, outside) < 0
+
@@ -0,0 +1,100 @@
+"""Tests unitaires du pré-traitement des points (fusion, dégénérescences)."""
+
+import random
+from array import array
+from unittest.mock import patch
+
+import pytest
+from preprocessing import (
+    is_degenerate,
+    merge_points,
+    prepare,
+    restore_indices,
+)
+from Triangulator import ENGINES, triangulate
+
+
+def test_merge_exact_duplicates():
+    """Sans tolérance, seuls les doublons exacts sont fusionnés, au premier vu."""
+    points = [(1., 1.), (0., 0.), (1., 1.), (1., 1. + 1e-12), (0., 0.)]
+    assert merge_points(points) == ([(1., 1.), (0., 0.), (1., 1. + 1e-12)], [0, 1, 3])
+
+
+def test_merge_within_tolerance():
+    """Un point à distance au plus `tolerance` d'un représentant est fusionné."""
+    points = [(0., 0.), (.05, .05), (.1, 0.), (.25, 0.), (-.099, 0.), (.3, .3)]
+    kept, index = merge_points(points, tolerance=.1)
+    # (.1, 0) est à portée de (0, 0), (.25, 0) ne l'est d'aucun représentant
+    assert index == [0, 3, 5]
+    assert kept == [points[i] for i in index]
+
+
+def test_merge_matches_brute_force():
+    """La grille trouve les mêmes représentants qu'une recherche exhaustive."""
+    rng = random.Random(3)
+    points = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(500)]
+    tolerance = .05
+    expected = []
+    for i, (x, y) in enumerate(points):
+        if all((x - points[k][0]) ** 2 + (y - points[k][1]) ** 2 > tolerance ** 2
+               for k in expected):
+            expected.append(i)
+    assert merge_points(points, tolerance)[1] == expected
+
+
+@pytest.mark.parametrize("tolerance", [-1., float("inf"), float("nan")])
+def test_merge_invalid_tolerance(tolerance):
+    """Une tolérance négative ou non finie lève ValueError."""
+    with pytest.raises(ValueError):
+        merge_points([(0., 0.)], tolerance)
+
+
+def test_is_degenerate():
+    """Moins de trois points ou des points alignés n'ont aucun triangle."""
+    assert is_degenerate([])
+    assert is_degenerate([(0., 0.), (1., 1.)])
+    assert is_degenerate([(float(i), 3. * i + 1) for i in range(100)])
+    assert not is_degenerate([(0., 0.), (1., 0.), (2., 0.), (0., 1e-9)])
+
+
+def test_restore_indices():
+    """Les triangles des représentants renvoient aux indices d'origine."""
+    prepared = prepare([(0., 0.), (0., 0.), (1., 0.), (1., 0.), (0., 1.)])
+    assert prepared.index == [0, 2, 4] and not prepared.degenerate
+    assert restore_indices([(0, 1, 2)], prepared.index) == [(0, 2, 4)]
+    flat = restore_indices(array("I", [0, 1, 2]), prepared.index)
+    assert flat == array("I", [0, 2, 4])
+    triangles = [(0, 1, 2)]
+    assert restore_indices(triangles, [0, 1, 2]) is triangles
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_triangulate_merges_close_points(engine):
+    """Des points bruités autour d'un même site donnent la triangulation des sites."""
+    rng = random.Random(1)
+    sites = [(rng.random(), rng.random()) for _ in range(30)]
+    noisy = sites + [(x + rng.uniform(-1e-9, 1e-9), y) for x, y in sites * 3]
+    rng.shuffle(noisy)
+    triangles = triangulate(noisy, engine=engine, tolerance=1e-6)
+    # Chaque triangle référence le premier point de chaque groupe
+    site_of = [
+        min(range(len(sites)),
+            key=lambda k: (sites[k][0] - x) ** 2 + (sites[k][1] - y) ** 2)
+        for x, y in noisy
+    ]
+    first = {}
+    for i, k in enumerate(site_of):
+        first.setdefault(k, i)
+    assert {i for t in triangles for i in t} <= set(first.values())
+    assert all(t == tuple(sorted(t)) for t in triangles)
+    expected = triangulate(sites, engine=engine)
+    assert {frozenset(site_of[i] for i in t) for t in triangles} == {
+        frozenset(t) for t in expected
+    }
+
+
+def test_triangulate_degenerate_skips_engine():
+    """Des points alignés ou confondus ne lancent pas le moteur."""
+    with patch.dict(ENGINES, {"divide_conquer": None}):
+        assert triangulate([(float(i), 2. * i) for i in range(50)]) == []
+        assert triangulate([(1., 1.)] * 10) == []
@@ -0,0 +1,88 @@
+"""Tests unitaires du profilage échantillonné."""
+
+import json
+import random
+import threading
+import time
+
+import divide_conquer
+import mesh
+import profiling
+from predicates import incircle, orient2d
+from profiling import Profile
+from Triangulator import triangulate
+
+
+def random_points(n, seed=0):
+    """Renvoie n points aléatoires reproductibles."""
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random()) for _ in range(n)]
+
+
+def test_fast_call_not_sampled():
+    """Un appel plus court que le délai n'est ni échantillonné ni compté."""
+    with Profile(delay=10.) as profile:
+        triangulate(random_points(50))
+    assert not profile.triggered
+    assert not profile.stacks and not profile.counters
+    assert not profiling.active
+
+
+def test_incremental_counters():
+    """Les prédicats, marches et cavités de l'insertion incrémentale sont comptés."""
+    points = random_points(2000)
+    with Profile(delay=0.) as profile:
+        time.sleep(.02)  # laisse démarrer l'échantillonneur
+        triangulate(points, engine="incremental")
+    counters = profile.counters
+    assert profile.triggered
+    assert counters["incircle"] > 0 and counters["orient2d"] > 0
+    # Les trois premiers points forment le triangle initial
+    assert counters["cavity_size_count"] == 2000 - 3
+    assert counters["walk_steps_count"] >= 2000 - 3
+    # Cavité moyenne de Bowyer-Watson : environ quatre triangles
+    assert 2 < counters["cavity_size"] / counters["cavity_size_count"] < 8
+    # Les prédicats d'origine sont restaurés
+    assert mesh.incircle is incircle and divide_conquer.incircle is incircle
+    assert not profiling.active
+
+
+def test_counting_leaves_modules_untouched():
+    """Les prédicats sont comptés sans que les modules des moteurs soient modifiés."""
+    points = random_points(5000)
+    with Profile(delay=0.) as profile:
+        time.sleep(.02)
+        assert profiling.active
+        assert mesh.orient2d is orient2d and divide_conquer.incircle is incircle
+        triangulate(points, engine="divide_conquer")
+    counters = profile.counters
+    assert counters["incircle"] > 0 and counters["orient2d"] > 0
+    assert not profiling.active
+
+
+def test_samples_collapsed_stacks(tmp_path):
+    """Les piles échantillonnées sont écrites au format « collapsed stacks »."""
+    with Profile(delay=0., interval=.001) as profile:
+        triangulate(random_points(20000))
+    assert sum(profile.stacks.values()) > 0
+    base = profile.save(str(tmp_path / "profils"), "essai", points=20000)
+    lines = (tmp_path / "profils" / "essai.folded").read_text().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "test_profiling.py:test_samples_collapsed_stacks" in stack.split(";")
+    with open(base + ".json") as f:
+        report = json.load(f)
+    assert report["points"] == 20000
+    assert report["samples"] == sum(profile.stacks.values())
+    assert report["counters"]["incircle"] > 0
+
+
+def test_counters_scoped_to_profiled_context():
+    """Un calcul concurrent, dans un autre thread, ne s'ajoute pas au profil."""
+    with Profile(delay=0.) as profile:
+        time.sleep(.02)
+        assert profiling.active
+        other = threading.Thread(target=triangulate, args=(random_points(500),))
+        other.start()
+        other.join()
+    assert profile.counters["incircle"] == 0
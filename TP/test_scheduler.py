@@ -0,0 +1,138 @@
+"""Tests de l'ordonnancement des triangulations par taille."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from deadline import Deadline, DeadlineExceeded
+from encoding import encode_pointset
+from scheduler import Lane, LaneFull, Scheduler
+
+
+@pytest.fixture
+def lanes():
+    """Renvoie un ordonnanceur à deux voies : en ligne et dans un pool."""
+    executor = ThreadPoolExecutor(2)
+    scheduler = Scheduler([
+        Lane("small", 10, slots=2),
+        Lane("large", None, slots=1, executor=executor),
+    ])
+    yield scheduler
+    scheduler.close()
+    executor.shutdown()
+
+
+def hold(lane: Lane):
+    """Occupe une place de la voie jusqu'à ce que l'événement renvoyé soit levé."""
+    taken = threading.Event()
+    release = threading.Event()
+
+    def run():
+        with lane.slot():
+            taken.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    taken.wait(5)
+    return release, thread
+
+
+def test_lane_for_size(lanes):
+    """Chaque taille va dans la première voie dont la borne la contient."""
+    small, large = lanes.lanes
+    assert lanes.lane_for(0) is small
+    assert lanes.lane_for(10) is small
+    assert lanes.lane_for(11) is large
+    assert lanes.lane_for(10**7) is large
+
+
+def test_lane_of_reads_header(lanes):
+    """La voie est choisie d'après l'en-tête ; un en-tête illisible va en tête."""
+    small, large = lanes.lanes
+    points = [(float(i), 0.) for i in range(20)]
+    assert lanes.lane_of(encode_pointset(points[:5])) is small
+    assert lanes.lane_of(encode_pointset(points)) is large
+    # Seul l'en-tête compte : le corps n'est pas lu
+    assert lanes.lane_of(encode_pointset(points)[:4]) is large
+    assert lanes.lane_of(b"\x01") is small
+
+
+def test_last_lane_must_be_unbounded():
+    """Toute taille doit avoir une voie."""
+    with pytest.raises(ValueError):
+        Scheduler([Lane("small", 10, slots=1)])
+    with pytest.raises(ValueError):
+        Lane("vide", None, slots=0)
+
+
+def test_run_inline_and_in_pool(lanes):
+    """La voie en ligne exécute dans l'appelant, l'autre dans son pool."""
+    small, large = lanes.lanes
+    caller = threading.current_thread()
+    assert small.run(threading.current_thread) is caller
+    assert large.run(threading.current_thread) is not caller
+    assert large.stats()["completed"] == 1
+
+
+def test_slot_waits_until_deadline(lanes):
+    """Sans place libre avant l'échéance, la voie lève DeadlineExceeded."""
+    large = lanes.lanes[1]
+    release, thread = hold(large)
+    try:
+        with pytest.raises(DeadlineExceeded), large.slot(Deadline.after(0.05)):
+            pass
+        assert large.stats()["waiting"] == 0
+    finally:
+        release.set()
+        thread.join()
+    with large.slot(Deadline.after(1)):
+        assert large.stats()["running"] == 1
+
+
+def test_full_queue_rejects():
+    """Au-delà de `max_queue` calculs en attente, la voie refuse tout de suite."""
+    lane = Lane("large", None, slots=1, max_queue=0)
+    release, thread = hold(lane)
+    try:
+        with pytest.raises(LaneFull), lane.slot():
+            pass
+    finally:
+        release.set()
+        thread.join()
+    assert lane.stats()["rejected"] == 1
+
+
+def test_busy_large_lane_does_not_block_small(lanes):
+    """Une voie lourde saturée ne retarde pas les petits calculs."""
+    small, large = lanes.lanes
+    release, thread = hold(large)
+    try:
+        assert small.run(sum, (1, 2, 3), deadline=Deadline.after(1)) == 6
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_pool_result_abandoned_at_deadline(lanes):
+    """Un calcul du pool non terminé à l'échéance est abandonné, sa place rendue."""
+    large = lanes.lanes[1]
+    release = threading.Event()
+    with pytest.raises(DeadlineExceeded):
+        large.run(release.wait, 5, deadline=Deadline.after(0.05))
+    # La place reste prise tant que le calcul abandonné occupe son worker
+    assert large.stats()["running"] == 1
+    with pytest.raises(DeadlineExceeded, match="Aucune place"):
+        large.run(len, "abc", deadline=Deadline.after(0.05))
+    release.set()
+    assert large.run(len, "abc") == 3
+
+
+def test_process_lane():
+    """Une voie à processus crée son pool au premier calcul et l'arrête."""
+    lane = Lane("large", None, slots=1, processes=True)
+    try:
+        assert lane.run(pow, 2, 10) == 1024
+    finally:
+        lane.close()
+    assert lane._executor is None
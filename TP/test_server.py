@@ -1,9 +1,42 @@
 """Tests pour le serveur Flask de triangulation de PointSets."""
+import json
+import random
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pytest
-from triangulator_server import app
+import triangulator_server
+from encoding import (
+    apply_triangles_delta,
+    decode_query_results,
+    decode_triangles,
+    decode_triangles_compact,
+    encode_pointset,
+    iter_decode_batch,
+)
+from point_location import PointLocator
+from pointset_client import PointSetManagerClient, PointSetManagerError
+from pointset_manager_stub import PointSetManagerStub
+from scheduler import Lane, Scheduler
+from triangulation_result import Triangulation
+from triangulation_store import TriangulationStore
+from Triangulator import triangulate, triangulate_compact
+from triangulator_server import (
+    COMPACT_MIMETYPE,
+    DELTA_MIMETYPE,
+    app,
+    cache,
+    flights,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Vide le cache des triangulations avant chaque test."""
+    cache.clear()
 
 
 @pytest.fixture
@@ -38,7 +71,7 @@ def test_decode_error(client):
 def test_triangulate_error(client):
     """Renvoie 500 si le calcul de la triangulation échoue."""
     with patch(
-        "triangulator_server.triangulate", 
+        "triangulator_server.triangulate_compact", 
         side_effect=Exception("échec de la triangulation")
     ):
         rv = client.get(f"/triangulation/{uuid.uuid4()}")
@@ -47,8 +80,8 @@ def test_triangulate_error(client):
 
 def test_encode_error(client):
     """Renvoie 500 si l'encodage du résultat de triangulation échoue."""
-    with patch(
-        "triangulator_server.encode_triangles", 
+    with patch.object(
+        Triangulation, "encode", 
         side_effect=Exception("échec de l'encodage")
     ):
         rv = client.get(f"/triangulation/{uuid.uuid4()}")
@@ -79,3 +112,869 @@ def test_pointset_manager_empty_data(mock_fetch, client):
     assert rv.status_code == 500
     assert rv.is_json
 
+
+
+# -----------------------------
+# Cache des triangulations
+# -----------------------------
+def test_repeat_request_served_from_cache(client):
+    """Une requête répétée ne refait ni récupération ni triangulation."""
+    pointset_id = str(uuid.uuid4())
+    first = client.get(f"/triangulation/{pointset_id}")
+    with patch("triangulator_server.fetch_pointset") as mock_fetch, \
+            patch("triangulator_server.triangulate_compact") as mock_tri:
+        second = client.get(f"/triangulation/{pointset_id}")
+    assert second.status_code == 200
+    assert second.data == first.data
+    mock_fetch.assert_not_called()
+    mock_tri.assert_not_called()
+
+
+def test_same_content_other_id_served_from_cache(client):
+    """Deux identifiants au même contenu partagent la même entrée."""
+    payload = encode_pointset([(0., 0.), (1., 0.), (0., 1.)])
+    with patch("triangulator_server.fetch_pointset", return_value=payload):
+        first = client.get(f"/triangulation/{uuid.uuid4()}")
+        with patch("triangulator_server.triangulate_compact") as mock_tri:
+            second = client.get(f"/triangulation/{uuid.uuid4()}")
+    assert second.data == first.data
+    mock_tri.assert_not_called()
+    assert cache.stats()["hits"] == 1
+
+
+def test_failed_triangulation_not_cached(client):
+    """Une erreur n'est pas mise en cache."""
+    pointset_id = str(uuid.uuid4())
+    with patch("triangulator_server.triangulate_compact",
+               side_effect=Exception("échec")):
+        assert client.get(f"/triangulation/{pointset_id}").status_code == 500
+    assert client.get(f"/triangulation/{pointset_id}").status_code == 200
+
+
+# -----------------------------
+# Requêtes concurrentes
+# -----------------------------
+def test_concurrent_requests_triangulate_once(client):
+    """Des requêtes simultanées sur un même PointSet ne calculent qu'une fois."""
+    pointset_id = str(uuid.uuid4())
+    release = threading.Event()
+    calls = []
+
+    def slow_triangulate(points, **options):
+        calls.append(1)
+        release.wait(5)
+        return Triangulation.from_lists(points, [(0, 1, 2)])
+
+    statuses = []
+    followers = flights.followers
+    with patch("triangulator_server.triangulate_compact", side_effect=slow_triangulate):
+        threads = [
+            threading.Thread(
+                target=lambda: statuses.append(
+                    app.test_client().get(f"/triangulation/{pointset_id}").status_code
+                )
+            )
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for _ in range(500):
+            if flights.followers >= followers + 4:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+    assert statuses == [200] * 5
+    assert calls == [1]
+
+
+# -----------------------------
+# Réponses en flux
+# -----------------------------
+def test_large_result_streamed(client):
+    """Au-delà du seuil, la réponse est envoyée en flux et non mise en cache."""
+    points = [(float(i % 13), float(i // 13)) for i in range(60)]
+    payload = encode_pointset(points)
+    with patch("triangulator_server.fetch_pointset", return_value=payload), \
+            patch("triangulator_server.STREAM_MIN_POINTS", 50):
+        rv = client.get(f"/triangulation/{uuid.uuid4()}")
+        assert rv.status_code == 200
+        assert rv.is_streamed
+        assert "Content-Length" not in rv.headers
+        coords, triangles = decode_triangles(rv.get_data())
+    assert len(coords) == 60
+    assert sorted(triangles) == sorted(triangulate(points))
+    assert len(cache) == 0
+
+
+def test_streamed_encoding_error(client):
+    """Une erreur d'encodage en flux est signalée avant l'envoi (500)."""
+    with patch("triangulator_server.STREAM_MIN_POINTS", 0), \
+            patch.object(Triangulation, "chunks",
+                         side_effect=ValueError("indice invalide")):
+        rv = client.get(f"/triangulation/{uuid.uuid4()}")
+    assert rv.status_code == 500
+    assert rv.get_json()["code"] == "ENCODING_FAILED"
+
+
+# -----------------------------
+# Réponses delta
+# -----------------------------
+def grid_payload(moved=None):
+    """Renvoie une grille de 20 x 20 points, un point éventuellement déplacé."""
+    points = [(float(i), float(j)) for i in range(20) for j in range(20)]
+    if moved is not None:
+        points[moved] = (points[moved][0] + .5, points[moved][1] + .25)
+    return points, encode_pointset(points)
+
+
+def test_delta_against_previous_result(client):
+    """Avec la base précédente, seul le delta est envoyé et se réapplique."""
+    _, payload = grid_payload()
+    points, modified = grid_payload(moved=210)
+    with patch("triangulator_server.fetch_pointset", return_value=payload):
+        first = client.get(f"/triangulation/{uuid.uuid4()}")
+    base = first.headers["ETag"]
+    with patch("triangulator_server.fetch_pointset", return_value=modified):
+        rv = client.get(
+            f"/triangulation/{uuid.uuid4()}",
+            headers={"Accept": DELTA_MIMETYPE, "If-None-Match": base},
+        )
+    assert rv.status_code == 200
+    assert rv.mimetype == DELTA_MIMETYPE
+    assert rv.headers["X-Delta-Base"] == base
+    assert len(rv.data) * 20 < len(first.data)
+    coords, triangles = decode_triangles(apply_triangles_delta(first.data, rv.data))
+    assert coords == points
+    assert sorted(map(sorted, triangles)) == sorted(
+        map(sorted, triangulate(points))
+    )
+
+
+def test_delta_query_parameter_and_not_modified(client):
+    """`?base=` demande un delta ; la base égale au résultat donne 304."""
+    pointset_id = str(uuid.uuid4())
+    first = client.get(f"/triangulation/{pointset_id}")
+    etag = first.headers["ETag"].strip('"')
+    rv = client.get(f"/triangulation/{pointset_id}?base={etag}")
+    assert rv.status_code == 304
+    assert rv.data == b""
+
+
+def test_delta_unknown_base_falls_back(client):
+    """Une base inconnue ou non demandée donne la réponse complète."""
+    pointset_id = str(uuid.uuid4())
+    full = client.get(f"/triangulation/{pointset_id}")
+    rv = client.get(f"/triangulation/{pointset_id}?base={'0' * 32}")
+    assert rv.status_code == 200
+    assert rv.mimetype == "application/octet-stream"
+    assert rv.data == full.data
+    rv = client.get(
+        f"/triangulation/{uuid.uuid4()}", headers={"If-None-Match": '"autre"'}
+    )
+    assert rv.mimetype == "application/octet-stream"
+
+
+def test_compact_format_negotiated(client):
+    """Le format compact n'est servi que s'il est demandé explicitement."""
+    pointset_id = str(uuid.uuid4())
+    full = client.get(f"/triangulation/{pointset_id}", headers={"Accept": "*/*"})
+    assert full.mimetype == "application/octet-stream"
+    rv = client.get(
+        f"/triangulation/{pointset_id}", headers={"Accept": COMPACT_MIMETYPE}
+    )
+    assert rv.status_code == 200
+    assert rv.mimetype == COMPACT_MIMETYPE
+    assert rv.headers["Vary"] == "Accept"
+    _, full_tris = decode_triangles(full.data)
+    _, tris = decode_triangles_compact(rv.data)
+    assert sorted(map(sorted, tris)) == sorted(map(sorted, full_tris))
+
+
+def test_representations_have_own_etags(client):
+    """Complet, compact et delta ont chacun leur ETag ; un delta n'est pas caché."""
+    _, payload = grid_payload()
+    _, modified = grid_payload(moved=210)
+    pointset_id = str(uuid.uuid4())
+    with patch("triangulator_server.fetch_pointset", return_value=payload):
+        first = client.get(f"/triangulation/{uuid.uuid4()}")
+    base = first.headers["ETag"].strip('"')
+    with patch("triangulator_server.fetch_pointset", return_value=modified):
+        full = client.get(f"/triangulation/{pointset_id}")
+    key = full.headers["ETag"].strip('"')
+    compact = client.get(
+        f"/triangulation/{pointset_id}", headers={"Accept": COMPACT_MIMETYPE}
+    )
+    assert compact.headers["ETag"] == f'"{key}-compact"'
+    assert "Cache-Control" not in compact.headers
+
+    delta = client.get(f"/triangulation/{pointset_id}?base={base}")
+    assert delta.mimetype == DELTA_MIMETYPE
+    assert delta.headers["ETag"] == f'"{key}-delta-{base}"'
+    assert delta.headers["Cache-Control"] == "no-store"
+    assert "Accept" in delta.headers["Vary"]
+
+    # Chaque ETag ne valide que sa propre représentation
+    rv = client.get(
+        f"/triangulation/{pointset_id}",
+        headers={"Accept": COMPACT_MIMETYPE, "If-None-Match": compact.headers["ETag"]},
+    )
+    assert rv.status_code == 304
+    assert rv.headers["ETag"] == compact.headers["ETag"]
+    assert rv.headers["Vary"] == "Accept"
+    rv = client.get(
+        f"/triangulation/{pointset_id}", headers={"If-None-Match": full.headers["ETag"]}
+    )
+    assert rv.status_code == 304
+    rv = client.get(
+        f"/triangulation/{pointset_id}", headers={"If-None-Match": f'"{key}-compact"'}
+    )
+    assert rv.status_code == 200
+    assert rv.data == full.data
+    # Le delta appliqué redonne le résultat : son ETag sert de base
+    rv = client.get(f"/triangulation/{pointset_id}?base={key}-delta-0")
+    assert rv.status_code == 304
+
+
+def test_error_responses_vary_on_accept(client):
+    """Les erreurs de la route de triangulation portent aussi `Vary: Accept`."""
+    rv = client.get("/triangulation/invalid-uuid")
+    assert rv.status_code == 400
+    assert rv.headers["Vary"] == "Accept"
+    assert "Vary" not in client.get("/metrics").headers
+
+
+def test_compact_format_for_streamed_result(client):
+    """Un grand maillage demandé au format compact est envoyé d'un bloc."""
+    points = [(float(i % 13), float(i // 13)) for i in range(60)]
+    with patch("triangulator_server.fetch_pointset",
+               return_value=encode_pointset(points)), \
+            patch("triangulator_server.STREAM_MIN_POINTS", 50):
+        rv = client.get(
+            f"/triangulation/{uuid.uuid4()}", headers={"Accept": COMPACT_MIMETYPE}
+        )
+    assert rv.mimetype == COMPACT_MIMETYPE
+    coords, _ = decode_triangles_compact(rv.data)
+    for (x, y), (cx, cy) in zip(points, coords, strict=True):
+        assert cx == pytest.approx(x, abs=1e-4)
+        assert cy == pytest.approx(y, abs=1e-4)
+
+
+# -----------------------------
+# Stockage disque
+# -----------------------------
+@pytest.fixture
+def disk_store(tmp_path, monkeypatch):
+    """Active un stockage disque temporaire pour le serveur."""
+    store = TriangulationStore(str(tmp_path), 10**6)
+    monkeypatch.setattr(triangulator_server, "store", store)
+    return store
+
+
+def test_result_survives_restart(client, disk_store):
+    """Après perte du cache mémoire, le résultat est relu sur disque."""
+    pointset_id = str(uuid.uuid4())
+    first = client.get(f"/triangulation/{pointset_id}")
+    assert len(disk_store) == 1
+    cache.clear()
+    with patch("triangulator_server.triangulate_compact") as mock_tri:
+        second = client.get(f"/triangulation/{pointset_id}")
+        # Remonté dans le cache mémoire : la requête suivante ne lit plus le disque
+        third = client.get(f"/triangulation/{pointset_id}")
+    mock_tri.assert_not_called()
+    assert second.data == third.data == first.data
+    assert disk_store.stats()["hits"] == 1
+
+
+def test_large_result_served_from_store(client, disk_store):
+    """Un grand résultat est écrit sur disque puis envoyé depuis le fichier."""
+    points = [(float(i % 13), float(i // 13)) for i in range(60)]
+    with patch("triangulator_server.fetch_pointset",
+               return_value=encode_pointset(points)), \
+            patch("triangulator_server.STREAM_MIN_POINTS", 50), \
+            patch("triangulator_server.STORE_PROMOTE_MAX_BYTES", 0):
+        first = client.get(f"/triangulation/{uuid.uuid4()}")
+        assert first.is_streamed
+        body = first.get_data()
+        with patch("triangulator_server.triangulate_compact") as mock_tri:
+            second = client.get(f"/triangulation/{uuid.uuid4()}")
+            assert second.get_data() == body
+        mock_tri.assert_not_called()
+    assert len(cache) == 0
+    coords, triangles = decode_triangles(body)
+    assert coords == points
+    assert sorted(triangles) == sorted(triangulate(points))
+
+
+def test_store_write_error_ignored(client, disk_store):
+    """Une erreur d'écriture sur disque n'empêche pas la réponse."""
+    with patch.object(disk_store, "put", side_effect=OSError("disque plein")):
+        rv = client.get(f"/triangulation/{uuid.uuid4()}")
+    assert rv.status_code == 200
+    assert len(disk_store) == 0
+
+
+# -----------------------------
+# Métriques
+# -----------------------------
+def test_server_timing_header(client):
+    """Chaque étape du calcul apparaît dans l'en-tête Server-Timing."""
+    rv = client.get(f"/triangulation/{uuid.uuid4()}")
+    stages = [part.split(";")[0] for part in rv.headers["Server-Timing"].split(", ")]
+    assert stages == [
+        "validate", "cache", "fetch", "decode", "triangulate", "encode", "total"
+    ]
+
+
+def test_metrics_endpoint(client):
+    """/metrics expose latences, tailles, erreurs, cache et requêtes en cours."""
+    stage_count = triangulator_server.stage_seconds.count(stage="triangulate")
+    errors = triangulator_server.errors_total.value(code="INVALID_POINTSET_ID")
+    client.get(f"/triangulation/{uuid.uuid4()}")
+    client.get("/triangulation/invalid-uuid")
+
+    rv = client.get("/metrics")
+    assert rv.status_code == 200
+    assert rv.mimetype == "text/plain"
+    text = rv.get_data(as_text=True)
+    assert "# TYPE triangulator_stage_seconds histogram" in text
+    assert 'triangulator_stage_seconds_count{stage="fetch"}' in text
+    assert "triangulator_points_count" in text
+    assert "triangulator_cache_misses_total 1.0" in text
+    assert "triangulator_requests_in_flight 1.0" in text
+    assert triangulator_server.stage_seconds.count(stage="triangulate") == (
+        stage_count + 1
+    )
+    assert triangulator_server.errors_total.value(code="INVALID_POINTSET_ID") == (
+        errors + 1
+    )
+    assert triangulator_server.requests_in_flight.value() == 0
+
+
+def test_profile_on_debug_header(client, tmp_path, monkeypatch):
+    """L'en-tête de débogage force un profil ; sans lui, un calcul rapide n'en a pas."""
+    monkeypatch.setattr(triangulator_server, "PROFILE_DIR", str(tmp_path))
+    rv = client.get(f"/triangulation/{uuid.uuid4()}")
+    assert "X-Profile" not in rv.headers
+    assert list(tmp_path.iterdir()) == []
+
+    pointset_id = str(uuid.uuid4())
+    rv = client.get(
+        f"/triangulation/{pointset_id}",
+        headers={triangulator_server.PROFILE_HEADER: "1"},
+    )
+    assert rv.status_code == 200
+    name = rv.headers["X-Profile"]
+    report = json.loads((tmp_path / f"{name}.json").read_text())
+    assert report["reason"] == "header"
+    assert report["pointset"] == pointset_id
+    assert report["counters"]["orient2d"] > 0
+    assert (tmp_path / f"{name}.folded").exists()
+
+
+# -----------------------------
+# Ordonnancement par taille
+# -----------------------------
+@pytest.fixture
+def lanes(monkeypatch):
+    """Remplace l'ordonnanceur : petits PointSets en ligne, gros dans un pool."""
+    executor = ThreadPoolExecutor(2)
+    scheduler = Scheduler([
+        Lane("small", 10, slots=4),
+        Lane("large", None, slots=1, max_queue=0, executor=executor),
+    ])
+    monkeypatch.setattr(triangulator_server, "scheduler", scheduler)
+    yield scheduler.lanes
+    executor.shutdown()
+
+
+def sized_payload(n: int) -> bytes:
+    """Renvoie un PointSet binaire de n points sur une grille."""
+    return encode_pointset([(float(i % 7), float(i // 7)) for i in range(n)])
+
+
+def test_large_pointset_uses_its_lane(client, lanes):
+    """Un PointSet au-delà du seuil est triangulé dans la voie lourde."""
+    small, large = lanes
+    payload = sized_payload(30)
+    with patch("triangulator_server.fetch_pointset", return_value=payload):
+        rv = client.get(f"/triangulation/{uuid.uuid4()}")
+    assert rv.status_code == 200
+    coords, triangles = decode_triangles(rv.data)
+    assert len(coords) == 30 and len(triangles) > 0
+    assert large.stats()["completed"] == 1
+    assert small.stats()["completed"] == 0
+
+
+def test_small_request_not_blocked_by_large(client, lanes):
+    """Un petit PointSet est servi pendant qu'un gros occupe sa voie (pleine)."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def fetch(pointSetId, deadline=None):
+        # Deux gros PointSets distincts (UUID avec ou sans tirets) : pas de
+        # résultat partagé par le cache
+        return sized_payload(5 if pointSetId == small_id else 30 + len(pointSetId))
+
+    def triangulate_slowly(points, **options):
+        if len(points) > 10:
+            started.set()
+            release.wait(5)
+        return triangulate_compact(points, **options)
+
+    large_id, small_id = str(uuid.uuid4()), str(uuid.uuid4())
+    statuses = []
+    with patch("triangulator_server.fetch_pointset", side_effect=fetch), \
+            patch("triangulator_server.triangulate_compact",
+                  side_effect=triangulate_slowly):
+        heavy = threading.Thread(
+            target=lambda: statuses.append(
+                app.test_client().get(f"/triangulation/{large_id}").status_code
+            )
+        )
+        heavy.start()
+        started.wait(5)
+        small_rv = client.get(f"/triangulation/{small_id}")
+        busy_rv = client.get("/triangulation/" + uuid.uuid4().hex)
+        release.set()
+        heavy.join()
+    assert small_rv.status_code == 200
+    assert statuses == [200]
+    assert busy_rv.status_code == 503
+    assert busy_rv.get_json()["code"] == "TRIANGULATOR_OVERLOADED"
+
+
+@pytest.fixture
+def process_lanes():
+    """Utilise les pools de processus réels des voies, arrêtés après le test."""
+    yield triangulator_server.scheduler
+    triangulator_server.scheduler.close()
+
+
+def test_pooled_lane_records_measures(client, process_lanes, tmp_path, monkeypatch):
+    """Au-delà de la voie en ligne, étapes, métriques et profils restent relevés."""
+    monkeypatch.setattr(triangulator_server, "PROFILE_DIR", str(tmp_path))
+    n_points = triangulator_server.SMALL_LANE_MAX_POINTS + 1
+    rng = random.Random(7)
+    payload = encode_pointset([(rng.random(), rng.random()) for _ in range(n_points)])
+    pointset_id = str(uuid.uuid4())
+    lane = process_lanes.lane_for(n_points)
+    assert lane.processes
+    points_seen = triangulator_server.points_count.count()
+    triangles_seen = triangulator_server.triangles_count.count()
+
+    with patch("triangulator_server.fetch_pointset", return_value=payload):
+        rv = client.get(
+            f"/triangulation/{pointset_id}",
+            headers={triangulator_server.PROFILE_HEADER: "1"},
+        )
+        assert rv.status_code == 200
+        timing = rv.headers["Server-Timing"]
+        assert "decode;dur=" in timing and "triangulate;dur=" in timing
+        assert triangulator_server.points_count.count() == points_seen + 1
+        assert triangulator_server.triangles_count.count() == triangles_seen + 1
+        assert lane.stats()["completed"] == 1
+        report = json.loads((tmp_path / f"{rv.headers['X-Profile']}.json").read_text())
+        assert report["reason"] == "header"
+        assert report["pointset"] == pointset_id
+        assert report["points"] == n_points
+
+        # Le processus de calcul ne garde rien de la requête précédente
+        cache.clear()
+        rv = client.get(f"/triangulation/{uuid.uuid4()}")
+    assert rv.status_code == 200
+    assert "X-Profile" not in rv.headers
+
+
+# -----------------------------
+# Échéances
+# -----------------------------
+@pytest.mark.parametrize("header", ["0", "-3"])
+def test_expired_deadline_header(client, header):
+    """Une échéance client déjà dépassée donne 504 sans rien mettre en cache."""
+    pointset_id = str(uuid.uuid4())
+    rv = client.get(
+        f"/triangulation/{pointset_id}",
+        headers={triangulator_server.DEADLINE_HEADER: header},
+    )
+    assert rv.status_code == 504
+    assert rv.get_json()["code"] == "DEADLINE_EXCEEDED"
+    assert cache.get_by_id(pointset_id) is None
+
+
+@pytest.mark.parametrize("header", ["bientôt", "nan"])
+def test_invalid_deadline_header(client, header):
+    """Une échéance client illisible donne 400."""
+    rv = client.get(
+        f"/triangulation/{uuid.uuid4()}",
+        headers={triangulator_server.DEADLINE_HEADER: header},
+    )
+    assert rv.status_code == 400
+    assert rv.get_json()["code"] == "INVALID_DEADLINE"
+
+
+def test_request_budget_abandons_computation(client, monkeypatch):
+    """Le budget serveur s'applique sans en-tête ; le calcul suivant repart de zéro."""
+    payload = encode_pointset([(float(i % 7), float(i // 7)) for i in range(49)])
+    pointset_id = str(uuid.uuid4())
+
+    def slow_fetch(pointSetId, deadline=None):
+        threading.Event().wait(0.1)
+        return payload
+
+    monkeypatch.setattr(triangulator_server, "REQUEST_BUDGET", 0.05)
+    with patch("triangulator_server.fetch_pointset", side_effect=slow_fetch):
+        rv = client.get(f"/triangulation/{pointset_id}")
+    assert rv.status_code == 504
+    assert rv.get_json()["code"] == "DEADLINE_EXCEEDED"
+
+    monkeypatch.setattr(triangulator_server, "REQUEST_BUDGET", 30.0)
+    with patch("triangulator_server.fetch_pointset", return_value=payload):
+        rv = client.get(f"/triangulation/{pointset_id}")
+    assert rv.status_code == 200
+
+
+def test_follower_stops_waiting_at_its_deadline(client):
+    """Une requête qui attend un calcul partagé abandonne à sa propre échéance."""
+    pointset_id = str(uuid.uuid4())
+    release = threading.Event()
+
+    def slow_triangulate(points, **options):
+        release.wait(5)
+        return Triangulation.from_lists(points, [(0, 1, 2)])
+
+    statuses = []
+    followers = flights.followers
+    with patch("triangulator_server.triangulate_compact", side_effect=slow_triangulate):
+        leader = threading.Thread(
+            target=lambda: statuses.append(
+                app.test_client().get(f"/triangulation/{pointset_id}").status_code
+            )
+        )
+        leader.start()
+        while flights.in_flight() == 0:
+            threading.Event().wait(0.001)
+        rv = client.get(
+            f"/triangulation/{pointset_id}",
+            headers={triangulator_server.DEADLINE_HEADER: "0.05"},
+        )
+        release.set()
+        leader.join()
+    assert flights.followers == followers + 1
+    assert rv.status_code == 504
+    assert rv.get_json()["code"] == "DEADLINE_EXCEEDED"
+    assert statuses == [200]
+
+
+# -----------------------------
+# Requêtes de localisation
+# -----------------------------
+def test_query_locates_points(client):
+    """Chaque requête reçoit son triangle et son plus proche sommet."""
+    pointset_id = str(uuid.uuid4())
+    points, triangles = decode_triangles(
+        client.get(f"/triangulation/{pointset_id}").data
+    )
+    a, b, c = (points[i] for i in triangles[0])
+    centroid = ((a[0] + b[0] + c[0]) / 3, (a[1] + b[1] + c[1]) / 3)
+    queries = [centroid, points[4], (-100., -100.)]
+
+    rv = client.post(
+        f"/triangulation/{pointset_id}/query", data=encode_pointset(queries)
+    )
+    assert rv.status_code == 200
+    located, nearest = decode_query_results(rv.data)
+    assert located[0] == 0 and located[2] == -1
+    assert 4 in triangles[located[1]]
+    assert nearest[1] == 4
+    assert nearest[2] == min(
+        range(len(points)),
+        key=lambda i: (points[i][0] + 100) ** 2 + (points[i][1] + 100) ** 2,
+    )
+
+
+def test_query_reuses_index(client):
+    """L'index est construit une fois par triangulation en cache."""
+    pointset_id = str(uuid.uuid4())
+    body = encode_pointset([(5., 5.)])
+    with patch("triangulator_server.PointLocator", wraps=PointLocator) as index:
+        for _ in range(2):
+            assert client.post(
+                f"/triangulation/{pointset_id}/query", data=body
+            ).status_code == 200
+    assert index.from_triangulation.call_count == 1
+
+
+@pytest.mark.parametrize("stored", [False, True])
+def test_query_reuses_index_of_large_result(client, tmp_path, monkeypatch, stored):
+    """Un grand résultat (en flux ou sur disque) garde aussi son index."""
+    if stored:
+        monkeypatch.setattr(
+            triangulator_server, "store", TriangulationStore(str(tmp_path), 10**6)
+        )
+    monkeypatch.setattr(triangulator_server, "_locators", OrderedDict())
+    monkeypatch.setattr(triangulator_server, "STREAM_MIN_POINTS", 50)
+    monkeypatch.setattr(triangulator_server, "STORE_PROMOTE_MAX_BYTES", 0)
+    payload = encode_pointset([(float(i % 13), float(i // 13)) for i in range(60)])
+    body = encode_pointset([(5., 2.)])
+    with patch("triangulator_server.fetch_pointset", return_value=payload), \
+            patch("triangulator_server.PointLocator", wraps=PointLocator) as index, \
+            patch("triangulator_server.triangulate_compact",
+                  side_effect=triangulate_compact) as mock_tri:
+        for _ in range(2):
+            assert client.post(
+                f"/triangulation/{uuid.uuid4()}/query", data=body
+            ).status_code == 200
+    assert len(cache) == 0
+    assert index.from_triangulation.call_count == 1
+    assert mock_tri.call_count == 1
+
+
+def test_query_invalid_requests(client):
+    """Identifiant ou corps de requête invalides : 400."""
+    rv = client.post("/triangulation/invalid-uuid/query", data=encode_pointset([]))
+    assert rv.status_code == 400
+    assert rv.get_json()["code"] == "INVALID_POINTSET_ID"
+    rv = client.post(f"/triangulation/{uuid.uuid4()}/query", data=b"\x01\x00")
+    assert rv.status_code == 400
+    assert rv.get_json()["code"] == "INVALID_QUERY_BINARY"
+
+
+# -----------------------------
+# Triangulation par lots
+# -----------------------------
+@pytest.fixture
+def thread_workers():
+    """Remplace le pool de processus des lots par un pool de threads."""
+    with ThreadPoolExecutor(4) as workers, \
+            patch("triangulator_server.batch_workers", workers):
+        yield workers
+
+
+def decode_batch(data):
+    """Renvoie les trames d'un lot indexées par position."""
+    return {index: (status, payload)
+            for index, status, payload in iter_decode_batch(data)}
+
+
+def test_batch_mixed_results(client, thread_workers):
+    """Chaque identifiant reçoit sa trame : succès, 400 ou 404."""
+    ids = [str(uuid.uuid4()), "invalid-uuid", str(uuid.uuid4()), 42]
+    missing = ids[2]
+    original = triangulator_server.fetch_pointset
+
+    def fetch(pointSetId, deadline=None):
+        if pointSetId == missing:
+            raise PointSetManagerError("POINTSET_NOT_FOUND", "absent", 404)
+        return original(pointSetId, deadline)
+
+    with patch("triangulator_server.fetch_pointset", side_effect=fetch):
+        rv = client.post("/triangulations", json=ids)
+        frames = decode_batch(rv.get_data())
+    assert rv.status_code == 200
+    assert sorted(frames) == [0, 1, 2, 3]
+    assert frames[0] == (200, triangulator_server.compute_triangulation(ids[0]))
+    assert frames[1][0] == 400 and frames[3][0] == 400
+    assert frames[2][0] == 404
+    assert json.loads(frames[2][1])["code"] == "POINTSET_NOT_FOUND"
+
+
+def test_batch_completion_order(client, thread_workers):
+    """Un résultat lent n'empêche pas l'envoi des autres trames."""
+    slow_id, fast_id = str(uuid.uuid4()), str(uuid.uuid4())
+    release = threading.Event()
+    original = triangulator_server.fetch_pointset
+
+    def fetch(pointSetId, deadline=None):
+        if pointSetId == slow_id:
+            release.wait(5)
+        return original(pointSetId, deadline)
+
+    with patch("triangulator_server.fetch_pointset", side_effect=fetch):
+        rv = client.post("/triangulations", json=[slow_id, fast_id])
+        chunks = iter(rv.response)
+        first = next(chunks)
+        release.set()
+        rest = b"".join(chunks)
+    assert [index for index, _, _ in iter_decode_batch(first)] == [1]
+    assert [index for index, _, _ in iter_decode_batch(rest)] == [0]
+
+
+def test_batch_deduplicates_ids(client, thread_workers):
+    """Un identifiant répété dans le lot n'est triangulé qu'une fois."""
+    pointset_id = str(uuid.uuid4())
+    with patch("triangulator_server.triangulate_compact",
+               side_effect=triangulate_compact) as mock_tri:
+        rv = client.post("/triangulations", json=[pointset_id] * 6)
+        frames = list(iter_decode_batch(rv.get_data()))
+    assert len(frames) == 6
+    assert len({payload for _, _, payload in frames}) == 1
+    assert mock_tri.call_count == 1
+
+
+@pytest.mark.parametrize("body", ["pas du json", {"ids": []}])
+def test_batch_invalid_body(client, body):
+    """Un corps qui n'est pas une liste JSON donne 400."""
+    if isinstance(body, str):
+        rv = client.post("/triangulations", data=body)
+    else:
+        rv = client.post("/triangulations", json=body)
+    assert rv.status_code == 400
+    assert rv.get_json()["code"] == "INVALID_BATCH"
+
+
+def test_batch_too_large(client):
+    """Un lot au-delà de `BATCH_MAX_IDS` identifiants donne 400."""
+    with patch("triangulator_server.BATCH_MAX_IDS", 2):
+        rv = client.post("/triangulations", json=[str(uuid.uuid4())] * 3)
+    assert rv.status_code == 400
+    assert rv.get_json()["code"] == "BATCH_TOO_LARGE"
+
+
+def test_batch_process_pool(client):
+    """Les lots sont triangulés dans le pool de processus par défaut."""
+    ids = [str(uuid.uuid4()) for _ in range(4)]
+    rv = client.post("/triangulations", json=ids)
+    frames = decode_batch(rv.get_data())
+    for index, pointset_id in enumerate(ids):
+        cache.clear()
+        assert frames[index] == (
+            200, triangulator_server.compute_triangulation(pointset_id)
+        )
+
+
+@pytest.fixture
+def one_fetcher():
+    """Réduit le pool de récupération des lots à un seul thread."""
+    with ThreadPoolExecutor(1) as fetchers, \
+            patch("triangulator_server.batch_fetchers", fetchers):
+        yield fetchers
+
+
+def test_batch_computes_beyond_fetch_threads(client, thread_workers, one_fetcher):
+    """Les calculs d'un lot n'occupent pas les threads de récupération."""
+    together = threading.Barrier(3, timeout=5)
+
+    def triangulate_together(points, **options):
+        together.wait()
+        return triangulate_compact(points, **options)
+
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    with patch("triangulator_server.triangulate_compact",
+               side_effect=triangulate_together):
+        frames = decode_batch(client.post("/triangulations", json=ids).get_data())
+    assert [frames[index][0] for index in range(3)] == [200] * 3
+
+
+def test_batch_budget_per_item(client, monkeypatch, one_fetcher):
+    """Le budget s'applique à chaque élément, pas au lot entier."""
+    monkeypatch.setattr(triangulator_server, "REQUEST_BUDGET", 0.2)
+
+    def slow_triangulate(points, **options):
+        threading.Event().wait(0.1)
+        return triangulate_compact(points, **options)
+
+    ids = [str(uuid.uuid4()) for _ in range(4)]
+    with ThreadPoolExecutor(1) as workers, \
+            patch("triangulator_server.batch_workers", workers), \
+            patch("triangulator_server.triangulate_compact",
+                  side_effect=slow_triangulate):
+        frames = decode_batch(client.post("/triangulations", json=ids).get_data())
+    assert [frames[index][0] for index in range(4)] == [200] * 4
+
+
+def test_batch_unexpected_error_frame(client, thread_workers):
+    """Une erreur inattendue d'un élément donne une trame 500 ; le flux continue."""
+    broken = str(uuid.uuid4())
+    original = triangulator_server.batch_triangulate
+    payloads = {}
+
+    def triangulate_or_break(binary_data, *args):
+        if binary_data == payloads[broken]:
+            raise RuntimeError("pool de calcul cassé")
+        return original(binary_data, *args)
+
+    ids = [broken, str(uuid.uuid4())]
+    payloads[broken] = triangulator_server.fetch_pointset(broken)
+    with patch("triangulator_server.batch_triangulate",
+               side_effect=triangulate_or_break):
+        frames = decode_batch(client.post("/triangulations", json=ids).get_data())
+    assert frames[0][0] == 500
+    assert json.loads(frames[0][1])["code"] == "TRIANGULATION_FAILED"
+    assert frames[1][0] == 200
+
+
+def test_batch_disconnect_cancels_pending(client, thread_workers, one_fetcher):
+    """Quand le client se déconnecte, les éléments non commencés sont annulés."""
+    release = threading.Event()
+    fetched = []
+    original = triangulator_server.fetch_pointset
+
+    def slow_fetch(pointSetId, deadline=None):
+        fetched.append(pointSetId)
+        release.wait(5)
+        return original(pointSetId, deadline)
+
+    ids = ["invalid-uuid"] + [str(uuid.uuid4()) for _ in range(3)]
+    with patch("triangulator_server.fetch_pointset", side_effect=slow_fetch):
+        rv = client.post("/triangulations", json=ids)
+        first = next(iter(rv.response))
+        rv.close()
+        release.set()
+        one_fetcher.shutdown(wait=True)
+    assert [index for index, _, _ in iter_decode_batch(first)] == [0]
+    assert fetched == ids[1:2]
+
+
+# -----------------------------
+# PointSetManager HTTP réel
+# -----------------------------
+@pytest.fixture
+def pointset_manager():
+    """Branche le serveur sur un PointSetManager local via le client HTTP."""
+    with PointSetManagerStub() as stub:
+        client = PointSetManagerClient(stub.url, backoff=0.0)
+        with patch("triangulator_server.pointset_client", client):
+            yield stub
+        client.close()
+
+
+def test_http_pointset_manager_success(client, pointset_manager):
+    """Un PointSet servi en HTTP est triangulé."""
+    pointset_id = pointset_manager.add(
+        encode_pointset([(0., 0.), (1., 0.), (0., 1.)])
+    )
+    rv = client.get(f"/triangulation/{pointset_id}")
+    assert rv.status_code == 200
+    assert rv.data[-16:-12] == (1).to_bytes(4, "little")
+
+
+def test_http_pointset_manager_not_found(client, pointset_manager):
+    """Un PointSet inconnu du PointSetManager donne 404."""
+    rv = client.get(f"/triangulation/{uuid.uuid4()}")
+    assert rv.status_code == 404
+    assert rv.get_json()["code"] == "POINTSET_NOT_FOUND"
+
+
+def test_http_pointset_manager_unavailable(client, pointset_manager):
+    """Un PointSetManager en panne donne 503."""
+    pointset_id = pointset_manager.add(encode_pointset([(0., 0.)]))
+    pointset_manager.fail_next = 100
+    rv = client.get(f"/triangulation/{pointset_id}")
+    assert rv.status_code == 503
+    assert rv.get_json()["code"] == "POINTSET_MANAGER_ERROR"
+
+
+def test_http_pointset_manager_deadline(client, pointset_manager):
+    """La récupération du PointSet s'arrête à l'échéance de la requête (504)."""
+    pointset_id = pointset_manager.add(
+        encode_pointset([(0., 0.), (1., 0.), (0., 1.)])
+    )
+    pointset_manager.latency = 1.0
+    rv = client.get(
+        f"/triangulation/{pointset_id}",
+        headers={triangulator_server.DEADLINE_HEADER: "0.1"},
+    )
+    assert rv.status_code == 504
+    assert rv.get_json()["code"] == "DEADLINE_EXCEEDED"
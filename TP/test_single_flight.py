@@ -0,0 +1,166 @@
+"""Tests unitaires pour la déduplication des calculs concurrents."""
+
+import threading
+
+import pytest
+from single_flight import SingleFlight, fcntl
+
+
+def run_concurrently(flight, key, fn, n):
+    """Lance n appels concurrents et renvoie leurs résultats ou exceptions."""
+    results = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = flight.do(key, fn)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results
+
+
+def gated(release, value=b"ok", calls=None):
+    """Renvoie un calcul bloqué jusqu'à `release`, qui compte ses appels."""
+    def fn():
+        if calls is not None:
+            calls.append(1)
+        release.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return fn
+
+
+def wait_followers(flight, n):
+    """Attend que n suiveurs soient en attente du meneur."""
+    for _ in range(500):
+        if flight.followers >= n:
+            return
+        threading.Event().wait(0.01)
+
+
+def test_concurrent_calls_share_one_execution():
+    """Un seul calcul pour plusieurs appels concurrents sur la même clé."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    threads, results = run_concurrently(flight, "k", gated(release, calls=calls), 8)
+    wait_followers(flight, 7)
+    release.set()
+    for t in threads:
+        t.join()
+    assert calls == [1]
+    assert results == [b"ok"] * 8
+    assert flight.leaders == 1
+    assert flight.in_flight() == 0
+
+
+def test_error_is_shared():
+    """Les suiveurs reçoivent l'exception du meneur."""
+    flight = SingleFlight()
+    release = threading.Event()
+    threads, results = run_concurrently(
+        flight, "k", gated(release, ValueError("échec")), 4
+    )
+    wait_followers(flight, 3)
+    release.set()
+    for t in threads:
+        t.join()
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_follower_timeout():
+    """Un suiveur abandonne après `timeout` ; le meneur termine son calcul."""
+    flight = SingleFlight()
+    release = threading.Event()
+    threads, results = run_concurrently(flight, "k", gated(release), 1)
+    while flight.in_flight() == 0:
+        threading.Event().wait(0.001)
+    with pytest.raises(TimeoutError):
+        flight.do("k", lambda: b"autre", timeout=0.01)
+    release.set()
+    threads[0].join()
+    assert results == [b"ok"]
+
+
+def test_sequential_calls_recompute():
+    """Une fois le calcul terminé, un nouvel appel recalcule."""
+    flight = SingleFlight()
+    calls = []
+    assert flight.do("k", lambda: calls.append(1) or b"a") == b"a"
+    assert flight.do("k", lambda: calls.append(1) or b"b") == b"b"
+    assert len(calls) == 2
+
+
+def test_distinct_keys_are_independent():
+    """Deux clés différentes ne s'attendent pas."""
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.followers == 0
+
+
+@pytest.mark.skipif(fcntl is None, reason="verrous POSIX requis")
+def test_lock_dir_shares_result_between_instances(tmp_path):
+    """Deux groupes (deux processus) sur un même répertoire partagent le calcul."""
+    first = SingleFlight(str(tmp_path))
+    second = SingleFlight(str(tmp_path))
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def leader_fn():
+        started.set()
+        return gated(release, b"resultat", calls)()
+
+    t1, r1 = run_concurrently(first, "k", leader_fn, 1)
+    started.wait(5)
+    t2, r2 = run_concurrently(second, "k", gated(release, b"autre", calls), 1)
+    threading.Event().wait(0.05)
+    release.set()
+    for t in t1 + t2:
+        t.join()
+    assert r1 == r2 == [b"resultat"]
+    assert calls == [1]
+
+
+@pytest.mark.skipif(fcntl is None, reason="verrous POSIX requis")
+def test_lock_dir_does_not_publish_other_results(tmp_path):
+    """Un résultat autre que des `bytes` n'est pas publié : l'attente recalcule."""
+    first = SingleFlight(str(tmp_path))
+    second = SingleFlight(str(tmp_path))
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def leader_fn():
+        started.set()
+        return gated(release, ([(0., 0.)], [(0, 1, 2)]), calls)()
+
+    t1, r1 = run_concurrently(first, "k", leader_fn, 1)
+    started.wait(5)
+    t2, r2 = run_concurrently(second, "k", gated(release, ([], []), calls), 1)
+    threading.Event().wait(0.05)
+    release.set()
+    for t in t1 + t2:
+        t.join()
+    assert r1 == [([(0., 0.)], [(0, 1, 2)])]
+    assert r2 == [([], [])]
+    assert calls == [1, 1]
+    assert not list(tmp_path.glob("*.bin"))
+
+
+@pytest.mark.skipif(fcntl is None, reason="verrous POSIX requis")
+def test_lock_dir_expires_results(tmp_path):
+    """Les résultats publiés et leurs verrous sont supprimés après `result_ttl`."""
+    flight = SingleFlight(str(tmp_path), result_ttl=0.05)
+    assert flight.do("k", lambda: b"ancien") == b"ancien"
+    assert len(list(tmp_path.iterdir())) == 2
+    threading.Event().wait(0.1)
+    assert flight.do("j", lambda: b"nouveau") == b"nouveau"
+    # Seuls le verrou et le résultat de "j" restent
+    assert len(list(tmp_path.iterdir())) == 2
+    assert flight.do("k", lambda: b"recalcul") == b"recalcul"
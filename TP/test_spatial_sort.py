@@ -0,0 +1,65 @@
+"""Tests unitaires pour les ordres d'insertion spatiaux."""
+
+import random
+
+import pytest
+from mesh import incremental
+from spatial_sort import BRIO_MIN_ROUND, brio_order, hilbert_keys, hilbert_order
+
+
+def random_pointset(n, seed):
+    """Renvoie n points aléatoires reproductibles."""
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(n)]
+
+
+def test_hilbert_keys_empty():
+    """Aucun point, aucune clé."""
+    assert hilbert_keys([]) == []
+
+
+def test_hilbert_keys_first_order_curve():
+    """Sur une grille 2x2, la courbe visite (0,0), (0,1), (1,1), (1,0)."""
+    points = [(0., 0.), (1., 0.), (0., 1.), (1., 1.)]
+    assert hilbert_keys(points, bits=1) == [0, 3, 1, 2]
+
+
+def test_hilbert_keys_single_point():
+    """Une boîte englobante réduite à un point ne divise pas par zéro."""
+    assert hilbert_keys([(3., 3.), (3., 3.)]) == [0, 0]
+
+
+def test_hilbert_order_is_local():
+    """Deux points consécutifs de l'ordre sont voisins sur la grille."""
+    points = [(float(x), float(y)) for x in range(8) for y in range(8)]
+    order = hilbert_order(points, bits=3)
+    for i, j in zip(order, order[1:], strict=False):
+        (x1, y1), (x2, y2) = points[i], points[j]
+        assert abs(x1 - x2) + abs(y1 - y2) == 1
+
+
+@pytest.mark.parametrize("n", [0, 10, BRIO_MIN_ROUND * 5 + 3])
+def test_brio_order_is_permutation(n):
+    """BRIO renvoie une permutation des indices."""
+    assert sorted(brio_order(random_pointset(n, 0))) == list(range(n))
+
+
+def test_brio_order_is_reproducible():
+    """Une même graine donne le même ordre."""
+    points = random_pointset(500, 1)
+    assert brio_order(points, seed=7) == brio_order(points, seed=7)
+    assert brio_order(points, seed=7) != brio_order(points, seed=8)
+
+
+@pytest.mark.parametrize("ordering", ["input", "hilbert", "brio"])
+def test_incremental_orderings_agree(ordering):
+    """L'ordre d'insertion ne change pas la triangulation ni ses indices."""
+    points = random_pointset(300, 2)
+    expected = set(incremental(points, ordering="input"))
+    assert set(incremental(points, ordering=ordering)) == expected
+
+
+def test_incremental_unknown_ordering():
+    """Un ordre inconnu lève ValueError."""
+    with pytest.raises(ValueError):
+        incremental(random_pointset(5, 0), ordering="zigzag")
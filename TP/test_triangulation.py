@@ -1,7 +1,16 @@
 """Tests unitaires pour la fonction triangulate et _circumcircle_contains."""
 
+import random
+from unittest.mock import patch
+
+import divide_conquer
 import pytest
-from Triangulator import _circumcircle_contains, triangulate
+from Triangulator import (
+    ENGINES,
+    _circumcircle_contains,
+    triangulate,
+    triangulate_compact,
+)
 
 
 def test_triangulate_empty():
@@ -35,7 +44,7 @@ def test_triangulate_square():
 
     valid = [
         {(0, 1, 2), (0, 2, 3)},
-        {(1, 2, 3), (1, 3, 0)},
+        {(1, 2, 3), (0, 1, 3)},
     ]
     result = {tuple(sorted(t)) for t in triangles}
     assert result in valid
@@ -109,3 +118,120 @@ def test_triangulate_invalid_point_type():
     points = [(0, 0), (1, "x"), (0, 1)]
     with pytest.raises(TypeError):
         triangulate(points)
+
+
+# -------------------- Moteurs de triangulation --------------------
+
+FIXTURES = [
+    [(0., 0.), (1., 0.), (0., 1.)],
+    [(0., 0.), (2., 0.), (3., 1.), (1.5, 2.), (0., 1.)],
+    [(0., 0.), (1., 0.), (2., 0.), (3., 0.)],
+    [(0., 0.), (4., 0.), (2., 3.), (2., 1.), (1., .5), (3., .4)],
+]
+
+
+def _is_delaunay(points, triangles):
+    """Vérifie la propriété du cercle vide pour chaque triangle."""
+    for t in triangles:
+        a, b, c = (points[j] for j in t)
+        for i, p in enumerate(points):
+            if i not in t and _circumcircle_contains(p, a, b, c):
+                return False
+    return True
+
+
+def random_pointset(n, seed):
+    """Renvoie n points aléatoires reproductibles."""
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("engine", ["divide_conquer", "incremental"])
+@pytest.mark.parametrize("points", FIXTURES)
+def test_engines_match_reference(points, engine):
+    """Les moteurs rapides reproduisent la référence Bowyer-Watson."""
+    expected = set(triangulate(points, engine="bowyer_watson"))
+    assert set(triangulate(points, engine=engine)) == expected
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_engine_square_is_valid(engine):
+    """Chaque moteur choisit l'une des deux diagonales valides du carré."""
+    points = [(0., 0.), (1., 0.), (1., 1.), (0., 1.)]
+    triangles = triangulate(points, engine=engine)
+    assert len(triangles) == 2
+    assert _is_delaunay(points, triangles)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_divide_conquer_random_is_delaunay(seed):
+    """Le moteur diviser-pour-régner respecte le cercle vide et Euler."""
+    points = random_pointset(60, seed)
+    triangles = triangulate(points, engine="divide_conquer")
+    assert _is_delaunay(points, triangles)
+    # La référence perd parfois des triangles d'enveloppe (super-triangle fini)
+    assert set(triangulate(points, engine="bowyer_watson")) <= set(triangles)
+
+
+def test_divide_conquer_duplicates():
+    """Les doublons exacts ne produisent pas de triangles dégénérés."""
+    points = [(0., 0.), (1., 0.), (0., 1.), (1., 0.), (0., 0.)]
+    triangles = triangulate(points, engine="divide_conquer")
+    assert triangles == [(0, 1, 2)]
+
+
+def test_triangulate_unknown_engine():
+    """Un moteur inconnu lève ValueError."""
+    with pytest.raises(ValueError):
+        triangulate([(0., 0.), (1., 0.), (0., 1.)], engine="inconnu")
+
+
+@pytest.mark.parametrize("engine", ["divide_conquer", "incremental"])
+def test_engine_shifted_grid(engine):
+    """Une grille loin de l'origine (cocyclicités partout) reste correcte."""
+    points = [(1e6 + i * .1, 1e6 + j * .1) for i in range(6) for j in range(6)]
+    random.Random(0).shuffle(points)
+    triangles = triangulate(points, engine=engine)
+    # Euler : 2n - 2 - h triangles, avec h = 20 sommets sur l'enveloppe
+    assert len(triangles) == 2 * 36 - 2 - 20
+
+
+# -------------------- Diviser-pour-régner parallèle --------------------
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Abaisse la taille minimale des bandes pour paralléliser de petits jeux."""
+    monkeypatch.setattr(divide_conquer, "PARALLEL_MIN_BLOCK", 4)
+
+
+@pytest.mark.parametrize("workers", [2, 3, 5])
+def test_parallel_matches_sequential(small_blocks, workers):
+    """Les bandes fusionnées donnent la même triangulation qu'un seul processus."""
+    points = random_pointset(400, workers)
+    expected = set(triangulate(points))
+    assert set(triangulate(points, workers=workers)) == expected
+    flat = triangulate_compact(points, workers=workers).triangles
+    assert set(flat) == expected
+
+
+def test_parallel_degenerate_inputs(small_blocks):
+    """Points alignés, doublons et grille restent corrects en parallèle."""
+    assert triangulate([(float(i), 2. * i) for i in range(40)], workers=4) == []
+
+    points = random_pointset(50, 7)
+    duplicated = points + points[:10]
+    assert set(triangulate(duplicated, workers=3)) == set(triangulate(points))
+
+    grid = [(1e6 + i * .1, 1e6 + j * .1) for i in range(8) for j in range(8)]
+    random.Random(0).shuffle(grid)
+    # Euler : 2n - 2 - h triangles, avec h = 28 sommets sur l'enveloppe
+    assert len(triangulate(grid, workers=4)) == 2 * 64 - 2 - 28
+
+
+def test_parallel_small_input_stays_sequential():
+    """Sous la taille minimale de bande, aucun processus n'est lancé."""
+    with patch("divide_conquer.ProcessPoolExecutor") as pool:
+        triangles = triangulate(random_pointset(100, 0), workers=None)
+    pool.assert_not_called()
+    assert len(triangles) > 0
@@ -0,0 +1,100 @@
+"""Tests unitaires pour le cache LRU des triangulations."""
+
+from triangulation_cache import TriangulationCache, payload_key
+
+
+class FakeClock:
+    """Horloge manuelle pour tester l'expiration."""
+
+    def __init__(self):
+        """Démarre l'horloge à zéro."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Renvoie l'instant courant."""
+        return self.now
+
+
+def test_payload_key_depends_on_content():
+    """Deux contenus identiques ont la même empreinte, pas deux différents."""
+    assert payload_key(b"abc") == payload_key(b"abc")
+    assert payload_key(b"abc") != payload_key(b"abd")
+
+
+def test_get_after_put():
+    """Une réponse enregistrée est retrouvée par empreinte et par identifiant."""
+    cache = TriangulationCache(100)
+    cache.put("k", b"data", pointset_id="id-1")
+    assert cache.get("k") == b"data"
+    assert cache.get_by_id("id-1") == b"data"
+    assert cache.stats()["hits"] == 2
+
+
+def test_miss_counts():
+    """Un défaut par empreinte est compté, pas un défaut par identifiant."""
+    cache = TriangulationCache(100)
+    assert cache.get_by_id("inconnu") is None
+    assert cache.get("inconnu") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_get_indexes_pointset_id():
+    """Un succès par contenu rend l'identifiant directement accessible."""
+    cache = TriangulationCache(100)
+    cache.put("k", b"data", pointset_id="id-1")
+    assert cache.get("k", pointset_id="id-2") == b"data"
+    assert cache.get_by_id("id-2") == b"data"
+
+
+def test_lru_eviction_by_size():
+    """Le budget en octets évince l'entrée la moins récemment utilisée."""
+    cache = TriangulationCache(10)
+    cache.put("a", b"aaaa", pointset_id="id-a")
+    cache.put("b", b"bbbb")
+    cache.get("a")
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 8
+
+
+def test_evicted_entry_drops_ids():
+    """L'éviction d'une entrée retire aussi les identifiants qui y mènent."""
+    cache = TriangulationCache(4)
+    cache.put("a", b"aaaa", pointset_id="id-a")
+    cache.put("b", b"bbbb")
+    assert cache.get_by_id("id-a") is None
+
+
+def test_oversized_entry_is_not_cached():
+    """Une réponse plus grande que le budget n'est pas conservée."""
+    cache = TriangulationCache(3)
+    cache.put("a", b"aaaa")
+    assert len(cache) == 0
+
+
+def test_ttl_expiration():
+    """Une entrée expirée n'est plus servie."""
+    clock = FakeClock()
+    cache = TriangulationCache(100, ttl=5.0, clock=clock)
+    cache.put("k", b"data", pointset_id="id")
+    clock.now = 4.0
+    assert cache.get_by_id("id") == b"data"
+    clock.now = 5.0
+    assert cache.get_by_id("id") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_clear():
+    """Vider le cache remet aussi les compteurs à zéro."""
+    cache = TriangulationCache(100)
+    cache.put("k", b"data")
+    cache.get("k")
+    cache.clear()
+    assert cache.stats() == {
+        "entries": 0, "bytes": 0, "hits": 0,
+        "misses": 0, "evictions": 0, "expirations": 0,
+    }
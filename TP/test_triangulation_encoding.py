@@ -1,9 +1,25 @@
 """Tests unitaires pour encode_triangles et decode_triangles."""
 
+import random
 import struct
+from array import array
 
 import pytest
-from encoding import decode_triangles, encode_triangles
+from encoding import (
+    apply_triangles_delta,
+    decode_query_results,
+    decode_triangles,
+    decode_triangles_array,
+    decode_triangles_compact,
+    encode_batch_frame,
+    encode_query_results,
+    encode_triangles,
+    encode_triangles_array,
+    encode_triangles_compact,
+    encode_triangles_delta,
+    iter_decode_batch,
+    iter_encode_triangles,
+)
 
 
 def test_encode_triangles_empty():
@@ -127,3 +143,204 @@ def test_triangles_round_trip_multiple():
     decoded_pts, decoded_tri = decode_triangles(encoded)
     assert decoded_pts == pts
     assert decoded_tri == tri
+
+
+# -------------------- Tampons plats --------------------
+
+
+def test_encode_triangles_array_matches_tuples():
+    """L'encodage de tampons plats produit le même binaire que les tuples."""
+    pts = [(0., 0.), (1., 0.), (0., 1.), (1., 1.)]
+    tri = [(0, 1, 2), (1, 3, 2)]
+    coords = array("f", [c for p in pts for c in p])
+    indices = array("I", [i for t in tri for i in t])
+    assert encode_triangles_array(coords, indices) == encode_triangles(pts, tri)
+
+
+def test_encode_triangles_array_invalid_index():
+    """Un indice hors limites est détecté par la vérification globale."""
+    coords = array("f", [0., 0., 1., 0., 0., 1.])
+    with pytest.raises(ValueError):
+        encode_triangles_array(coords, array("I", [0, 1, 3]))
+
+
+def test_encode_triangles_array_incomplete_triangle():
+    """Un nombre d'indices non multiple de trois lève ValueError."""
+    coords = array("f", [0., 0., 1., 0., 0., 1.])
+    with pytest.raises(ValueError):
+        encode_triangles_array(coords, array("I", [0, 1]))
+
+
+def test_decode_triangles_array_views():
+    """Le décodage renvoie deux vues typées sur les données."""
+    data = struct.pack("<IffffffIIII", 3, 0., 0., 1., 0., 0., 1., 1, 0, 1, 2)
+    coords, indices = decode_triangles_array(data)
+    assert coords.tolist() == [0., 0., 1., 0., 0., 1.]
+    assert indices.format == "I"
+    assert indices.tolist() == [0, 1, 2]
+
+
+def test_decode_triangles_array_without_triangle_block():
+    """Sans bloc de triangles, la vue d'indices est vide."""
+    coords, indices = decode_triangles_array(struct.pack("<Iff", 1, 1., 2.))
+    assert coords.tolist() == [1., 2.]
+    assert len(indices) == 0
+
+
+@pytest.mark.parametrize("data", [
+    b"\x01\x00\x00",
+    struct.pack("<IffI", 10, 1., 2., 0),
+    struct.pack("<IffffffI", 3, 0., 0., 1., 0., 0., 1., 2),
+    struct.pack("<IffffffIIII", 3, 0., 0., 1., 0., 0., 1., 1, 0, 1, 5),
+])
+def test_decode_triangles_array_invalid(data):
+    """Les mêmes données invalides que pour les tuples lèvent ValueError."""
+    with pytest.raises(ValueError):
+        decode_triangles_array(data)
+
+
+# -------------------- Encodage en flux --------------------
+
+
+@pytest.mark.parametrize("chunk_size", [12, 16, 40, 64 * 1024])
+@pytest.mark.parametrize("n_points", [0, 1, 7, 50])
+def test_iter_encode_triangles_matches_encode(n_points, chunk_size):
+    """Les morceaux concaténés donnent le binaire de `encode_triangles`."""
+    pts = [(float(i), float(i * i % 7)) for i in range(n_points)]
+    tri = [(i, i + 1, i + 2) for i in range(max(0, n_points - 2))]
+    chunks = list(iter_encode_triangles(pts, tri, chunk_size=chunk_size))
+    assert b"".join(chunks) == encode_triangles(pts, tri)
+    assert all(len(chunk) <= max(chunk_size, 4) for chunk in chunks)
+
+
+def test_iter_encode_triangles_validates_before_streaming():
+    """Les données invalides sont refusées avant le premier morceau."""
+    pts = [(0., 0.), (1., 0.), (0., 1.)]
+    with pytest.raises(ValueError):
+        iter_encode_triangles(pts, [(0, 1, 3)])
+    with pytest.raises(TypeError):
+        iter_encode_triangles([(0., "a")], [])
+    with pytest.raises(ValueError):
+        iter_encode_triangles(pts, [], chunk_size=8)
+
+
+# -------------------- Trames de lots --------------------
+
+
+def test_batch_frames_round_trip():
+    """Des trames concaténées se relisent dans l'ordre du flux."""
+    payload = encode_triangles([(0., 0.), (1., 0.), (0., 1.)], [(0, 1, 2)])
+    data = encode_batch_frame(2, 200, payload) + encode_batch_frame(0, 404, b"{}")
+    assert list(iter_decode_batch(data)) == [(2, 200, payload), (0, 404, b"{}")]
+    assert list(iter_decode_batch(b"")) == []
+
+
+@pytest.mark.parametrize("data", [
+    b"\x00\x00\x00",
+    encode_batch_frame(0, 200, b"abcd")[:-1],
+])
+def test_iter_decode_batch_truncated(data):
+    """Une trame tronquée lève ValueError."""
+    with pytest.raises(ValueError):
+        list(iter_decode_batch(data))
+
+
+def test_query_results_round_trip():
+    """Triangles (dont -1 hors enveloppe) et sommets se relisent tels quels."""
+    data = encode_query_results(array("i", [3, -1, 0]), array("i", [7, 2, 0]))
+    assert len(data) == 4 + 3 * 8
+    located, nearest = decode_query_results(data)
+    assert list(located) == [3, -1, 0] and list(nearest) == [7, 2, 0]
+    with pytest.raises(ValueError):
+        decode_query_results(data[:-1])
+    with pytest.raises(ValueError):
+        encode_query_results(array("i", [1]), array("i"))
+
+
+# -------------------- Deltas de triangulation --------------------
+
+
+def test_triangles_delta_round_trip():
+    """Base + delta redonne la nouvelle triangulation (mêmes triangles)."""
+    base_pts = [(0., 0.), (1., 0.), (0., 1.), (1., 1.)]
+    base_tris = [(0, 1, 2), (1, 3, 2)]
+    pts = [(0., 0.), (1., 0.), (0., 1.), (1., 1.5), (2., 0.)]
+    tris = [(2, 0, 1), (1, 3, 2), (1, 4, 3)]
+    delta = encode_triangles_delta(base_pts, base_tris, pts, tris)
+    # 1 sommet modifié + 1 nouveau, aucun triangle retiré, 1 ajouté
+    assert len(delta) == 8 + 2 * 12 + 4 + 4 + 12
+    new_pts, new_tris = decode_triangles(
+        apply_triangles_delta(encode_triangles(base_pts, base_tris), delta)
+    )
+    assert new_pts == pts
+    assert new_tris == [(0, 1, 2), (1, 3, 2), (1, 4, 3)]
+
+
+def test_triangles_delta_removal_and_shrink():
+    """Les triangles retirés et les points en moins sont appliqués."""
+    base_pts = [(0., 0.), (1., 0.), (0., 1.), (1., 1.)]
+    base_tris = [(0, 1, 2), (1, 3, 2)]
+    delta = encode_triangles_delta(base_pts, base_tris, base_pts[:3], [(0, 1, 2)])
+    assert decode_triangles(
+        apply_triangles_delta(encode_triangles(base_pts, base_tris), delta)
+    ) == (base_pts[:3], [(0, 1, 2)])
+
+
+def test_triangles_delta_invalid():
+    """Un indice hors limites ou un delta tronqué lève ValueError."""
+    pts = [(0., 0.), (1., 0.), (0., 1.)]
+    with pytest.raises(ValueError):
+        encode_triangles_delta(pts, [], pts, [(0, 1, 3)])
+    base = encode_triangles(pts, [(0, 1, 2)])
+    delta = encode_triangles_delta(pts, [(0, 1, 2)], pts, [])
+    with pytest.raises(ValueError):
+        apply_triangles_delta(base, delta[:-1])
+
+
+# -------------------- Format compact --------------------
+
+
+def test_compact_round_trip():
+    """Indices et orientations conservés, coordonnées à un demi-pas près."""
+    rng = random.Random(0)
+    points = [(rng.uniform(-5, 5), rng.uniform(0, 2)) for _ in range(300)]
+    triangles = [tuple(rng.sample(range(300), 3)) for _ in range(500)]
+    for bits in (8, 20, 32):
+        decoded_pts, decoded_tris = decode_triangles_compact(
+            encode_triangles_compact(points, triangles, bits=bits)
+        )
+        step = max(10 / ((1 << bits) - 1), 2 / ((1 << bits) - 1))
+        for (x, y), (dx, dy) in zip(points, decoded_pts, strict=True):
+            assert abs(x - dx) <= step / 2 + 1e-12
+            assert abs(y - dy) <= step / 2 + 1e-12
+        assert sorted(map(rotate_min_first, decoded_tris)) == sorted(
+            map(rotate_min_first, triangles)
+        )
+
+
+def rotate_min_first(t):
+    """Renvoie le triangle tourné pour commencer par son plus petit indice."""
+    k = t.index(min(t))
+    return t[k:] + t[:k]
+
+
+@pytest.mark.parametrize("points", [[], [(1., 1.)], [(1., 2.), (1., 5.)]])
+def test_compact_degenerate_boxes(points):
+    """Ensemble vide, point unique et boîte plate se décodent exactement."""
+    assert decode_triangles_compact(encode_triangles_compact(points, [])) == (
+        points, []
+    )
+
+
+def test_compact_invalid():
+    """Indice hors limites, signature absente ou flux tronqué lèvent ValueError."""
+    pts = [(0., 0.), (1., 0.), (0., 1.)]
+    with pytest.raises(ValueError):
+        encode_triangles_compact(pts, [(0, 1, 3)])
+    with pytest.raises(ValueError):
+        encode_triangles_compact(pts, [], bits=0)
+    data = encode_triangles_compact(pts, [(0, 1, 2)])
+    with pytest.raises(ValueError):
+        decode_triangles_compact(encode_triangles(pts, [(0, 1, 2)]))
+    with pytest.raises(ValueError):
+        decode_triangles_compact(data[:-3])
@@ -0,0 +1,88 @@
+"""Tests unitaires pour le résultat compact `Triangulation`."""
+
+import pickle
+from array import array
+
+import pytest
+from encoding import encode_triangles
+from triangulation_result import Triangulation
+from Triangulator import ENGINES, triangulate, triangulate_compact
+
+POINTS = [(0., 0.), (1., 0.), (1., 1.), (0., 1.), (.5, .25)]
+
+
+def test_triangulate_compact_matches_lists():
+    """Le résultat compact contient les mêmes points et triangles."""
+    result = triangulate_compact(POINTS)
+    assert result.n_points == len(POINTS)
+    assert len(result) == len(triangulate(POINTS))
+    assert result.points == POINTS
+    assert result.triangles == triangulate(POINTS)
+    assert result.coords.typecode == "f"
+    assert result.indices.typecode == "I"
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_engines_emit_flat_indices(engine):
+    """Chaque moteur écrit directement ses indices dans un tableau 'I' plat."""
+    points = POINTS + [(0., 0.), (.5, .75)]
+    expected = triangulate(points, engine=engine)
+    result = triangulate_compact(points, engine=engine)
+    assert isinstance(result.indices, array)
+    assert result.indices.typecode == "I"
+    assert result.triangles == expected
+    assert isinstance(triangulate_compact(POINTS[:2]).indices, array)
+
+
+def test_triangulation_is_picklable():
+    """Un résultat compact revient d'un processus de calcul en deux tableaux."""
+    result = triangulate_compact(POINTS)
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_triangulation_encode_matches_encode_triangles():
+    """L'encodage compact produit le binaire de `encode_triangles`."""
+    result = triangulate_compact(POINTS, engine="incremental")
+    expected = encode_triangles(POINTS, list(result.triangles))
+    assert result.encode() == expected
+    assert b"".join(result.chunks(chunk_size=8)) == expected
+    assert all(len(chunk) <= 8 for chunk in result.chunks(chunk_size=8))
+
+
+def test_triangulation_decode_is_zero_copy():
+    """Le décodage garde des vues sur les données reçues."""
+    data = triangulate_compact(POINTS).encode()
+    decoded = Triangulation.decode(data)
+    assert isinstance(decoded.coords, memoryview)
+    assert decoded.coords.obj is data
+    assert decoded == triangulate_compact(POINTS)
+
+
+def test_triangulation_buffers_support_buffer_protocol():
+    """Les tampons se passent directement à `memoryview` et `bytes`."""
+    result = Triangulation.from_lists([(1., 2.), (3., 4.), (5., 6.)], [(0, 1, 2)])
+    assert memoryview(result.indices).tolist() == [0, 1, 2]
+    assert bytes(result.coords) == array("f", [1., 2., 3., 4., 5., 6.]).tobytes()
+    assert result.nbytes() == 6 * 4 + 3 * 4
+
+
+def test_tuple_view_indexing():
+    """Les vues en tuples se comportent comme des séquences."""
+    view = Triangulation.from_lists(POINTS, []).points
+    assert len(view) == 5
+    assert view[-1] == (.5, .25)
+    assert view[1:3] == [(1., 0.), (1., 1.)]
+    assert list(view) == POINTS
+    with pytest.raises(IndexError):
+        view[5]
+
+
+def test_triangulation_invalid_buffers():
+    """Des tampons mal typés ou incomplets sont refusés."""
+    with pytest.raises(TypeError):
+        Triangulation(array("d", [0., 0.]), array("I"))
+    with pytest.raises(ValueError):
+        Triangulation(array("f", [0., 0.]), array("I", [0, 1]))
+    result = Triangulation(array("f", [0., 0.]), array("I", [0, 0, 1]))
+    with pytest.raises(ValueError):
+        result.chunks()
@@ -0,0 +1,94 @@
+"""Tests unitaires pour le stockage disque des triangulations."""
+
+import os
+
+import pytest
+from encoding import decode_triangles, iter_encode_triangles
+from triangulation_store import TriangulationStore
+
+
+def age(store, key, seconds):
+    """Recule la date de modification d'un fichier du stockage."""
+    path = os.path.join(store.directory, key + ".tri")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+def test_put_and_view(tmp_path):
+    """Un résultat écrit est relu par projection, identique octet pour octet."""
+    store = TriangulationStore(str(tmp_path), 100)
+    store.put("abc", b"0123456789")
+    view = store.view("abc")
+    assert view[:] == b"0123456789"
+    assert (tmp_path / "abc.tri").read_bytes() == b"0123456789"
+    assert "abc" in store
+    assert store.view("absent") is None
+    assert store.stats() == {
+        "files": 1, "size": 10, "hits": 1, "misses": 1, "evictions": 0
+    }
+
+
+def test_chunked_put(tmp_path):
+    """Les morceaux d'un encodage en flux donnent le binaire `Triangles`."""
+    store = TriangulationStore(str(tmp_path), 1000)
+    points = [(0., 0.), (1., 0.), (0., 1.)]
+    store.put("k", iter_encode_triangles(points, [(0, 1, 2)], chunk_size=12))
+    assert decode_triangles(store.view("k")) == (points, [(0, 1, 2)])
+
+
+def test_lru_eviction(tmp_path):
+    """Au-delà du plafond, le fichier le moins récemment lu est supprimé."""
+    store = TriangulationStore(str(tmp_path), 25)
+    store.put("a", b"x" * 10)
+    store.put("b", b"x" * 10)
+    store.view("a")
+    store.put("c", b"x" * 10)
+    assert store.view("b") is None
+    assert not (tmp_path / "b.tri").exists()
+    assert store.view("a") is not None and store.view("c") is not None
+    assert store.stats()["evictions"] == 1
+
+
+def test_too_large_not_stored(tmp_path):
+    """Un résultat plus grand que le plafond n'est pas conservé."""
+    store = TriangulationStore(str(tmp_path), 5)
+    store.put("k", [b"abc", b"def"])
+    assert len(store) == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_view_survives_eviction(tmp_path):
+    """Une projection déjà ouverte reste lisible après l'éviction du fichier."""
+    store = TriangulationStore(str(tmp_path), 10)
+    store.put("a", b"x" * 10)
+    view = store.view("a")
+    store.put("b", b"y" * 10)
+    assert view[:] == b"x" * 10
+
+
+def test_reopen_keeps_files_in_lru_order(tmp_path):
+    """Après redémarrage, les fichiers sont réindexés du plus ancien au plus récent."""
+    store = TriangulationStore(str(tmp_path), 100)
+    store.put("old", b"x" * 10)
+    store.put("new", b"x" * 10)
+    age(store, "old", 60)
+
+    reopened = TriangulationStore(str(tmp_path), 15)
+    assert reopened.view("new")[:] == b"x" * 10
+    assert reopened.view("old") is None
+    assert reopened.stats()["evictions"] == 1
+
+
+def test_file_from_other_process(tmp_path):
+    """Un fichier écrit par un autre processus est trouvé à la première lecture."""
+    store = TriangulationStore(str(tmp_path), 100)
+    TriangulationStore(str(tmp_path), 100).put("k", b"data")
+    assert store.view("k")[:] == b"data"
+    assert store.stats()["size"] == 4
+
+
+def test_invalid_key(tmp_path):
+    """Une empreinte qui n'est pas alphanumérique est refusée."""
+    store = TriangulationStore(str(tmp_path), 100)
+    with pytest.raises(ValueError):
+        store.put("../evil", b"data")
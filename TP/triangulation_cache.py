@@ -0,0 +1,150 @@
+"""Cache LRU des réponses `Triangles` encodées, adressé par contenu.
+
+Une triangulation ne dépend que du contenu du PointSet : le cache stocke le
+binaire final sous une empreinte (BLAKE2b) du PointSet reçu, et garde à côté
+un index `pointSetId -> empreinte` pour qu'une requête répétée n'ait même pas
+à récupérer le PointSet. L'occupation est bornée en octets ; les entrées les
+moins récemment utilisées sont évincées en premier, et une durée de vie
+optionnelle fait expirer les entrées trop anciennes.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def payload_key(payload: bytes) -> str:
+    """Renvoie l'empreinte de contenu d'un PointSet binaire."""
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class TriangulationCache:
+    """Cache LRU borné en octets, sûr entre threads.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Taille maximale cumulée des réponses conservées.
+    ttl : float | None
+        Durée de vie d'une entrée en secondes, `None` pour aucune expiration.
+    clock : callable
+        Horloge monotone utilisée pour l'expiration (injectable en test).
+
+    """
+
+    def __init__(self, max_bytes: int, ttl: float | None = None, clock=time.monotonic):
+        """Crée un cache vide."""
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._ids: dict[str, str] = {}
+        self._ids_by_key: dict[str, set[str]] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        """Renvoie le nombre de réponses conservées."""
+        return len(self._entries)
+
+    def _drop(self, key: str) -> None:
+        """Retire une entrée et les identifiants qui la référencent."""
+        data, _ = self._entries.pop(key)
+        self.size -= len(data)
+        for pointset_id in self._ids_by_key.pop(key, ()):
+            self._ids.pop(pointset_id, None)
+
+    def _lookup(self, key: str | None, count_miss: bool = True) -> bytes | None:
+        """Cherche une entrée encore valide et la marque comme récente."""
+        entry = self._entries.get(key) if key is not None else None
+        if entry is not None and entry[1] is not None and entry[1] <= self._clock():
+            self._drop(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += count_miss
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def get_by_id(self, pointset_id: str) -> bytes | None:
+        """Renvoie la réponse déjà calculée pour un identifiant de PointSet.
+
+        Un échec n'est pas compté comme défaut de cache : la requête se
+        poursuit par une recherche sur l'empreinte du contenu.
+        """
+        with self._lock:
+            return self._lookup(self._ids.get(pointset_id), count_miss=False)
+
+    def key_of(self, pointset_id: str) -> str | None:
+        """Renvoie l'empreinte de contenu associée à un identifiant, si connue."""
+        with self._lock:
+            key = self._ids.get(pointset_id)
+            return key if key in self._entries else None
+
+    def get(self, key: str, pointset_id: str | None = None) -> bytes | None:
+        """Renvoie la réponse associée à une empreinte de contenu.
+
+        Si `pointset_id` est fourni et que l'entrée existe, l'identifiant est
+        ajouté à l'index pour que la prochaine requête l'atteigne directement.
+        """
+        with self._lock:
+            data = self._lookup(key)
+            if data is not None and pointset_id is not None:
+                self._index(pointset_id, key)
+            return data
+
+    def _index(self, pointset_id: str, key: str) -> None:
+        """Associe un identifiant de PointSet à une empreinte."""
+        previous = self._ids.get(pointset_id)
+        if previous is not None and previous != key:
+            self._ids_by_key.get(previous, set()).discard(pointset_id)
+        self._ids[pointset_id] = key
+        self._ids_by_key.setdefault(key, set()).add(pointset_id)
+
+    def put(self, key: str, data: bytes, pointset_id: str | None = None) -> None:
+        """Enregistre une réponse, en évinçant les plus anciennes si besoin.
+
+        Une réponse plus grande que tout le budget n'est pas conservée.
+        """
+        if len(data) > self.max_bytes:
+            return
+        expires = self._clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[0])
+            while self._entries and self.size + len(data) > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (data, expires)
+            self.size += len(data)
+            if pointset_id is not None:
+                self._index(pointset_id, key)
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self._ids.clear()
+            self._ids_by_key.clear()
+            self.size = self.hits = self.misses = 0
+            self.evictions = self.expirations = 0
+
+    def stats(self) -> dict[str, int]:
+        """Renvoie les compteurs du cache."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,196 @@
+"""Résultat compact d'une triangulation, stocké dans des tableaux typés.
+
+Une liste de tuples coûte plus de 100 octets par triangle en objets Python ;
+`Triangulation` garde les coordonnées dans un tampon float32 ('f') et les
+indices dans un tampon uint32 ('I'), soit 8 octets par point et 12 octets
+par triangle, exactement la disposition du format binaire `Triangles`.
+
+Les deux tampons (`coords`, `indices`) exposent le protocole buffer : ils se
+passent tels quels à `memoryview`, `bytes`, `socket.send` ou à un encodeur,
+sans conversion. Les propriétés `points` et `triangles` offrent des vues
+paresseuses en tuples pour le code qui attend l'ancienne représentation.
+"""
+
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from itertools import chain
+
+from encoding import CHUNK_SIZE, decode_triangles_array, encode_triangles_array
+
+
+class TupleView(Sequence):
+    """Vue en lecture seule d'un tampon plat sous forme de tuples.
+
+    Parameters
+    ----------
+    buffer : array | memoryview
+        Tampon plat.
+    width : int
+        Nombre de valeurs par tuple.
+
+    """
+
+    def __init__(self, buffer, width: int):
+        """Crée une vue sans copier le tampon."""
+        self._buffer = buffer
+        self._width = width
+
+    def __len__(self) -> int:
+        """Renvoie le nombre de tuples."""
+        return len(self._buffer) // self._width
+
+    def __getitem__(self, index):
+        """Renvoie le tuple d'indice `index`, ou une liste pour une tranche."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("Indice hors de la vue")
+        start = index * self._width
+        return tuple(self._buffer[start:start + self._width])
+
+    def __iter__(self) -> Iterator[tuple]:
+        """Parcourt les tuples sans matérialiser la liste."""
+        return zip(*[iter(self._buffer)] * self._width, strict=True)
+
+    def __eq__(self, other) -> bool:
+        """Compare la vue à une autre séquence de tuples."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == tuple(b) for a, b in zip(self, other, strict=True)
+        )
+
+    def __repr__(self) -> str:
+        """Renvoie une représentation courte de la vue."""
+        return f"TupleView({len(self)} x {self._width})"
+
+
+class Triangulation:
+    """Triangulation stockée dans deux tampons typés contigus.
+
+    Parameters
+    ----------
+    coords : array | memoryview
+        Tampon 'f' des coordonnées x0, y0, x1, y1, ...
+    indices : array | memoryview
+        Tampon 'I' des indices a0, b0, c0, a1, b1, c1, ...
+
+    """
+
+    __slots__ = ("coords", "indices")
+
+    def __init__(self, coords, indices):
+        """Crée une triangulation à partir de tampons, sans copie."""
+        if memoryview(coords).format != "f" or memoryview(indices).format != "I":
+            raise TypeError("Tampons de type 'f' et 'I' attendus")
+        if len(coords) % 2 or len(indices) % 3:
+            raise ValueError("Tampons de taille incohérente")
+        self.coords = coords
+        self.indices = indices
+
+    @classmethod
+    def from_lists(cls, points, triangles) -> "Triangulation":
+        """Construit une triangulation depuis des listes de tuples.
+
+        Parameters
+        ----------
+        points : Iterable[Point]
+            Points (x, y).
+        triangles : Iterable[Triangle]
+            Triplets d'indices.
+
+        Returns
+        -------
+        Triangulation
+            Triangulation compacte équivalente.
+
+        """
+        return cls(
+            array("f", chain.from_iterable(points)),
+            array("I", chain.from_iterable(triangles)),
+        )
+
+    @classmethod
+    def decode(cls, data: bytes) -> "Triangulation":
+        """Décode un binaire `Triangles` en vues sur ses données, sans copie."""
+        return cls(*decode_triangles_array(data))
+
+    @property
+    def n_points(self) -> int:
+        """Renvoie le nombre de points."""
+        return len(self.coords) // 2
+
+    def __len__(self) -> int:
+        """Renvoie le nombre de triangles."""
+        return len(self.indices) // 3
+
+    @property
+    def points(self) -> TupleView:
+        """Renvoie une vue paresseuse des points sous forme de couples."""
+        return TupleView(self.coords, 2)
+
+    @property
+    def triangles(self) -> TupleView:
+        """Renvoie une vue paresseuse des triangles sous forme de triplets."""
+        return TupleView(self.indices, 3)
+
+    def encode(self) -> bytes:
+        """Encode la triangulation au format binaire `Triangles`."""
+        return encode_triangles_array(self.coords, self.indices)
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator:
+        """Renvoie le binaire `Triangles` en morceaux, sans copier les tampons.
+
+        Sur une machine little-endian, les morceaux de coordonnées et
+        d'indices sont des `memoryview` directement sur les tampons ; les
+        indices sont vérifiés avant le premier morceau.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Taille maximale d'un morceau en octets.
+
+        Returns
+        -------
+        Iterator[bytes | memoryview]
+            Morceaux successifs du binaire `Triangles`.
+
+        """
+        if len(self) and max(memoryview(self.indices)) >= self.n_points:
+            raise ValueError("Un triangle contient un indice invalide")
+        if sys.byteorder != "little":
+            return _slices(memoryview(self.encode()), chunk_size)
+        return chain(
+            (struct.pack("<I", self.n_points),),
+            _slices(memoryview(self.coords).cast("B"), chunk_size),
+            (struct.pack("<I", len(self)),),
+            _slices(memoryview(self.indices).cast("B"), chunk_size),
+        )
+
+    def nbytes(self) -> int:
+        """Renvoie la taille des deux tampons en octets."""
+        return memoryview(self.coords).nbytes + memoryview(self.indices).nbytes
+
+    def __eq__(self, other) -> bool:
+        """Compare deux triangulations valeur par valeur."""
+        if not isinstance(other, Triangulation):
+            return NotImplemented
+        return (
+            memoryview(self.coords) == memoryview(other.coords)
+            and memoryview(self.indices) == memoryview(other.indices)
+        )
+
+    def __repr__(self) -> str:
+        """Renvoie une représentation courte de la triangulation."""
+        return f"Triangulation({self.n_points} points, {len(self)} triangles)"
+
+
+def _slices(view: memoryview, size: int) -> Iterator[memoryview]:
+    """Découpe une vue d'octets en tranches d'au plus `size` octets."""
+    for start in range(0, len(view), size):
+        yield view[start:start + size]
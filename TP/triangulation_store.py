@@ -0,0 +1,168 @@
+"""Stockage sur disque des triangulations encodées, servi par `mmap`.
+
+Chaque résultat est écrit dans un fichier `<empreinte>.tri` dont le contenu
+est exactement le binaire `Triangles` envoyé sur le réseau : servir un
+résultat revient à projeter le fichier en mémoire (`mmap`) et à en envoyer
+des tranches, sans le recopier ni le garder en mémoire de processus.
+
+Le stockage survit aux redémarrages : à l'ouverture, les fichiers présents
+sont réindexés, du moins récemment utilisé au plus récent (date de
+modification, mise à jour à chaque lecture). Au-delà de `max_bytes`, les
+fichiers les moins récemment utilisés sont supprimés.
+
+Plusieurs processus peuvent partager le même répertoire : les écritures sont
+atomiques (fichier temporaire puis renommage) et un fichier écrit par un
+autre processus est découvert à la première lecture. Le plafond de taille
+est appliqué par chaque processus sur ce qu'il connaît.
+"""
+
+import contextlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+SUFFIX = ".tri"
+
+
+class TriangulationStore:
+    """Répertoire de résultats encodés, indexés par empreinte de PointSet.
+
+    Parameters
+    ----------
+    directory : str
+        Répertoire des fichiers, créé s'il n'existe pas.
+    max_bytes : int
+        Taille totale maximale des fichiers conservés.
+
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """Ouvre le stockage et réindexe les fichiers déjà présents."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        found = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(SUFFIX) and entry.is_file():
+                stat = entry.stat()
+                key = entry.name[:-len(SUFFIX)]
+                found.append((stat.st_mtime_ns, key, stat.st_size))
+        for _, key, size in sorted(found):
+            self._files[key] = size
+            self.size += size
+        with self._lock:
+            self._evict()
+
+    def __len__(self) -> int:
+        """Renvoie le nombre de fichiers indexés."""
+        return len(self._files)
+
+    def __contains__(self, key: str) -> bool:
+        """Indique si un résultat est stocké pour cette empreinte."""
+        return key in self._files or os.path.exists(self._path(key))
+
+    def _path(self, key: str) -> str:
+        """Renvoie le chemin du fichier d'une empreinte."""
+        if not key.isalnum():
+            raise ValueError(f"Empreinte invalide: {key!r}")
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def _evict(self) -> None:
+        """Supprime les fichiers les moins récents au-delà de `max_bytes`."""
+        while self._files and self.size > self.max_bytes:
+            key, size = self._files.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            _unlink(self._path(key))
+
+    def put(self, key: str, data: bytes | Iterable[bytes]) -> None:
+        """Écrit un résultat encodé, d'un bloc ou morceau par morceau.
+
+        Les morceaux (par exemple ceux de `iter_encode_triangles`) sont écrits
+        au fur et à mesure, sans construire le binaire en mémoire. Un
+        résultat plus grand que tout le budget n'est pas conservé.
+        """
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        chunks = (data,) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        size = 0
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in chunks:
+                    size += f.write(chunk)
+                    if size > self.max_bytes:
+                        break
+            if size > self.max_bytes:
+                os.unlink(tmp)
+                return
+            os.replace(tmp, path)
+        except BaseException:
+            _unlink(tmp)
+            raise
+
+        with self._lock:
+            self.size += size - self._files.pop(key, 0)
+            self._files[key] = size
+            self._evict()
+
+    def view(self, key: str) -> mmap.mmap | None:
+        """Renvoie une projection en lecture seule du résultat, ou None.
+
+        La projection reste valide même si le fichier est évincé ensuite.
+        La lecture marque le résultat comme récemment utilisé.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    raise FileNotFoundError(path)
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                if key in self._files:
+                    self.size -= self._files.pop(key)
+            return None
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+
+        with self._lock:
+            self.hits += 1
+            # Fichier inconnu : écrit par un autre processus
+            self.size += size - self._files.pop(key, 0)
+            self._files[key] = size
+            self._evict()
+        return data
+
+    def clear(self) -> None:
+        """Supprime tous les fichiers indexés et remet les compteurs à zéro."""
+        with self._lock:
+            for key in self._files:
+                _unlink(self._path(key))
+            self._files.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Renvoie les compteurs du stockage."""
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "size": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _unlink(path: str) -> None:
+    """Supprime un fichier s'il existe encore."""
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
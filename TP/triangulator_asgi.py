@@ -0,0 +1,270 @@
+"""Point d'entrée ASGI (asyncio) du service de triangulation.
+
+Même route et mêmes réponses que `triangulator_server`, mais sans bloquer un
+worker pendant toute la requête :
+
+- la récupération du PointSet (client HTTP bloquant) est attendue dans un
+  pool de threads d'entrée/sortie, la boucle d'événements reste libre ;
+- la triangulation passe par les voies de `service.scheduler`, comme dans
+  l'application Flask (`service.scheduled_triangulation`) : places et files
+  de chaque voie, pools de processus des gros PointSets ; elle est attendue
+  dans un pool de threads de calcul ;
+- l'échéance de la requête (`service.REQUEST_BUDGET` et l'en-tête
+  `X-Request-Deadline`) borne récupération et calcul (504) ;
+- au-delà de `max_pending` calculs en attente, les nouvelles requêtes sont
+  refusées tout de suite en 503 (contre-pression) au lieu de s'accumuler.
+
+Le cache, la déduplication par PointSet et la traduction des erreurs sont
+partagés avec l'application Flask ; une erreur imprévue donne une réponse
+500, jamais une requête sans réponse. L'objet `app` se lance avec n'importe
+quel serveur ASGI, par exemple ``uvicorn triangulator_asgi:app``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+import triangulator_server as service
+from deadline import Deadline
+from scheduler import Lane, Scheduler
+
+_ROUTE = "/triangulation/"
+_DEADLINE_HEADER = service.DEADLINE_HEADER.lower().encode()
+
+logger = logging.getLogger(__name__)
+
+
+class TriangulatorASGI:
+    """Application ASGI servant `GET /triangulation/{pointSetId}`.
+
+    Parameters
+    ----------
+    workers : int | None
+        Nombre de calculs simultanés visé ; par défaut le nombre de cœurs.
+    max_pending : int | None
+        Nombre maximal de calculs admis simultanément (en cours ou en file) ;
+        par défaut quatre fois `workers`.
+    executor : Executor | None
+        Exécuteur de calcul à utiliser à la place des pools de processus des
+        voies de `service.scheduler` (tests) ; places et files sont gardées.
+    io_threads : int | None
+        Taille du pool de threads des récupérations de PointSets.
+
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_pending: int | None = None,
+        executor: Executor | None = None,
+        io_threads: int | None = None,
+    ):
+        """Crée l'application ; les pools sont démarrés à la première requête."""
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending if max_pending is not None else 4 * self.workers
+        self.io_threads = io_threads
+        self.scheduler = service.scheduler
+        if executor is not None:
+            self.scheduler = Scheduler([
+                Lane(
+                    lane.name, lane.max_points, lane.slots, lane.max_queue,
+                    executor=executor if lane.processes else None,
+                )
+                for lane in service.scheduler.lanes
+            ])
+        self._io: ThreadPoolExecutor | None = None
+        self._threads: ThreadPoolExecutor | None = None
+        self._flights: dict[str, asyncio.Future] = {}
+        self.pending = 0
+        self.rejected = 0
+
+    # -------------------- Pools --------------------
+
+    @property
+    def io(self) -> ThreadPoolExecutor:
+        """Renvoie le pool de threads des entrées/sorties, créé au premier usage."""
+        if self._io is None:
+            self._io = ThreadPoolExecutor(
+                self.io_threads, thread_name_prefix="pointset-fetch"
+            )
+        return self._io
+
+    @property
+    def threads(self) -> ThreadPoolExecutor:
+        """Renvoie le pool de threads des calculs, créé au premier usage.
+
+        Un thread par calcul admis : il attend une place de la voie puis
+        calcule (petits PointSets) ou attend le pool de processus de la voie.
+        """
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max(self.max_pending, 1), thread_name_prefix="triangulate"
+            )
+        return self._threads
+
+    def close(self) -> None:
+        """Arrête les pools créés par l'application."""
+        for name in ("_io", "_threads"):
+            pool = getattr(self, name)
+            if pool is not None:
+                pool.shutdown(wait=True)
+                setattr(self, name, None)
+        if self.scheduler is not service.scheduler:
+            self.scheduler.close()
+
+    # -------------------- Traitement --------------------
+
+    def _triangulate(self, binary_data: bytes, deadline: Deadline) -> bytes:
+        """Triangule un PointSet dans la voie de sa taille et encode le résultat."""
+        return service.encode_result(
+            service.scheduled_triangulation(binary_data, deadline, self.scheduler)
+        )
+
+    async def _compute(self, pointSetId: str, deadline: Deadline) -> bytes:
+        """Récupère, triangule et met en cache un PointSet (calcul meneur)."""
+        loop = asyncio.get_running_loop()
+        binary_data = await loop.run_in_executor(
+            self.io, service.fetch_payload, pointSetId, deadline
+        )
+
+        key = service.payload_key(binary_data)
+        cached = service.cache.get(key, pointset_id=pointSetId)
+        if cached is not None:
+            return cached
+
+        binary_output = await loop.run_in_executor(
+            self.threads, self._triangulate, binary_data, deadline
+        )
+        service.cache.put(key, binary_output, pointset_id=pointSetId)
+        return binary_output
+
+    async def triangulation(self, pointSetId: str, deadline: Deadline) -> bytes:
+        """Renvoie le binaire `Triangles` d'un PointSet ou lève ServiceError.
+
+        Les requêtes concurrentes sur le même PointSet partagent un seul
+        calcul ; un nouveau calcul est refusé (503) si `max_pending` calculs
+        sont déjà admis. Chaque requête cesse d'attendre à sa propre
+        échéance (504) ; si le calcul partagé échoue à l'échéance de son
+        meneur alors que la sienne court encore, elle le relance.
+        """
+        while True:
+            if deadline.expired():
+                raise service.deadline_exceeded()
+            flight = self._flights.get(pointSetId)
+            if flight is None:
+                if self.pending >= self.max_pending:
+                    self.rejected += 1
+                    raise service.ServiceError(
+                        "TRIANGULATOR_OVERLOADED",
+                        "Too many triangulations in progress, retry later.",
+                        503,
+                    )
+                self.pending += 1
+                flight = asyncio.ensure_future(self._compute(pointSetId, deadline))
+                self._flights[pointSetId] = flight
+                flight.add_done_callback(lambda _: self._finish(pointSetId))
+            try:
+                # shield : l'abandon d'un client n'annule pas le calcul partagé
+                return await asyncio.wait_for(
+                    asyncio.shield(flight), deadline.remaining()
+                )
+            except TimeoutError as e:
+                raise service.deadline_exceeded() from e
+            except service.ServiceError as e:
+                if e.code != "DEADLINE_EXCEEDED" or deadline.expired():
+                    raise
+
+    def _finish(self, pointSetId: str) -> None:
+        """Libère la place d'un calcul terminé."""
+        self.pending -= 1
+        del self._flights[pointSetId]
+
+    async def handle(
+        self, method: str, path: str, headers=()
+    ) -> tuple[int, list, bytes]:
+        """Traite une requête et renvoie (statut, en-têtes, corps).
+
+        `headers` est la liste des en-têtes ASGI (noms en minuscules, en
+        octets). Toute erreur imprévue donne une réponse 500.
+        """
+        try:
+            return await self._handle(method, path, headers)
+        except service.ServiceError as e:
+            status, response_headers, body = _json(e.status, e.code, e.message)
+            if e.code == "TRIANGULATOR_OVERLOADED":
+                response_headers.append((b"retry-after", b"1"))
+            return status, response_headers, body
+        except Exception:
+            logger.exception("Erreur imprévue sur %s %s", method, path)
+            return _json(500, "INTERNAL_ERROR", "Unexpected server error.")
+
+    async def _handle(self, method: str, path: str, headers) -> tuple[int, list, bytes]:
+        """Traite une requête ; lève ServiceError pour les réponses d'erreur."""
+        if not path.startswith(_ROUTE) or "/" in path[len(_ROUTE):]:
+            return _json(404, "NOT_FOUND", "Unknown route.")
+        if method != "GET":
+            return _json(405, "METHOD_NOT_ALLOWED", "Only GET is supported.")
+        pointSetId = path[len(_ROUTE):]
+
+        # --------------- Validation de l’UUID ----------------
+        try:
+            uuid.UUID(pointSetId)
+        except ValueError:
+            return _json(
+                400, "INVALID_POINTSET_ID", "The PointSetID format is invalid."
+            )
+
+        # --------------- Cache par identifiant ---------------
+        binary_output = service.cache.get_by_id(pointSetId)
+        if binary_output is None:
+            header = dict(headers).get(_DEADLINE_HEADER)
+            client = service.parse_deadline(
+                header.decode("latin-1") if header is not None else None
+            )
+            binary_output = await self.triangulation(
+                pointSetId, service.request_deadline(client)
+            )
+
+        return 200, [(b"content-type", b"application/octet-stream")], binary_output
+
+    # -------------------- Interface ASGI --------------------
+
+    async def __call__(self, scope, receive, send):
+        """Point d'entrée ASGI (requêtes HTTP et cycle de vie)."""
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        status, headers, body = await self.handle(
+            scope["method"], scope["path"], scope.get("headers", ())
+        )
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        """Gère le démarrage et l'arrêt du serveur ASGI."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.get_running_loop().run_in_executor(None, self.close)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def _json(status: int, code: str, message: str) -> tuple[int, list, bytes]:
+    """Renvoie une réponse JSON d'erreur (statut, en-têtes, corps)."""
+    body = json.dumps({"code": code, "message": message}).encode()
+    return status, [(b"content-type", b"application/json")], body
+
+
+app = TriangulatorASGI()
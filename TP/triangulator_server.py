@@ -1,14 +1,118 @@
 """Serveur Flask pour exposer la triangulation de PointSets via HTTP."""
 
+import contextvars
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import queue
 import random
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import contextmanager
 
-from encoding import decode_pointset, encode_pointset, encode_triangles
-from flask import Flask, Response, jsonify
-from Triangulator import triangulate
+from deadline import Deadline, DeadlineExceeded
+from encoding import (
+    CHUNK_SIZE,
+    decode_pointset,
+    decode_triangles,
+    encode_batch_frame,
+    encode_pointset,
+    encode_query_results,
+    encode_triangles_compact,
+    encode_triangles_delta,
+)
+from flask import Flask, Response, g, has_request_context, jsonify, request
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from metrics import SIZE_BUCKETS, Registry
+from point_location import PointLocator
+from pointset_client import PointSetManagerClient, PointSetManagerError
+from profiling import Profile
+from scheduler import POOL_START_METHOD, Lane, LaneFull, Scheduler
+from single_flight import SingleFlight
+from triangulation_cache import TriangulationCache, payload_key
+from triangulation_result import Triangulation
+from triangulation_store import TriangulationStore
+from Triangulator import triangulate_compact
 
 app = Flask(__name__)
 
+# Cache des réponses encodées : 256 Mo, sans expiration
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_TTL = None
+cache = TriangulationCache(CACHE_MAX_BYTES, ttl=CACHE_TTL)
+
+# Déduplication des calculs concurrents ; un répertoire partagé (ex. /dev/shm)
+# l'étend aux différents processus workers
+SINGLE_FLIGHT_DIR = None
+flights = SingleFlight(SINGLE_FLIGHT_DIR)
+
+# Stockage disque des résultats (si TRIANGULATION_STORE_DIR est défini), 4 Go ;
+# un résultat stocké plus petit que STORE_PROMOTE_MAX_BYTES est remonté dans le
+# cache mémoire, un plus grand est envoyé depuis le fichier projeté
+STORE_DIR = os.environ.get("TRIANGULATION_STORE_DIR")
+STORE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+STORE_PROMOTE_MAX_BYTES = 8 * 1024 * 1024
+store = TriangulationStore(STORE_DIR, STORE_MAX_BYTES) if STORE_DIR else None
+
+# Distance en dessous de laquelle des points mesurés sont fusionnés avant la
+# triangulation (0 : doublons exacts seulement)
+MERGE_TOLERANCE = float(os.environ.get("TRIANGULATION_MERGE_TOLERANCE", 0.))
+
+# Au-delà de ce nombre de points, la réponse est encodée et envoyée en flux
+# au lieu d'être construite en mémoire (et n'est donc pas mise en cache)
+STREAM_MIN_POINTS = 200_000
+
+# Triangulation par lots : taille maximale d'un lot, nombre de récupérations
+# simultanées et nombre de processus de calcul (None : un par cœur)
+BATCH_MAX_IDS = 1000
+BATCH_FETCH_THREADS = 16
+BATCH_WORKERS = None
+
+# Réponses delta et compacte : types négociés par l'en-tête Accept
+DELTA_MIMETYPE = "application/x-triangles-delta"
+COMPACT_MIMETYPE = "application/x-triangles-compact"
+
+# Profilage (si TRIANGULATION_PROFILE_DIR est défini) : une triangulation qui
+# dure plus de PROFILE_THRESHOLD secondes, ou toute triangulation d'une requête
+# portant l'en-tête PROFILE_HEADER, est échantillonnée et son profil écrit
+PROFILE_DIR = os.environ.get("TRIANGULATION_PROFILE_DIR")
+PROFILE_THRESHOLD = float(os.environ.get("TRIANGULATION_PROFILE_THRESHOLD", 1.0))
+PROFILE_HEADER = "X-Debug-Profile"
+
+# Ordonnancement par taille (voir `scheduler`), d'après le nombre de points lu
+# dans l'en-tête du PointSet : jusqu'à SMALL_LANE_MAX_POINTS points, calcul dans
+# le thread de la requête ; jusqu'à MEDIUM_LANE_MAX_POINTS, dans un pool de
+# processus ; au-delà, dans un second pool plus petit, pour que les très gros
+# PointSets n'occupent jamais tous les cœurs. Chaque voie a sa limite de
+# calculs simultanés et refuse (503) au-delà de LANE_MAX_QUEUE calculs en file
+SMALL_LANE_MAX_POINTS = 2_000
+SMALL_LANE_SLOTS = 8
+MEDIUM_LANE_MAX_POINTS = 100_000
+MEDIUM_LANE_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+LARGE_LANE_WORKERS = max(1, (os.cpu_count() or 1) // 4)
+LANE_MAX_QUEUE = 256
+scheduler = Scheduler([
+    Lane("small", SMALL_LANE_MAX_POINTS, SMALL_LANE_SLOTS, LANE_MAX_QUEUE),
+    Lane("medium", MEDIUM_LANE_MAX_POINTS, MEDIUM_LANE_WORKERS, LANE_MAX_QUEUE,
+         processes=True),
+    Lane("large", None, LARGE_LANE_WORKERS, LANE_MAX_QUEUE, processes=True),
+])
+
+# Échéances : une triangulation dispose de REQUEST_BUDGET secondes, récupération
+# du PointSet comprise, ou de moins si le client l'indique par l'en-tête
+# DEADLINE_HEADER (secondes restantes) ; au-delà, le calcul est abandonné (504)
+REQUEST_BUDGET = float(os.environ.get("TRIANGULATION_REQUEST_BUDGET", 30.0))
+DEADLINE_HEADER = "X-Request-Deadline"
+
 
 # -------------------------------------------------------
 # Faux PointSetManager (toujours activé)
@@ -27,8 +131,21 @@ def fake_pointset_manager(pointSetId: str) -> bytes:
     return encode_pointset(points)
 
 
-def fetch_pointset(pointSetId: str) -> bytes:
+# -------------------------------------------------------
+# PointSetManager réel (si POINTSET_MANAGER_URL est défini)
+# -------------------------------------------------------
+POINTSET_MANAGER_URL = os.environ.get("POINTSET_MANAGER_URL")
+pointset_client = (
+    PointSetManagerClient(POINTSET_MANAGER_URL) if POINTSET_MANAGER_URL else None
+)
+
+
+def fetch_pointset(pointSetId: str, deadline: Deadline | None = None) -> bytes:
     """Récupère un PointSet binaire et lève RuntimeError si problème."""
+    if pointset_client is not None:
+        return pointset_client.fetch(
+            pointSetId, deadline=None if deadline is None else deadline.at
+        )
     try:
         data = fake_pointset_manager(pointSetId)
         if not data:
@@ -38,64 +155,1026 @@ def fetch_pointset(pointSetId: str) -> bytes:
         raise RuntimeError(f"PointSetManager error: {e}") from e
 
 
+# -------------------------------------------------------
+# Métriques (exposées sur /metrics et dans Server-Timing)
+# -------------------------------------------------------
+metrics = Registry()
+stage_seconds = metrics.histogram(
+    "triangulator_stage_seconds",
+    "Durée de chaque étape du traitement, en secondes.",
+    labels=("stage",),
+)
+request_seconds = metrics.histogram(
+    "triangulator_request_seconds",
+    "Durée des requêtes jusqu'au début de la réponse, en secondes.",
+    labels=("route", "status"),
+)
+points_count = metrics.histogram(
+    "triangulator_points", "Nombre de points des PointSets décodés.",
+    buckets=SIZE_BUCKETS,
+)
+triangles_count = metrics.histogram(
+    "triangulator_triangles", "Nombre de triangles calculés.", buckets=SIZE_BUCKETS
+)
+errors_total = metrics.counter(
+    "triangulator_errors_total", "Réponses d'erreur, par code.", labels=("code",)
+)
+requests_in_flight = metrics.gauge(
+    "triangulator_requests_in_flight", "Requêtes en cours de traitement."
+)
+metrics.gauge(
+    "triangulator_computations_in_flight",
+    "Calculs de triangulation en cours (après déduplication).",
+    callback=lambda: flights.in_flight(),
+)
+for _name in ("hits", "misses", "evictions", "expirations"):
+    metrics.counter(
+        f"triangulator_cache_{_name}_total",
+        f"Cache des triangulations : {_name}.",
+        callback=lambda name=_name: cache.stats()[name],
+    )
+for _lane in scheduler.lanes:
+    metrics.gauge(
+        f"triangulator_lane_{_lane.name}_running",
+        f"Voie {_lane.name} : calculs en cours.",
+        callback=lambda lane=_lane: lane.stats()["running"],
+    )
+    metrics.gauge(
+        f"triangulator_lane_{_lane.name}_waiting",
+        f"Voie {_lane.name} : calculs en attente d'une place.",
+        callback=lambda lane=_lane: lane.stats()["waiting"],
+    )
+    metrics.counter(
+        f"triangulator_lane_{_lane.name}_rejected_total",
+        f"Voie {_lane.name} : calculs refusés, file pleine.",
+        callback=lambda lane=_lane: lane.stats()["rejected"],
+    )
+metrics.gauge(
+    "triangulator_cache_bytes", "Taille des réponses en cache, en octets.",
+    callback=lambda: cache.stats()["bytes"],
+)
+metrics.gauge(
+    "triangulator_cache_entries", "Nombre de réponses en cache.",
+    callback=lambda: cache.stats()["entries"],
+)
+
+
+_SIZE_HISTOGRAMS = {"points": points_count, "triangles": triangles_count}
+
+
+class Measures:
+    """Mesures d'un calcul exécuté dans le pool d'une voie.
+
+    Les métriques, l'en-tête `Server-Timing` et les profils n'existent que
+    dans le processus du serveur : le processus de calcul les accumule ici
+    et les renvoie avec le résultat, puis `record_measures` les enregistre.
+
+    Parameters
+    ----------
+    profiling : tuple[float, str] | None
+        Délai et motif du profilage décidés par le serveur pour la requête
+        d'origine (voir `profile_settings`).
+
+    """
+
+    def __init__(self, profiling: tuple[float, str] | None = None):
+        """Crée un relevé vide."""
+        self.profiling = profiling
+        self.stages: list[tuple[str, float]] = []
+        self.sizes: list[tuple[str, int]] = []
+        self.profiles: list[tuple[Profile, int, str]] = []
+
+
+# Relevé du calcul en cours dans un processus de voie (None dans le serveur)
+_measures: contextvars.ContextVar[Measures | None] = contextvars.ContextVar(
+    "measures", default=None
+)
+
+
+def record_stage(name: str, duration: float) -> None:
+    """Enregistre la durée d'une étape (histogramme et `Server-Timing`)."""
+    stage_seconds.observe(duration, stage=name)
+    if has_request_context():
+        g.setdefault("server_timing", []).append((name, duration))
+
+
+def observe_size(kind: str, n: int) -> None:
+    """Enregistre une taille ("points" ou "triangles") dans son histogramme."""
+    measures = _measures.get()
+    if measures is not None:
+        measures.sizes.append((kind, n))
+    else:
+        _SIZE_HISTOGRAMS[kind].observe(n)
+
+
+def record_measures(measures: Measures) -> None:
+    """Enregistre les mesures renvoyées par un processus de voie."""
+    for name, duration in measures.stages:
+        record_stage(name, duration)
+    for kind, n in measures.sizes:
+        _SIZE_HISTOGRAMS[kind].observe(n)
+    for profile, n_points, reason in measures.profiles:
+        save_profile(profile, n_points, reason)
+
+
+@contextmanager
+def stage(name: str):
+    """Chronomètre une étape du traitement.
+
+    La durée alimente l'histogramme `triangulator_stage_seconds` et, dans
+    une requête HTTP, l'en-tête `Server-Timing` de la réponse.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        measures = _measures.get()
+        if measures is not None:
+            measures.stages.append((name, duration))
+        else:
+            record_stage(name, duration)
+
+
+@app.before_request
+def start_timer():
+    """Note le début de la requête et la compte comme en cours."""
+    g.start = time.perf_counter()
+    requests_in_flight.inc()
+
+
+@app.after_request
+def record_request(response: Response) -> Response:
+    """Mesure la requête et ajoute l'en-tête `Server-Timing`."""
+    duration = time.perf_counter() - g.start
+    route = request.url_rule.rule if request.url_rule is not None else "unknown"
+    request_seconds.observe(duration, route=route, status=response.status_code)
+    timings = [*g.get("server_timing", ()), ("total", duration)]
+    response.headers["Server-Timing"] = ", ".join(
+        f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings
+    )
+    if "profile" in g:
+        response.headers["X-Profile"] = g.profile
+    return response
+
+
+@app.after_request
+def vary_on_accept(response: Response) -> Response:
+    """Ajoute `Vary: Accept` à toute réponse de triangulation, erreurs comprises.
+
+    Le format (complet, compact, delta) dépend de l'en-tête Accept : un cache
+    partagé ne doit pas servir l'un à la place de l'autre.
+    """
+    if request.endpoint == "get_triangulation":
+        response.vary.add("Accept")
+    return response
+
+
+@app.teardown_request
+def end_request(exc):
+    """Retire la requête des requêtes en cours, même en cas d'exception."""
+    # Une seule fois par requête, même si le contexte est démonté deux fois
+    if g.pop("start", None) is not None:
+        requests_in_flight.dec()
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Renvoie les métriques au format texte de Prometheus."""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+
 # -------------------------------------------------------
 # Utilitaire d’erreur
 # -------------------------------------------------------
 def error(code: str, message: str, status: int):
-    """Renvoie une réponse JSON d'erreur avec code HTTP."""
+    """Renvoie une réponse JSON d'erreur avec code HTTP (et la compte)."""
+    errors_total.inc(code=code)
     return jsonify({"code": code, "message": message}), status
 
 
-# -------------------------------------------------------
-# Route principale : GET /triangulation/<pointSetId>
-# -------------------------------------------------------
-@app.get("/triangulation/<pointSetId>")
-def get_triangulation(pointSetId: str):
-    """Renvoie la triangulation binaire pour un PointSet donné."""
-    # --------------- Validation de l’UUID ----------------
+class ServiceError(Exception):
+    """Échec d'une étape du traitement, à renvoyer au client en `Error`."""
+
+    def __init__(self, code: str, message: str, status: int):
+        """Crée une erreur avec son code interne et son statut HTTP."""
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+
+    def __reduce__(self):
+        """Permet de transmettre l'erreur depuis un processus de calcul."""
+        return type(self), (self.code, self.message, self.status)
+
+
+def deadline_exceeded() -> ServiceError:
+    """Renvoie l'erreur d'une requête dont l'échéance est dépassée."""
+    return ServiceError(
+        "DEADLINE_EXCEEDED", "The request deadline was exceeded.", 504
+    )
+
+
+def client_deadline() -> Deadline:
+    """Renvoie l'échéance fixée par le client ou lève ServiceError.
+
+    Lue dans l'en-tête `DEADLINE_HEADER` de la requête courante.
+    """
+    return parse_deadline(request.headers.get(DEADLINE_HEADER))
+
+
+def parse_deadline(header: str | None) -> Deadline:
+    """Renvoie l'échéance donnée par un en-tête `DEADLINE_HEADER` ou lève ServiceError.
+
+    La valeur est un nombre de secondes (0 ou moins : déjà dépassée) ; sans
+    en-tête, l'échéance est sans limite.
+    """
+    if header is None:
+        return Deadline()
     try:
-        uuid.UUID(pointSetId)
+        seconds = float(header)
     except ValueError:
-        return error("INVALID_POINTSET_ID", "The PointSetID format is invalid.", 400)
+        seconds = math.nan
+    if math.isnan(seconds):
+        raise ServiceError(
+            "INVALID_DEADLINE",
+            f"{DEADLINE_HEADER} must be a number of seconds.",
+            400
+        )
+    return Deadline.after(max(seconds, 0.))
 
-    # --------------- FAKE POINTSET MANAGER ---------------
-    try:
-        binary_data = fetch_pointset(pointSetId)
-    except Exception as e:
-        return error("POINTSET_MANAGER_ERROR", str(e), 503)
 
-    # --------------- Décodage ----------------------------
+def request_deadline(client: Deadline | None = None) -> Deadline:
+    """Renvoie l'échéance de la requête courante ou lève ServiceError.
+
+    La plus proche de `REQUEST_BUDGET` et de l'échéance du client, lue par
+    défaut dans la requête Flask courante (`client_deadline`).
+    """
+    deadline = Deadline.after(REQUEST_BUDGET)
+    if client is None:
+        client = client_deadline()
+    if client.at is not None and client.at < deadline.at:
+        return client
+    return deadline
+
+
+def shared_computation(
+    pointSetId: str, deadline: Deadline, binary_data: bytes | None = None
+):
+    """Renvoie la triangulation d'un PointSet, calculée ou attendue avant l'échéance.
+
+    Les requêtes concurrentes partagent un seul calcul (`flights`). Un
+    suiveur cesse d'attendre à sa propre échéance ; si le meneur échoue à
+    la sienne alors que celle du suiveur court encore, le suiveur relance
+    le calcul. Si `binary_data` est donné, le PointSet déjà récupéré n'est
+    pas redemandé au PointSetManager. Lève ServiceError.
+    """
+    def compute():
+        if binary_data is None:
+            return compute_triangulation(pointSetId, deadline)
+        return triangulation_of(pointSetId, binary_data, deadline)
+
+    while True:
+        if deadline.expired():
+            raise deadline_exceeded()
+        try:
+            return flights.do(pointSetId, compute, timeout=deadline.remaining())
+        except ServiceError as e:
+            if e.code != "DEADLINE_EXCEEDED" or deadline.expired():
+                raise
+        except TimeoutError as e:
+            raise deadline_exceeded() from e
+
+
+# -------------------------------------------------------
+# Chaîne de traitement : récupération -> triangulation -> encodage
+# -------------------------------------------------------
+def decode_payload(binary_data: bytes) -> list:
+    """Décode un PointSet binaire ou lève ServiceError."""
     try:
-        points = decode_pointset(binary_data)
-    except Exception:
-        return error(
+        with stage("decode"):
+            points = decode_pointset(binary_data)
+    except Exception as e:
+        raise ServiceError(
             "INVALID_POINTSET_BINARY",
             "Could not decode binary PointSet data.",
             500
+        ) from e
+    observe_size("points", len(points))
+    return points
+
+
+def profile_settings() -> tuple[float, str] | None:
+    """Renvoie le délai et le motif de profilage de la requête courante.
+
+    None si le profilage est désactivé ; délai nul (motif "header") si la
+    requête porte `PROFILE_HEADER`, sinon `PROFILE_THRESHOLD` ("threshold").
+    """
+    measures = _measures.get()
+    if measures is not None:
+        return measures.profiling
+    if PROFILE_DIR is None:
+        return None
+    if has_request_context() and PROFILE_HEADER in request.headers:
+        return 0., "header"
+    return PROFILE_THRESHOLD, "threshold"
+
+
+@contextmanager
+def profiled(n_points: int):
+    """Profile le bloc `with` s'il est lent ou si la requête le demande.
+
+    Le profil est écrit dans PROFILE_DIR ; son nom est ajouté à l'en-tête
+    `X-Profile` de la réponse. Dans un processus de voie, il est renvoyé
+    au serveur (`Measures`) au lieu d'être écrit.
+    """
+    settings = profile_settings()
+    if settings is None:
+        yield
+        return
+    delay, reason = settings
+    profile = Profile(delay=delay)
+    try:
+        with profile:
+            yield
+    finally:
+        if profile.triggered:
+            measures = _measures.get()
+            if measures is not None:
+                measures.profiles.append((profile, n_points, reason))
+            else:
+                save_profile(profile, n_points, reason)
+
+
+def save_profile(profile: Profile, n_points: int, reason: str) -> None:
+    """Écrit un profil dans PROFILE_DIR et le signale dans l'en-tête `X-Profile`."""
+    pointset_id = None
+    if has_request_context() and request.view_args:
+        pointset_id = request.view_args.get("pointSetId")
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    try:
+        profile.save(
+            PROFILE_DIR, name, points=n_points, pointset=pointset_id,
+            reason=reason,
         )
+    except OSError:
+        app.logger.exception("Écriture du profil impossible")
+    else:
+        if has_request_context():
+            g.profile = name
 
-    # --------------- Triangulation -----------------------
+
+def triangulate_points(
+    points: list, deadline: Deadline | None = None
+) -> Triangulation:
+    """Triangule une liste de points ou lève ServiceError.
+
+    Le résultat est compact (`Triangulation`, tableaux typés) : il passe
+    d'un processus à l'autre et s'encode sans liste de triplets. Le calcul
+    est abandonné (504) s'il n'est pas fini à l'échéance.
+    """
     try:
-        triangles = triangulate(points)
-    except Exception:
-        return error(
+        with stage("triangulate"), profiled(len(points)):
+            triangles = triangulate_compact(
+                points, tolerance=MERGE_TOLERANCE, deadline=deadline
+            )
+    except DeadlineExceeded as e:
+        raise deadline_exceeded() from e
+    except Exception as e:
+        raise ServiceError(
             "TRIANGULATION_FAILED",
             "Triangulation computation failed.",
             500
-        )
+        ) from e
+    observe_size("triangles", len(triangles))
+    return triangles
+
 
-    # --------------- Encodage ----------------------------
+def encode_result(
+    result: Triangulation, stream: bool = False, compact: bool = False
+):
+    """Encode le résultat (en morceaux si `stream`, compact si `compact`).
+
+    Les morceaux sont des vues sur les tableaux du résultat, sans copie.
+    Lève ServiceError en cas d'échec.
+    """
     try:
-        binary_output = encode_triangles(points, triangles)
-    except Exception:
-        return error(
+        with stage("encode"):
+            if compact:
+                return encode_triangles_compact(result.points, result.triangles)
+            if stream:
+                return result.chunks()
+            return result.encode()
+    except Exception as e:
+        raise ServiceError(
             "ENCODING_FAILED",
             "Could not encode the triangulation output.",
             500
+        ) from e
+
+
+def triangulate_payload(binary_data: bytes, deadline: Deadline | None = None) -> bytes:
+    """Décode un PointSet binaire, le triangule et encode le résultat.
+
+    Étape purement calculatoire (sans cache ni réseau), exécutable dans un
+    processus séparé ; lève ServiceError en cas d'échec.
+    """
+    return encode_result(triangulate_pointset(binary_data, deadline))
+
+
+def triangulate_pointset(
+    binary_data: bytes, deadline: Deadline | None = None
+) -> Triangulation:
+    """Décode et triangule un PointSet binaire.
+
+    Exécutable dans un processus séparé ; lève ServiceError en cas d'échec.
+    """
+    return triangulate_points(decode_payload(binary_data), deadline)
+
+
+def pooled_triangulation(
+    binary_data: bytes,
+    deadline: Deadline | None,
+    profiling: tuple[float, str] | None,
+) -> tuple[Triangulation, Measures]:
+    """Exécute `triangulate_pointset` dans le processus d'une voie.
+
+    Renvoie (résultat, mesures) : le résultat compact revient au serveur
+    sous forme de deux tableaux ; les étapes, tailles et profils relevés
+    sont enregistrés par le serveur (`record_measures`).
+    """
+    measures = Measures(profiling)
+    token = _measures.set(measures)
+    try:
+        result = triangulate_pointset(binary_data, deadline)
+    finally:
+        _measures.reset(token)
+    return result, measures
+
+
+def scheduled_triangulation(
+    binary_data: bytes,
+    deadline: Deadline | None = None,
+    lanes: Scheduler | None = None,
+) -> Triangulation:
+    """Triangule un PointSet binaire dans la voie de sa taille.
+
+    La voie (de `lanes`, par défaut `scheduler`) est choisie d'après
+    l'en-tête, avant décodage. Renvoie la `Triangulation` ou lève
+    ServiceError : 503 si la file de la voie est pleine, 504 si l'échéance
+    passe avant la fin.
+    """
+    lane = (lanes or scheduler).lane_of(binary_data)
+    try:
+        if not lane.processes:
+            return lane.run(triangulate_pointset, binary_data, deadline,
+                            deadline=deadline)
+        result, measures = lane.run(
+            pooled_triangulation, bytes(binary_data), deadline, profile_settings(),
+            deadline=deadline,
         )
+    except ServiceError:
+        raise
+    except LaneFull as e:
+        raise ServiceError(
+            "TRIANGULATOR_OVERLOADED",
+            "Too many triangulations in progress, retry later.",
+            503
+        ) from e
+    except DeadlineExceeded as e:
+        raise deadline_exceeded() from e
+    except Exception as e:
+        raise ServiceError(
+            "TRIANGULATION_FAILED",
+            "Triangulation computation failed.",
+            500
+        ) from e
+    record_measures(measures)
+    return result
+
+
+def fetch_payload(pointSetId: str, deadline: Deadline | None = None) -> bytes:
+    """Récupère le PointSet binaire auprès du PointSetManager ou lève ServiceError.
+
+    Les tentatives s'arrêtent à l'échéance : l'échec est alors un 504.
+    """
+    try:
+        with stage("fetch"):
+            return fetch_pointset(pointSetId, deadline)
+    except PointSetManagerError as e:
+        if deadline is not None and deadline.expired() and e.status == 503:
+            raise deadline_exceeded() from e
+        raise ServiceError(e.code, e.message, e.status) from e
+    except Exception as e:
+        if deadline is not None and deadline.expired():
+            raise deadline_exceeded() from e
+        raise ServiceError("POINTSET_MANAGER_ERROR", str(e), 503) from e
+
+
+def compute_triangulation(
+    pointSetId: str, deadline: Deadline | None = None
+) -> bytes | Triangulation | mmap.mmap:
+    """Renvoie la triangulation d'un PointSet ou lève ServiceError.
+
+    Renvoie le binaire `Triangles`, mis en cache ; au-delà de
+    `STREAM_MIN_POINTS` points, renvoie la `Triangulation` sans l'encoder,
+    pour que la réponse soit envoyée en flux depuis ses tableaux. Le calcul passe par
+    la voie de sa taille (`scheduler`).
+
+    Avec le stockage disque, les résultats y sont aussi écrits ; un grand
+    résultat stocké est renvoyé sous forme de projection `mmap` du fichier.
+    Passé `deadline`, le calcul est abandonné sans rien mettre en cache.
+    """
+    # --------------- POINTSET MANAGER --------------------
+    binary_data = fetch_payload(pointSetId, deadline)
+    return triangulation_of(pointSetId, binary_data, deadline)
+
+
+def triangulation_of(
+    pointSetId: str, binary_data: bytes, deadline: Deadline | None = None
+) -> bytes | Triangulation | mmap.mmap:
+    """Renvoie la triangulation d'un PointSet déjà récupéré ou lève ServiceError.
+
+    Suite de `compute_triangulation` après la récupération : cache par
+    contenu, stockage disque, puis calcul dans la voie de sa taille.
+    """
+    # --------------- Cache par contenu -------------------
+    key = payload_key(binary_data)
+    cached = cache.get(key, pointset_id=pointSetId)
+    if cached is not None:
+        return cached
+
+    # --------------- Stockage disque ---------------------
+    stored = store_view(key)
+    if stored is not None:
+        if len(stored) > STORE_PROMOTE_MAX_BYTES:
+            return stored
+        cached = bytes(stored)
+        cache.put(key, cached, pointset_id=pointSetId)
+        return cached
+
+    result = scheduled_triangulation(binary_data, deadline)
+    if result.n_points >= STREAM_MIN_POINTS:
+        # Écrit en flux dans le stockage, puis servi depuis le fichier
+        if store_put(key, encode_result(result, stream=True)):
+            stored = store_view(key)
+            if stored is not None:
+                return stored
+        return result
+    binary_output = encode_result(result)
+
+    cache.put(key, binary_output, pointset_id=pointSetId)
+    store_put(key, binary_output)
+    return binary_output
+
+
+def store_view(key: str) -> mmap.mmap | None:
+    """Renvoie la projection d'un résultat stocké sur disque, s'il existe."""
+    if store is None:
+        return None
+    try:
+        return store.view(key)
+    except OSError:
+        return None
+
+
+def store_put(key: str, data) -> bool:
+    """Écrit un résultat dans le stockage disque ; renvoie False en cas d'échec.
+
+    Le stockage n'est qu'un accélérateur : une erreur d'écriture (disque
+    plein...) n'empêche pas de répondre.
+    """
+    if store is None:
+        return False
+    try:
+        store.put(key, data)
+    except OSError:
+        return False
+    return True
+
+
+# -------------------------------------------------------
+# Route principale : GET /triangulation/<pointSetId>
+# -------------------------------------------------------
+@app.get("/triangulation/<pointSetId>")
+def get_triangulation(pointSetId: str):
+    """Renvoie la triangulation binaire pour un PointSet donné."""
+    # --------------- Validation de l’UUID ----------------
+    try:
+        with stage("validate"):
+            uuid.UUID(pointSetId)
+    except ValueError:
+        return error("INVALID_POINTSET_ID", "The PointSetID format is invalid.", 400)
+
+    # --------------- Cache par identifiant ---------------
+    with stage("cache"):
+        cached = cache.get_by_id(pointSetId)
+    if cached is not None:
+        return triangles_response(pointSetId, cached)
+
+    # --------------- Calcul dédupliqué -------------------
+    # Les requêtes concurrentes sur le même PointSet attendent le premier calcul
+    try:
+        binary_output = shared_computation(pointSetId, request_deadline())
+    except ServiceError as e:
+        return error(e.code, e.message, e.status)
 
     # --------------- Réponse OK --------------------------
-    return Response(binary_output, mimetype="application/octet-stream")
+    if isinstance(binary_output, Triangulation | mmap.mmap):
+        return large_response(binary_output)
+    return triangles_response(pointSetId, binary_output)
+
+
+def large_response(result: Triangulation | mmap.mmap) -> Response:
+    """Renvoie un grand maillage en flux, ou d'un bloc au format compact.
+
+    `result` est soit une `Triangulation`, envoyée en flux (transfert
+    chunked) par vues sur ses tableaux, soit la projection d'un fichier du
+    stockage disque, envoyée par tranches sans la recopier.
+    """
+    compact = accepts(COMPACT_MIMETYPE)
+    try:
+        if not isinstance(result, mmap.mmap):
+            body = encode_result(result, stream=not compact, compact=compact)
+        elif compact:
+            body = encode_result(Triangulation.decode(result), compact=True)
+        else:
+            view = memoryview(result)
+            body = (
+                view[start:start + CHUNK_SIZE]
+                for start in range(0, len(view), CHUNK_SIZE)
+            )
+    except ServiceError as e:
+        return error(e.code, e.message, e.status)
+    mimetype = COMPACT_MIMETYPE if compact else "application/octet-stream"
+    return Response(body, mimetype=mimetype)
+
+
+# -------------------------------------------------------
+# Négociation : réponses compacte et delta
+# -------------------------------------------------------
+def accepts(mimetype: str) -> bool:
+    """Indique si l'en-tête Accept nomme explicitement ce type (hors jokers)."""
+    return any(
+        value == mimetype and quality > 0
+        for value, quality in request.accept_mimetypes
+    )
+
+
+def requested_tag() -> str | None:
+    """Renvoie l'ETag de la représentation déjà détenue par le client, s'il y en a un.
+
+    Il est donné par le paramètre `?base=` ou par l'en-tête `If-None-Match`.
+    """
+    tag = request.args.get("base") or request.headers.get("If-None-Match")
+    if not tag:
+        return None
+    return tag.split(",")[0].strip().removeprefix("W/").strip('"')
+
+
+def base_of(tag: str) -> str:
+    """Renvoie l'empreinte du résultat désigné par un ETag de représentation.
+
+    `"<clé>-compact"` désigne le résultat `<clé>` sous forme compacte et
+    `"<clé>-delta-<base>"` un delta qui, appliqué, redonne ce même résultat.
+    """
+    return tag.split("-", 1)[0]
+
+
+def encode_delta(base: bytes, binary_output: bytes) -> bytes | None:
+    """Encode le delta entre deux binaires `Triangles` (None : base invalide)."""
+    try:
+        return encode_triangles_delta(
+            *decode_triangles(base), *decode_triangles(binary_output)
+        )
+    except ValueError:
+        return None
+
+
+def triangles_response(pointSetId: str, binary_output: bytes) -> Response:
+    """Renvoie la réponse complète, compacte, un delta ou un 304 selon la requête.
+
+    Chaque représentation a son propre ETag, dérivé de l'empreinte du
+    PointSet (clé du cache) : `"<clé>"` pour la réponse complète,
+    `"<clé>-compact"` pour le format compact et `"<clé>-delta-<base>"`
+    pour un delta. Le format compact est servi s'il est demandé dans
+    Accept. Sinon, si le client annonce une empreinte de base encore en
+    cache, seul le delta (triangles retirés et ajoutés) est envoyé, quand
+    il est plus petit ; propre à ce client, il n'est pas mis en cache
+    (`Cache-Control: no-store`).
+    """
+    key = cache.key_of(pointSetId)
+    headers = {}
+    compact = accepts(COMPACT_MIMETYPE)
+    tag = requested_tag() if key is not None else None
+    base = base_of(tag) if tag is not None else None
+    wants_delta = base is not None and not compact and (
+        "base" in request.args or accepts(DELTA_MIMETYPE)
+    )
+    if key is not None:
+        etag = f"{key}-compact" if compact else key
+        headers["ETag"] = f'"{etag}"'
+        # Représentation identique, ou delta vide : rien à renvoyer
+        if tag == etag or (wants_delta and base == key):
+            return Response(status=304, headers=headers)
+
+    if compact:
+        compact_body = cache.get(f"compact:{key}") if key is not None else None
+        if compact_body is None:
+            try:
+                compact_body = encode_result(
+                    Triangulation.decode(binary_output), compact=True
+                )
+            except ServiceError as e:
+                return error(e.code, e.message, e.status)
+            if key is not None:
+                cache.put(f"compact:{key}", compact_body)
+        return Response(compact_body, mimetype=COMPACT_MIMETYPE, headers=headers)
+
+    if wants_delta:
+        delta_key = f"delta:{base}:{key}"
+        delta = cache.get(delta_key)
+        if delta is None:
+            previous = cache.get(base)
+            if previous is not None:
+                delta = encode_delta(previous, binary_output)
+            if delta is not None:
+                cache.put(delta_key, delta)
+        if delta is not None and len(delta) < len(binary_output):
+            headers["ETag"] = f'"{key}-delta-{base}"'
+            headers["X-Delta-Base"] = f'"{base}"'
+            headers["Cache-Control"] = "no-store"
+            return Response(delta, mimetype=DELTA_MIMETYPE, headers=headers)
+
+    # Base inconnue, évincée ou delta trop gros : réponse complète
+    return Response(binary_output, mimetype="application/octet-stream", headers=headers)
+
+
+# -------------------------------------------------------
+# Triangulation par lots : POST /triangulations
+# -------------------------------------------------------
+_batch_lock = threading.Lock()
+batch_fetchers: ThreadPoolExecutor | None = None
+batch_workers: Executor | None = None
+
+
+def batch_pools() -> tuple[ThreadPoolExecutor, Executor]:
+    """Renvoie les pools de récupération et de calcul, créés au premier lot."""
+    global batch_fetchers, batch_workers
+    with _batch_lock:
+        if batch_fetchers is None:
+            batch_fetchers = ThreadPoolExecutor(
+                BATCH_FETCH_THREADS, thread_name_prefix="batch-fetch"
+            )
+        if batch_workers is None:
+            # Processus propres : le pool est créé pendant une requête
+            batch_workers = ProcessPoolExecutor(
+                BATCH_WORKERS,
+                mp_context=multiprocessing.get_context(POOL_START_METHOD),
+            )
+        return batch_fetchers, batch_workers
+
+
+def step_deadline(batch: Deadline) -> Deadline:
+    """Renvoie l'échéance d'une étape d'un élément de lot qui démarre maintenant.
+
+    Chaque étape (récupération, triangulation) dispose de `REQUEST_BUDGET`
+    secondes dès qu'elle commence, sans dépasser l'échéance du lot.
+    """
+    step = Deadline.after(REQUEST_BUDGET)
+    if batch.at is not None and batch.at < step.at:
+        return Deadline(batch.at)
+    return step
+
+
+def batch_error(e: ServiceError) -> tuple[int, bytes]:
+    """Renvoie (statut, contenu JSON) d'un élément de lot en échec, et le compte."""
+    errors_total.inc(code=e.code)
+    payload = {"code": e.code, "message": e.message}
+    return e.status, json.dumps(payload).encode()
+
+
+def batch_fetch(
+    pointSetId: str, batch: Deadline
+) -> tuple[int, bytes] | tuple[str, bytes]:
+    """Prépare un élément de lot (exécuté dans un thread de récupération).
+
+    Renvoie (statut, contenu) si l'élément est terminé (cache, stockage
+    disque ou erreur), sinon (clé de contenu, PointSet binaire) à trianguler.
+    """
+    binary_output = cache.get_by_id(pointSetId)
+    if binary_output is not None:
+        return 200, binary_output
+    try:
+        binary_data = fetch_payload(pointSetId, step_deadline(batch))
+    except ServiceError as e:
+        return batch_error(e)
+    key = payload_key(binary_data)
+    binary_output = cache.get(key, pointset_id=pointSetId)
+    if binary_output is None:
+        stored = store_view(key)
+        if stored is None:
+            return key, bytes(binary_data)
+        binary_output = bytes(stored)
+        cache.put(key, binary_output, pointset_id=pointSetId)
+    return 200, binary_output
+
+
+def batch_triangulate(
+    binary_data: bytes,
+    batch: Deadline,
+    profiling: tuple[float, str] | None,
+) -> tuple[bytes, Measures]:
+    """Triangule et encode un élément de lot (exécuté dans un processus de calcul).
+
+    Renvoie le binaire `Triangles` et les mesures relevées (voir `Measures`).
+    """
+    measures = Measures(profiling)
+    token = _measures.set(measures)
+    try:
+        return triangulate_payload(binary_data, step_deadline(batch)), measures
+    finally:
+        _measures.reset(token)
+
+
+@app.post("/triangulations")
+def post_triangulations():
+    """Triangule un lot de PointSets et renvoie un flux de trames.
+
+    Le corps est une liste JSON d'identifiants. Les PointSets sont récupérés
+    en parallèle, puis chacun est confié au pool de calcul dès sa réception :
+    tous les cœurs calculent, quel que soit le nombre de threads de
+    récupération. Chaque résultat est envoyé dès qu'il est prêt (ordre
+    d'achèvement) dans une trame `encode_batch_frame` portant sa position
+    dans la liste reçue ; un identifiant répété n'est traité qu'une fois.
+
+    Chaque étape d'un élément dispose de `REQUEST_BUDGET` secondes à partir
+    de son démarrage ; l'en-tête `DEADLINE_HEADER` borne le lot entier. Si
+    le client se déconnecte, les éléments qui n'ont pas commencé sont
+    annulés.
+    """
+    ids = request.get_json(silent=True)
+    if not isinstance(ids, list):
+        return error("INVALID_BATCH", "Expected a JSON list of PointSetIDs.", 400)
+    if len(ids) > BATCH_MAX_IDS:
+        return error(
+            "BATCH_TOO_LARGE", f"At most {BATCH_MAX_IDS} PointSetIDs per batch.", 400
+        )
+    try:
+        batch = client_deadline()
+    except ServiceError as e:
+        return error(e.code, e.message, e.status)
+
+    positions: dict[str, list[int]] = {}
+    invalid = []
+    for index, pointSetId in enumerate(ids):
+        try:
+            if not isinstance(pointSetId, str):
+                raise ValueError(pointSetId)
+            uuid.UUID(pointSetId)
+        except ValueError:
+            invalid.append(index)
+        else:
+            positions.setdefault(pointSetId, []).append(index)
+
+    fetchers, workers = batch_pools()
+    profiling = profile_settings()
+    events: queue.SimpleQueue = queue.SimpleQueue()
+    futures = []
+    for pointSetId in positions:
+        future = fetchers.submit(batch_fetch, pointSetId, batch)
+        future.add_done_callback(
+            lambda f, pointSetId=pointSetId: events.put((pointSetId, None, f))
+        )
+        futures.append(future)
+
+    def outcome(pointSetId, key, future) -> tuple[int, bytes] | None:
+        """Renvoie le statut et le contenu d'une étape terminée (None : à calculer)."""
+        try:
+            result = future.result()
+            if key is None:
+                if isinstance(result[0], int):
+                    return result
+                key, binary_data = result
+                computation = workers.submit(
+                    batch_triangulate, binary_data, batch, profiling
+                )
+                computation.add_done_callback(
+                    lambda f: events.put((pointSetId, key, f))
+                )
+                futures.append(computation)
+                return None
+            binary_output, measures = result
+            record_measures(measures)
+            cache.put(key, binary_output, pointset_id=pointSetId)
+            store_put(key, binary_output)
+            return 200, binary_output
+        except ServiceError as e:
+            return batch_error(e)
+        except Exception as e:
+            # Pool de calcul cassé, erreur de stockage... : l'élément échoue seul
+            app.logger.exception("Élément de lot %s en échec", pointSetId)
+            return batch_error(ServiceError(
+                "TRIANGULATION_FAILED", f"Batch item failed: {e}", 500
+            ))
+
+    def frames():
+        try:
+            for index in invalid:
+                errors_total.inc(code="INVALID_POINTSET_ID")
+                payload = {"code": "INVALID_POINTSET_ID",
+                           "message": "The PointSetID format is invalid."}
+                yield encode_batch_frame(index, 400, json.dumps(payload).encode())
+            remaining = len(positions)
+            while remaining:
+                pointSetId, key, future = events.get()
+                done = outcome(pointSetId, key, future)
+                if done is None:
+                    continue
+                remaining -= 1
+                for index in positions[pointSetId]:
+                    yield encode_batch_frame(index, *done)
+        finally:
+            # Client déconnecté (ou fin normale) : rien ne reste en file
+            for future in futures:
+                future.cancel()
+
+    return Response(frames(), mimetype="application/octet-stream")
+
+
+# -------------------------------------------------------
+# Requêtes : POST /triangulation/<pointSetId>/query
+# -------------------------------------------------------
+# Index de requêtes des dernières triangulations interrogées, par contenu
+LOCATOR_CACHE_SIZE = 8
+_locators: OrderedDict[str, PointLocator] = OrderedDict()
+_locators_lock = threading.Lock()
+
+
+def locator_for(pointSetId: str, deadline: Deadline) -> PointLocator:
+    """Renvoie l'index de requêtes de la triangulation d'un PointSet.
+
+    La triangulation est obtenue comme pour `GET /triangulation` (cache,
+    stockage disque ou calcul). Les derniers index construits sont gardés
+    par empreinte de contenu du PointSet : un grand résultat, envoyé en flux
+    ou projeté depuis le disque, n'est pas dans le cache mémoire, mais son
+    empreinte se lit sur le PointSet récupéré, sans recalcul. Lève
+    ServiceError.
+    """
+    binary_output = cache.get_by_id(pointSetId)
+    key = cache.key_of(pointSetId) if binary_output is not None else None
+    if key is None:
+        binary_data = fetch_payload(pointSetId, deadline)
+        key = payload_key(binary_data)
+    with _locators_lock:
+        locator = _locators.get(key)
+        if locator is not None:
+            _locators.move_to_end(key)
+            return locator
+
+    if binary_output is None:
+        binary_output = shared_computation(pointSetId, deadline, binary_data)
+
+    with stage("index"):
+        if not isinstance(binary_output, Triangulation):
+            binary_output = Triangulation.decode(binary_output)
+        locator = PointLocator.from_triangulation(binary_output)
+    with _locators_lock:
+        _locators[key] = locator
+        while len(_locators) > LOCATOR_CACHE_SIZE:
+            _locators.popitem(last=False)
+    return locator
+
+
+@app.post("/triangulation/<pointSetId>/query")
+def post_query(pointSetId: str):
+    """Localise un lot de points dans la triangulation d'un PointSet.
+
+    Le corps est un PointSet binaire de requêtes. La réponse
+    (`encode_query_results`) donne pour chacune le triangle qui la contient,
+    par sa position dans la réponse `Triangles` de `GET /triangulation`, et
+    le plus proche sommet.
+    """
+    try:
+        uuid.UUID(pointSetId)
+    except ValueError:
+        return error("INVALID_POINTSET_ID", "The PointSetID format is invalid.", 400)
+    try:
+        with stage("decode"):
+            queries = decode_pointset(request.get_data())
+    except ValueError:
+        return error("INVALID_QUERY_BINARY", "Could not decode binary query data.", 400)
+
+    try:
+        locator = locator_for(pointSetId, request_deadline())
+    except ServiceError as e:
+        return error(e.code, e.message, e.status)
+
+    with stage("query"):
+        located, nearest = locator.query_many(queries)
+    return Response(
+        encode_query_results(located, nearest), mimetype="application/octet-stream"
+    )
 
 
 # -------------------------------------------------------